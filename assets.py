@@ -0,0 +1,104 @@
+"""
+Background asset loading and startup timing.
+
+Slow assets are loaded on a thread pool while the game already runs with
+placeholders; the main loop polls for finished assets once per frame and
+swaps them in. StartupTimer keeps a breakdown of where cold-start time
+goes, including how long each asset took on its worker.
+"""
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+class StartupTimer:
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.phases = []
+        self.marks = {}
+
+    def phase(self, name):
+        """Get a context manager that times one startup phase"""
+        return _Phase(self, name)
+
+    def add(self, name, seconds):
+        self.phases.append((name, seconds))
+
+    def mark(self, name):
+        """Record how long after startup a milestone was reached, once"""
+        if name not in self.marks:
+            self.marks[name] = time.perf_counter() - self.started
+
+    def report(self):
+        """Format the breakdown as text, phases first, then milestones"""
+        lines = ["Startup breakdown:"]
+        for name, seconds in self.phases:
+            lines.append(f"  {name:<24}{seconds * 1000:>9.1f} ms")
+        for name, seconds in sorted(self.marks.items(), key=lambda item: item[1]):
+            lines.append(f"  {'@ ' + name:<24}{seconds * 1000:>9.1f} ms")
+        return "\n".join(lines)
+
+class _Phase:
+    def __init__(self, timer, name):
+        self.timer = timer
+        self.name = name
+        self.start = 0.0
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.timer.add(self.name, time.perf_counter() - self.start)
+        return False
+
+def _timed(loader, args):
+    start = time.perf_counter()
+    result = loader(*args)
+    return result, time.perf_counter() - start
+
+class AssetLoader:
+    def __init__(self, timer=None, max_workers=4):
+        self.timer = timer
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="assets")
+        self.pending = {}
+
+    def submit(self, name, loader, *args):
+        """Start loading an asset on the pool"""
+        self.pending[name] = self.executor.submit(_timed, loader, args)
+
+    def poll(self):
+        """Get (name, asset) for every asset finished since the last poll.
+
+        A loader that raised yields None for its asset, so callers keep
+        their placeholder.
+        """
+        if not self.pending:
+            return []
+        finished = []
+        for name, future in list(self.pending.items()):
+            if not future.done():
+                continue
+            del self.pending[name]
+            try:
+                asset, seconds = future.result()
+            except Exception:
+                asset, seconds = None, 0.0
+            if self.timer is not None:
+                self.timer.add(f"load {name}", seconds)
+            finished.append((name, asset))
+        if not self.pending and self.timer is not None:
+            self.timer.mark("assets ready")
+        return finished
+
+    def wait(self):
+        """Block until every submitted asset has finished loading"""
+        for future in list(self.pending.values()):
+            try:
+                future.result()
+            except Exception:
+                pass
+
+    def is_loading(self):
+        return bool(self.pending)
+
+    def shutdown(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,188 @@
+"""
+Sound effects on a fixed pool of mixer voices.
+
+Each effect has a cap on how many copies may play at once and a policy for
+what happens past it: "steal" restarts the oldest copy, "drop" skips the
+new one. Every effect is precomputed into a few pitch and volume variants
+so rapid repeats don't sound mechanical, and effects whose WAV is missing
+get a short generated tone instead. Dropped and stolen voices and the time
+spent starting playback are counted for the profiler.
+"""
+import random
+import time
+from array import array
+import pygame
+from profiler import RollingSamples
+from config import AUDIO_VOICES, AUDIO_VARIANTS
+
+# Effect -> (simultaneous copies, policy once capped)
+VOICE_LIMITS = {
+    "type": (3, "steal"),
+    "correct": (2, "steal"),
+    "wrong": (1, "drop"),
+    "powerup": (1, "steal"),
+    "levelup": (1, "drop")
+}
+DEFAULT_LIMIT = (2, "steal")
+
+# Fallback tones: (frequency Hz, seconds) notes played in sequence
+TONES = {
+    "type": [(1200, 0.025)],
+    "correct": [(660, 0.06), (990, 0.08)],
+    "wrong": [(180, 0.18)],
+    "powerup": [(520, 0.05), (780, 0.05), (1040, 0.08)],
+    "levelup": [(440, 0.08), (550, 0.08), (660, 0.08), (880, 0.16)]
+}
+
+# Small buffer keeps keystroke sounds tight; pass to pygame.mixer.pre_init too
+MIXER_SETTINGS = {"frequency": 22050, "size": -16, "channels": 2, "buffer": 512}
+VOLUME = 0.3
+# Variants spread pitch by up to this fraction either way
+PITCH_SPREAD = 0.06
+
+def _mixer_format():
+    """Get (frequency, channels) if the mixer is running 16-bit signed audio"""
+    init = pygame.mixer.get_init()
+    if init is None or init[1] != -16:
+        return None
+    return init[0], init[2]
+
+def generate_tone(notes, frequency, channels):
+    """Render square-wave notes with a linear fade as 16-bit samples"""
+    samples = array("h")
+    for pitch, seconds in notes:
+        count = int(frequency * seconds)
+        period = frequency / pitch
+        for index in range(count):
+            level = 6000 * (1 - index / count)
+            value = int(level if (index % period) < period / 2 else -level)
+            samples.extend([value] * channels)
+    return samples
+
+def make_variants(samples, channels, count, rng):
+    """Resample 16-bit samples into count variants of slightly different pitch and volume"""
+    frames = len(samples) // channels
+    variants = []
+    for index in range(count):
+        # Evenly spread pitches, so variant 0 is the lowest and the last the highest
+        ratio = 1 + PITCH_SPREAD * (2 * index / max(1, count - 1) - 1)
+        gain = rng.uniform(0.85, 1.0)
+        out_frames = int(frames / ratio)
+        variant = array("h", [
+            int(samples[int(frame * ratio) * channels + channel] * gain)
+            for frame in range(out_frames)
+            for channel in range(channels)
+        ])
+        variants.append(variant)
+    return variants
+
+def load_variants(name, file_path=None, count=AUDIO_VARIANTS):
+    """Build an effect's variant Sounds from a WAV, or from its fallback tone.
+
+    Runs on an asset loader thread. Returns an empty list if the mixer isn't
+    usable.
+    """
+    mixer_format = _mixer_format()
+    if mixer_format is None:
+        return []
+    frequency, channels = mixer_format
+    samples = None
+    if file_path is not None:
+        try:
+            samples = array("h", pygame.mixer.Sound(file_path).get_raw())
+        except (pygame.error, FileNotFoundError):
+            samples = None
+    if samples is None:
+        samples = generate_tone(TONES.get(name, [(440, 0.05)]), frequency, channels)
+
+    sounds = []
+    # Seeded by name so an effect's variants are the same every run
+    for variant in make_variants(samples, channels, count, random.Random(name)):
+        sound = pygame.mixer.Sound(buffer=variant.tobytes())
+        sound.set_volume(VOLUME)
+        sounds.append(sound)
+    return sounds
+
+class _Voice:
+    __slots__ = ("channel", "name")
+
+    def __init__(self, channel, name):
+        self.channel = channel
+        self.name = name
+
+class AudioMixer:
+    def __init__(self, voices=AUDIO_VOICES):
+        self.variants = {}
+        self.next_variant = {}
+        self.channels = []
+        # Playing voices, oldest first
+        self.voices = []
+        self.played = 0
+        self.dropped = 0
+        self.stolen = 0
+        self.latency = RollingSamples()
+        self.buffer_ms = 0.0
+        try:
+            pygame.mixer.init(**MIXER_SETTINGS)
+            pygame.mixer.set_num_channels(voices)
+            self.channels = [pygame.mixer.Channel(index) for index in range(voices)]
+            self.buffer_ms = MIXER_SETTINGS["buffer"] / pygame.mixer.get_init()[0] * 1000
+        except pygame.error:
+            pass
+
+    @property
+    def enabled(self):
+        return bool(self.channels)
+
+    def set_variants(self, name, sounds):
+        if sounds:
+            self.variants[name] = sounds
+            self.next_variant[name] = 0
+
+    def play(self, name):
+        """Start an effect on a free voice, stealing or dropping per its limit"""
+        sounds = self.variants.get(name)
+        if not sounds:
+            return
+        start = time.perf_counter()
+        self.voices = [voice for voice in self.voices if voice.channel.get_busy()]
+        cap, policy = VOICE_LIMITS.get(name, DEFAULT_LIMIT)
+
+        same = [voice for voice in self.voices if voice.name == name]
+        if len(same) >= cap:
+            victim = same[0]
+        elif len(self.voices) >= len(self.channels):
+            victim = self.voices[0]
+        else:
+            victim = None
+
+        if victim is not None:
+            if policy == "drop":
+                self.dropped += 1
+                return
+            self.stolen += 1
+            self.voices.remove(victim)
+            channel = victim.channel
+            channel.stop()
+        else:
+            busy = {voice.channel for voice in self.voices}
+            channel = next(channel for channel in self.channels if channel not in busy)
+
+        index = self.next_variant[name]
+        self.next_variant[name] = (index + 1) % len(sounds)
+        channel.play(sounds[index])
+        self.voices.append(_Voice(channel, name))
+        self.played += 1
+        self.latency.add(time.perf_counter() - start)
+
+    def get_stats(self):
+        """Get voice counters and play() call times in milliseconds"""
+        p50, p99 = self.latency.percentiles(50, 99)
+        return {
+            "played": self.played,
+            "dropped": self.dropped,
+            "stolen": self.stolen,
+            "play_p50_ms": p50 * 1000,
+            "play_p99_ms": p99 * 1000,
+            "buffer_ms": self.buffer_ms
+        }
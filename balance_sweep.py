@@ -0,0 +1,124 @@
+"""
+Difficulty balancing sweeps over headless games.
+
+Runs every combination of the given difficulty parameters and typist models
+across a process pool and writes one row per game to a CSV file:
+
+    python balance_sweep.py --base medium --word-speed 0.8,1.0,1.2 \
+        --spawn-delay 2500,3000 --wpm 30,60 --error-rate 0.02,0.05 \
+        --games 200 --output sweep.csv
+"""
+import argparse
+import csv
+import itertools
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+from simulation import GameSimulation
+from typist import SimulatedTypist
+from difficulty import DIFFICULTY_SETTINGS
+from config import TIMESTEP
+
+# Sweepable difficulty settings and how to parse their command-line values
+SWEEP_PARAMETERS = {
+    "word_speed": float,
+    "spawn_delay": int,
+    "lives": int,
+    "word_length_max": int
+}
+
+RESULT_COLUMNS = [
+    "base", "word_speed", "spawn_delay", "lives", "word_length_max",
+    "wpm", "error_rate", "seed", "survival_time", "level", "score",
+    "measured_wpm", "accuracy", "game_over"
+]
+
+def play_game(base, overrides, wpm, error_rate, seed, max_ticks):
+    """Play one seeded game against a simulated typist and return its result row"""
+    simulation = GameSimulation(seed=seed)
+    simulation.start(base, overrides)
+    typist = SimulatedTypist(wpm, error_rate, rng=random.Random(f"{seed}:typist"))
+    board = typist.play(simulation, max_ticks)
+    settings = simulation.difficulty_manager.get_settings()
+    return {
+        "base": base,
+        "word_speed": settings["word_speed"],
+        "spawn_delay": settings["spawn_delay"],
+        "lives": settings["lives"],
+        "word_length_max": settings["word_length_max"],
+        "wpm": wpm,
+        "error_rate": error_rate,
+        "seed": seed,
+        "survival_time": round(board.elapsed_time, 3),
+        "level": board.level,
+        "score": board.score,
+        "measured_wpm": board.calculate_wpm(),
+        "accuracy": board.calculate_accuracy(),
+        "game_over": int(board.game_over)
+    }
+
+def run_point(task):
+    """Play every game for one grid point; runs inside a worker process"""
+    base, overrides, wpm, error_rate, seeds, max_ticks = task
+    return [play_game(base, overrides, wpm, error_rate, seed, max_ticks) for seed in seeds]
+
+def build_tasks(base, grid, wpms, error_rates, games, seed, max_ticks, games_per_task):
+    """Expand the parameter grid into independent, deterministic work items"""
+    names = list(grid)
+    # Every point plays the same seeds so points are compared on identical word streams
+    seeds = [seed + game for game in range(games)]
+    tasks = []
+    for values in itertools.product(*(grid[name] for name in names)):
+        overrides = dict(zip(names, values))
+        for wpm, error_rate in itertools.product(wpms, error_rates):
+            for start in range(0, games, games_per_task):
+                chunk = seeds[start:start + games_per_task]
+                tasks.append((base, overrides, wpm, error_rate, chunk, max_ticks))
+    return tasks
+
+def parse_list(value, cast):
+    return [cast(item) for item in value.split(",") if item.strip()]
+
+def main():
+    parser = argparse.ArgumentParser(description="Sweep difficulty parameters over headless games")
+    parser.add_argument("--base", default="medium", choices=sorted(DIFFICULTY_SETTINGS))
+    for name in SWEEP_PARAMETERS:
+        parser.add_argument("--" + name.replace("_", "-"), dest=name,
+                            help=f"comma-separated {name} values (default: base setting)")
+    parser.add_argument("--wpm", default="40", help="comma-separated typist speeds")
+    parser.add_argument("--error-rate", default="0.03", help="comma-separated typist error rates")
+    parser.add_argument("--games", type=int, default=100, help="games per grid point")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--max-minutes", type=float, default=10, help="cap on simulated game length")
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--games-per-task", type=int, default=25)
+    parser.add_argument("--output", default="sweep.csv")
+    args = parser.parse_args()
+
+    grid = {}
+    for name, cast in SWEEP_PARAMETERS.items():
+        value = getattr(args, name)
+        grid[name] = parse_list(value, cast) if value else [DIFFICULTY_SETTINGS[args.base][name]]
+    max_ticks = int(args.max_minutes * 60 / TIMESTEP)
+    tasks = build_tasks(
+        args.base, grid,
+        parse_list(args.wpm, float), parse_list(args.error_rate, float),
+        args.games, args.seed, max_ticks, args.games_per_task
+    )
+
+    start = time.perf_counter()
+    rows = 0
+    with open(args.output, "w", newline="") as output, ProcessPoolExecutor(args.workers) as pool:
+        writer = csv.DictWriter(output, fieldnames=RESULT_COLUMNS)
+        writer.writeheader()
+        # map keeps task order, so the output is identical for any worker count
+        for results in pool.map(run_point, tasks):
+            writer.writerows(results)
+            rows += len(results)
+    elapsed = time.perf_counter() - start
+    print(f"{rows} games across {len(tasks)} tasks in {elapsed:.1f}s "
+          f"({rows / max(elapsed, 1e-9):.0f} games/s) -> {args.output}")
+
+if __name__ == "__main__":
+    main()
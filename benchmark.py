@@ -0,0 +1,219 @@
+"""
+Seeded performance benchmarks for the game's real update and draw paths.
+
+Each scenario drives a TypingSpeedGame under SDL's dummy video driver and
+reports frames per second, per-frame timing percentiles, surfaces and bytes
+allocated per frame and peak Python memory. Results are compared against a
+JSON baseline:
+
+    python benchmark.py --update-baseline     # record this machine's baseline
+    python benchmark.py --threshold 0.15      # exit 1 on a >15% regression
+"""
+import os
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import argparse
+import json
+import random
+import sys
+import time
+import tracemalloc
+import pygame
+from main import TypingSpeedGame
+from profiler import RollingSamples
+from surfaces import allocation_stats
+from config import WINDOW_WIDTH, WINDOW_HEIGHT
+
+BASELINE_PATH = "benchmark_baseline.json"
+
+# Settings that keep a benchmark game alive however many words are missed
+ENDLESS = {"lives": 10 ** 9, "spawn_delay": 10 ** 9}
+
+def start_game(game, seed):
+    game.simulation.seed(seed)
+    game.simulation.start("medium", ENDLESS)
+
+def no_teardown(game):
+    pass
+
+def fill_words(game, count, rng):
+    """Top the screen up to count words spread over its height"""
+    word_manager = game.word_manager
+    while sum(word.is_active for word in word_manager.words) < count:
+        word = word_manager.spawn_word()
+        word.y = word.prev_y = rng.uniform(-20, WINDOW_HEIGHT - 40)
+
+def words_scenario(count):
+    def setup(game, rng):
+        start_game(game, 1)
+        fill_words(game, count, rng)
+
+    def frame(game, rng):
+        fill_words(game, count, rng)
+        game.update()
+        game.draw()
+    return setup, frame, no_teardown
+
+def particle_storm():
+    def setup(game, rng):
+        start_game(game, 2)
+
+    def frame(game, rng):
+        # Roughly 10k live particles once bursts start expiring
+        for _ in range(8):
+            game.effects_manager.add_pixel_burst(
+                rng.randrange(WINDOW_WIDTH), rng.randrange(WINDOW_HEIGHT // 2), (255, 255, 85), 32
+            )
+        game.update()
+        game.draw()
+    return setup, frame, no_teardown
+
+def powerup_saturation():
+    defaults = {}
+
+    def setup(game, rng):
+        start_game(game, 3)
+        powerups = game.powerup_manager
+        defaults.setdefault("spawn_chance", powerups.spawn_chance)
+        defaults.setdefault("max_powerups", powerups.max_powerups)
+        powerups.spawn_chance = 1.0
+        powerups.max_powerups = 200
+
+    def frame(game, rng):
+        game.update()
+        for _ in range(10):
+            game.powerup_manager.check_collection(rng.randrange(WINDOW_WIDTH), rng.randrange(WINDOW_HEIGHT))
+        game.draw()
+
+    def teardown(game):
+        # Later scenarios share the game, so put the spawn rate back
+        game.powerup_manager.spawn_chance = defaults.pop("spawn_chance")
+        game.powerup_manager.max_powerups = defaults.pop("max_powerups")
+    return setup, frame, teardown
+
+def menu_idle():
+    def setup(game, rng):
+        game.simulation.reset()
+
+    def frame(game, rng):
+        game.update()
+        game.draw()
+    return setup, frame, no_teardown
+
+SCENARIOS = {
+    "words_10": words_scenario(10),
+    "words_100": words_scenario(100),
+    "words_1000": words_scenario(1000),
+    "particle_storm": particle_storm(),
+    "powerup_saturation": powerup_saturation(),
+    "menu_idle": menu_idle()
+}
+
+def run_scenario(game, name, frames, warmup):
+    """Time a scenario, then rerun it under tracemalloc for peak memory"""
+    setup, frame, teardown = SCENARIOS[name]
+
+    rng = random.Random(name)
+    game.effects_manager.clear_effects()
+    setup(game, rng)
+    for _ in range(warmup):
+        frame(game, rng)
+    samples = RollingSamples(frames)
+    allocated = allocation_stats.get_stats()
+    start = time.perf_counter()
+    for _ in range(frames):
+        frame_start = time.perf_counter()
+        frame(game, rng)
+        samples.add(time.perf_counter() - frame_start)
+    elapsed = time.perf_counter() - start
+    totals = allocation_stats.get_stats()
+
+    # Memory pass on the same seeded workload, kept separate so tracing doesn't skew timings
+    rng = random.Random(name)
+    game.effects_manager.clear_effects()
+    tracemalloc.start()
+    setup(game, rng)
+    for _ in range(min(frames, 60)):
+        frame(game, rng)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    teardown(game)
+
+    p50, p95, p99 = samples.percentiles(50, 95, 99)
+    return {
+        "ops_per_sec": round(frames / elapsed, 1),
+        "p50_ms": round(p50 * 1000, 3),
+        "p95_ms": round(p95 * 1000, 3),
+        "p99_ms": round(p99 * 1000, 3),
+        "frame_surfaces": round((totals["total_surfaces"] - allocated["total_surfaces"]) / frames, 2),
+        "frame_bytes": round((totals["total_bytes"] - allocated["total_bytes"]) / frames),
+        "peak_kb": round(peak / 1024, 1)
+    }
+
+def find_regressions(results, baseline, threshold):
+    """List scenarios slower or hungrier than the baseline by more than threshold"""
+    regressions = []
+    for name, result in results.items():
+        base = baseline.get(name)
+        if base is None:
+            continue
+        if result["ops_per_sec"] < base["ops_per_sec"] * (1 - threshold):
+            regressions.append(f"{name}: {result['ops_per_sec']} ops/s vs baseline {base['ops_per_sec']}")
+        if result["p95_ms"] > base["p95_ms"] * (1 + threshold):
+            regressions.append(f"{name}: p95 {result['p95_ms']} ms vs baseline {base['p95_ms']}")
+        if result["peak_kb"] > base["peak_kb"] * (1 + threshold):
+            regressions.append(f"{name}: peak {result['peak_kb']} KB vs baseline {base['peak_kb']}")
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description="Run RETRO TYPER performance benchmarks")
+    parser.add_argument("scenarios", nargs="*", help=f"subset of: {', '.join(SCENARIOS)}")
+    parser.add_argument("--frames", type=int, default=300)
+    parser.add_argument("--warmup", type=int, default=30)
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--threshold", type=float, default=0.15, help="allowed fractional regression")
+    parser.add_argument("--update-baseline", action="store_true", help="overwrite the baseline with these results")
+    args = parser.parse_args()
+
+    names = args.scenarios or list(SCENARIOS)
+    unknown = [name for name in names if name not in SCENARIOS]
+    if unknown:
+        parser.error(f"unknown scenario(s): {', '.join(unknown)}")
+
+    game = TypingSpeedGame(seed=0)
+    game.apply_loaded_assets(wait=True)
+    results = {}
+    print(f"{'scenario':<20}{'ops/s':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}"
+          f"{'surf/fr':>10}{'B/frame':>10}{'peak KB':>10}")
+    for name in names:
+        result = results[name] = run_scenario(game, name, args.frames, args.warmup)
+        print(f"{name:<20}{result['ops_per_sec']:>10}{result['p50_ms']:>10}"
+              f"{result['p95_ms']:>10}{result['p99_ms']:>10}{result['frame_surfaces']:>10}"
+              f"{result['frame_bytes']:>10}{result['peak_kb']:>10}")
+    pygame.quit()
+
+    if args.update_baseline:
+        baseline = {}
+        if os.path.exists(args.baseline):
+            with open(args.baseline) as baseline_file:
+                baseline = json.load(baseline_file)
+        baseline.update(results)
+        with open(args.baseline, "w") as baseline_file:
+            json.dump(baseline, baseline_file, indent=2, sort_keys=True)
+        print(f"Baseline written to {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print(f"No baseline at {args.baseline}; run with --update-baseline to create one")
+        return 0
+    with open(args.baseline) as baseline_file:
+        baseline = json.load(baseline_file)
+    regressions = find_regressions(results, baseline, args.threshold)
+    for regression in regressions:
+        print("REGRESSION " + regression)
+    return 1 if regressions else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -3,6 +3,12 @@ WINDOW_WIDTH = 640
 WINDOW_HEIGHT = 480
 FPS = 60
 
+# Fixed simulation timestep in seconds. Speeds and timers are tuned per
+# 1/60 s tick, so TICK_SCALE converts them to the configured timestep.
+TIMESTEP = 1.0 / 60
+TICK_SCALE = TIMESTEP * 60
+MAX_FRAME_TIME = 0.25
+
 # Retro 8-bit Color Palette
 RETRO_BLACK = (0, 0, 0)
 RETRO_WHITE = (255, 255, 255)
@@ -42,8 +48,39 @@ FONT_SIZE = 24
 INPUT_FONT_SIZE = 20
 UI_FONT_SIZE = 16
 WORD_SPAWN_DELAY = 3000
+MAX_INPUT_LENGTH = 15
+AUTO_SUBMIT = False  # Submit as soon as the input matches a word exactly
+
+# Spawn placement: words spawn in columns at least SPAWN_MIN_DISTANCE apart,
+# and a column stays taken until its word falls below SPAWN_BAND_HEIGHT
+SPAWN_MIN_X = 30
+SPAWN_MAX_X = WINDOW_WIDTH - 100
+SPAWN_COLUMN_WIDTH = 90
+SPAWN_MIN_DISTANCE = 80
+SPAWN_BAND_HEIGHT = 60
+GRID_CELL_SIZE = 64
+# Spawn more words containing the letters and letter pairs the player misses
+ADAPTIVE_WORDS = False
 
 # Visual Effects
 PARTICLE_COUNT = 8
+PARTICLE_POOL_SIZE = 16384
 SHAKE_DURATION = 15
 TEXT_POPUP_DURATION = 60
+
+# Rendering
+TEXT_CACHE_SIZE = 512
+# Redraw only changed regions during play; needs no shake or freeze to apply
+DIRTY_RECT_RENDERING = False
+
+# Profiling: frames kept for rolling percentiles and overlay refresh interval
+PROFILE_WINDOW = 240
+PROFILE_OVERLAY_REFRESH = 30
+
+# Audio: mixer voices shared by all effects and precomputed variants per effect
+AUDIO_VOICES = 12
+AUDIO_VARIANTS = 4
+
+# Session history
+SCORE_DB_PATH = "scores.db"
+PLAYER_NAME = "PLAYER"
@@ -32,11 +32,13 @@ class DifficultyManager:
         self.current_difficulty = "medium"
         self.settings = DIFFICULTY_SETTINGS[self.current_difficulty].copy()
     
-    def set_difficulty(self, difficulty):
-        """Set the game difficulty to easy, medium, or hard"""
+    def set_difficulty(self, difficulty, overrides=None):
+        """Set the game difficulty to easy, medium, or hard, optionally overriding some settings"""
         if difficulty in DIFFICULTY_SETTINGS:
             self.current_difficulty = difficulty
             self.settings = DIFFICULTY_SETTINGS[difficulty].copy()
+            if overrides:
+                self.settings.update(overrides)
             return True
         return False
     
@@ -63,7 +65,11 @@ class DifficultyManager:
     def filter_words_by_difficulty(self, word_list):
         """Filter words based on the current difficulty"""
         max_length = self.settings["word_length_max"]
-        filtered = [word for word in word_list if len(word) <= max_length]
+        if hasattr(word_list, "up_to_length"):
+            # Word stores are sorted by length, so this is a view, not a copy
+            filtered = word_list.up_to_length(max_length)
+        else:
+            filtered = [word for word in word_list if len(word) <= max_length]
         
         # Ensure we have enough words
         if len(filtered) < 10:
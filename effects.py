@@ -1,31 +1,42 @@
 import pygame
 import random
 import math
+from text_cache import text_cache
+from fonts import get_font
+from particles import ParticlePool, HAS_NUMPY
 from config import WINDOW_WIDTH, WINDOW_HEIGHT, PARTICLE_COUNT, SHAKE_DURATION, TEXT_POPUP_DURATION, RETRO_WHITE
 
 class PixelParticle:
-    def __init__(self, x, y, color):
+    def __init__(self, x, y, color, rng=random):
         self.x = x
         self.y = y
-        self.vx = random.uniform(-2, 2)
-        self.vy = random.uniform(-3, -1)
+        self.prev_x = x
+        self.prev_y = y
+        self.vx = rng.uniform(-2, 2)
+        self.vy = rng.uniform(-3, -1)
         self.color = color
         self.life = 40
         self.max_life = 40
-        self.size = random.choice([2, 3, 4])  # Pixel sizes
+        self.size = rng.choice([2, 3, 4])  # Pixel sizes
         
-    def update(self):
-        self.x += self.vx
-        self.y += self.vy
-        self.vy += 0.1  # Gravity
-        self.life -= 1
+    def update(self, dt=1.0):
+        self.prev_x = self.x
+        self.prev_y = self.y
+        self.x += self.vx * dt
+        self.y += self.vy * dt
+        self.vy += 0.1 * dt  # Gravity
+        self.life -= dt
         return self.life > 0
         
-    def draw(self, screen):
+    def draw(self, screen, alpha=1.0):
+        """Draw the particle and return the rect it covers"""
         if self.life > 0:
-            # Draw pixelated particle
-            pixel_rect = pygame.Rect(int(self.x), int(self.y), self.size, self.size)
-            pygame.draw.rect(screen, self.color, pixel_rect)
+            # Draw pixelated particle at its interpolated position
+            x = self.prev_x + (self.x - self.prev_x) * alpha
+            y = self.prev_y + (self.y - self.prev_y) * alpha
+            pixel_rect = pygame.Rect(int(x), int(y), self.size, self.size)
+            return pygame.draw.rect(screen, self.color, pixel_rect)
+        return None
 
 class RetroTextPopup:
     def __init__(self, text, x, y, color):
@@ -36,18 +47,19 @@ class RetroTextPopup:
         self.color = color
         self.life = TEXT_POPUP_DURATION
         self.max_life = TEXT_POPUP_DURATION
-        self.font = pygame.font.Font(None, 24)
+        self.font = get_font(24)
         
-    def update(self):
-        self.life -= 1
+    def update(self, dt=1.0):
+        self.life -= dt
         # Float upward in pixel steps
         pixels_moved = (TEXT_POPUP_DURATION - self.life) // 3
         self.y = self.start_y - pixels_moved
         return self.life > 0
         
     def draw(self, screen):
+        """Draw the popup and return the rect it covers"""
         if self.life > 0:
-            text_surface = self.font.render(self.text, False, self.color)
+            text_surface = text_cache.render(self.font, self.text, self.color)
             text_rect = text_surface.get_rect(center=(self.x, self.y))
             
             # Add retro border effect
@@ -55,9 +67,14 @@ class RetroTextPopup:
             pygame.draw.rect(screen, RETRO_WHITE, border_rect, 1)
             
             screen.blit(text_surface, text_rect)
+            return border_rect
+        return None
 
 class EffectsManager:
-    def __init__(self):
+    def __init__(self, seed=None):
+        self.rng = random.Random(seed)
+        # Vectorized pool when NumPy is available, PixelParticle objects otherwise
+        self.particle_pool = ParticlePool(seed=seed) if HAS_NUMPY else None
         self.particles = []
         self.text_popups = []
         self.screen_shake = 0
@@ -66,8 +83,11 @@ class EffectsManager:
         
     def add_pixel_burst(self, x, y, color, count=PARTICLE_COUNT):
         """Add a burst of pixel particles at the specified location"""
+        if self.particle_pool is not None:
+            self.particle_pool.emit(x, y, color, count)
+            return
         for _ in range(count):
-            self.particles.append(PixelParticle(x, y, color))
+            self.particles.append(PixelParticle(x, y, color, self.rng))
             
     def add_text_popup(self, text, x, y, color):
         """Add a retro floating text popup"""
@@ -77,30 +97,38 @@ class EffectsManager:
         """Add screen shake effect"""
         self.screen_shake = max(self.screen_shake, intensity)
         
-    def update(self):
+    def update(self, dt=1.0):
         # Update particles
-        self.particles = [p for p in self.particles if p.update()]
+        if self.particle_pool is not None:
+            self.particle_pool.update(dt)
+        else:
+            self.particles = [p for p in self.particles if p.update(dt)]
         
         # Update text popups
-        self.text_popups = [t for t in self.text_popups if t.update()]
+        self.text_popups = [t for t in self.text_popups if t.update(dt)]
         
         # Update screen shake in pixel increments
         if self.screen_shake > 0:
-            self.shake_offset_x = random.choice([-2, -1, 0, 1, 2]) if self.screen_shake > 3 else 0
-            self.shake_offset_y = random.choice([-2, -1, 0, 1, 2]) if self.screen_shake > 3 else 0
-            self.screen_shake -= 1
+            self.shake_offset_x = self.rng.choice([-2, -1, 0, 1, 2]) if self.screen_shake > 3 else 0
+            self.shake_offset_y = self.rng.choice([-2, -1, 0, 1, 2]) if self.screen_shake > 3 else 0
+            self.screen_shake = max(0, self.screen_shake - dt)
         else:
             self.shake_offset_x = 0
             self.shake_offset_y = 0
             
-    def draw(self, screen):
+    def draw(self, screen, alpha=1.0):
+        """Draw particles and popups, returning the rects drawn"""
+        rects = []
         # Draw particles
+        if self.particle_pool is not None:
+            rects.append(self.particle_pool.draw(screen, alpha))
         for particle in self.particles:
-            particle.draw(screen)
+            rects.append(particle.draw(screen, alpha))
             
         # Draw text popups
         for popup in self.text_popups:
-            popup.draw(screen)
+            rects.append(popup.draw(screen))
+        return [rect for rect in rects if rect is not None]
             
     def get_screen_shake_offset(self):
         """Get the current screen shake offset"""
@@ -108,6 +136,8 @@ class EffectsManager:
         
     def clear_effects(self):
         """Clear all effects"""
+        if self.particle_pool is not None:
+            self.particle_pool.clear()
         self.particles.clear()
         self.text_popups.clear()
         self.screen_shake = 0
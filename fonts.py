@@ -0,0 +1,22 @@
+"""
+Font registry shared by all drawing code
+"""
+import pygame
+from config import FONT_SIZE, INPUT_FONT_SIZE, UI_FONT_SIZE
+
+# Every size the game draws with, loaded once at startup
+PRELOAD_FONT_SIZES = (UI_FONT_SIZE, INPUT_FONT_SIZE, FONT_SIZE, 32, 40, 48)
+
+_fonts = {}
+
+def get_font(size):
+    """Get the default font at a size, loading it on first use"""
+    font = _fonts.get(size)
+    if font is None:
+        font = _fonts[size] = pygame.font.Font(None, size)
+    return font
+
+def load_fonts(sizes=PRELOAD_FONT_SIZES):
+    """Load every font the game needs up front"""
+    for size in sizes:
+        get_font(size)
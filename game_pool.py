@@ -0,0 +1,234 @@
+"""
+Supervised pool of pre-warmed game processes.
+
+Each worker is a Python interpreter that has already imported pygame and
+the game modules, then waits on stdin. Starting a session hands the game
+to an idle worker instead of paying for a fresh interpreter and imports.
+Sessions beyond the cap wait in a bounded queue; once that is full new
+requests are refused, and a request still waiting after the queue timeout
+expires. Every request gets a session id that can be polled for its
+status. A supervisor thread reaps finished games, expires stale requests,
+drops workers that died while idle and keeps spare workers warm:
+
+    pool = GamePool(max_sessions=4, warm_workers=2)
+    session = pool.request_session()    # raises PoolFull when the queue is full
+    pool.session_status(session)        # "queued", "started" or "expired"
+    pool.get_stats()
+"""
+import os
+import secrets
+import sys
+import threading
+import time
+import subprocess
+from collections import OrderedDict, deque
+from profiler import RollingSamples
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+GAME_PATH = os.path.join(SCRIPT_DIR, "main.py")
+
+# Games allowed to run at once, idle interpreters kept ready, and requests
+# allowed to wait for a free slot
+MAX_SESSIONS = 4
+WARM_WORKERS = 2
+MAX_QUEUED = 8
+# Seconds a request may wait for a slot before it expires
+QUEUE_TIMEOUT = 60
+# Started or expired sessions remembered for status polls
+SESSION_HISTORY = 1024
+# Seconds between supervisor passes
+REAP_INTERVAL = 0.5
+# Spawn and start latencies kept for percentiles
+LATENCY_WINDOW = 128
+
+READY_LINE = b"ready\n"
+RUN_LINE = b"run\n"
+
+class PoolFull(Exception):
+    """Raised when every session slot and queue place is taken"""
+
+class _Worker:
+    def __init__(self, process, spawned):
+        self.process = process
+        self.spawned = spawned
+        self.started = None
+
+class GamePool:
+    def __init__(self, max_sessions=MAX_SESSIONS, warm_workers=WARM_WORKERS, max_queued=MAX_QUEUED,
+                 queue_timeout=QUEUE_TIMEOUT, reap_interval=REAP_INTERVAL, command=None):
+        self.max_sessions = max_sessions
+        self.warm_workers = warm_workers
+        self.max_queued = max_queued
+        self.queue_timeout = queue_timeout
+        self.reap_interval = reap_interval
+        self.command = command or [sys.executable, os.path.abspath(__file__), "--worker"]
+
+        self.lock = threading.Lock()
+        self.idle = deque()
+        self.warming = 0
+        self.active = []
+        # (session id, request time) of sessions waiting for a slot
+        self.pending = deque()
+        # Final status of recent sessions that left the queue, oldest first
+        self.resolved = OrderedDict()
+
+        self.sessions_started = 0
+        self.sessions_finished = 0
+        self.rejected = 0
+        self.expired = 0
+        self.worker_failures = 0
+        self.spawn_latency = RollingSamples(LATENCY_WINDOW)
+        self.start_latency = RollingSamples(LATENCY_WINDOW)
+
+        self.closed = threading.Event()
+        with self.lock:
+            self._replenish()
+        self.supervisor = threading.Thread(target=self._supervise, name="game-pool", daemon=True)
+        self.supervisor.start()
+
+    def request_session(self):
+        """Start a game now if a worker is ready, otherwise queue it; returns the session id"""
+        with self.lock:
+            if len(self.active) + len(self.pending) >= self.max_sessions + self.max_queued:
+                self.rejected += 1
+                raise PoolFull(f"{len(self.active)} games running and {len(self.pending)} waiting")
+            session = secrets.token_hex(8)
+            self.pending.append((session, time.perf_counter()))
+            self._dispatch()
+            self._replenish()
+            return session
+
+    def session_status(self, session):
+        """Get "queued", "started" or "expired" for a session id, or None if it is unknown"""
+        with self.lock:
+            status = self.resolved.get(session)
+            if status is None and any(queued == session for queued, _ in self.pending):
+                status = "queued"
+            return status
+
+    def get_stats(self):
+        with self.lock:
+            spawn = self.spawn_latency.percentiles(50, 95)
+            start = self.start_latency.percentiles(50, 95)
+            return {
+                "max_sessions": self.max_sessions,
+                "active": len(self.active),
+                "idle": len(self.idle),
+                "warming": self.warming,
+                "queued": len(self.pending),
+                "max_queued": self.max_queued,
+                "queue_timeout": self.queue_timeout,
+                "utilization": round(len(self.active) / self.max_sessions, 3),
+                "sessions_started": self.sessions_started,
+                "sessions_finished": self.sessions_finished,
+                "rejected": self.rejected,
+                "expired": self.expired,
+                "worker_failures": self.worker_failures,
+                "spawn_ms_p50": round(spawn[0] * 1000, 1),
+                "spawn_ms_p95": round(spawn[1] * 1000, 1),
+                "start_ms_p50": round(start[0] * 1000, 1),
+                "start_ms_p95": round(start[1] * 1000, 1)
+            }
+
+    def close(self):
+        """Stop supervising and kill idle workers; running games are left open"""
+        self.closed.set()
+        self.supervisor.join()
+        with self.lock:
+            while self.idle:
+                worker = self.idle.popleft()
+                worker.process.kill()
+                worker.process.wait()
+
+    def _supervise(self):
+        while not self.closed.wait(self.reap_interval):
+            with self.lock:
+                self._reap()
+                self._expire()
+                self._dispatch()
+                self._replenish()
+
+    def _reap(self):
+        # poll() collects the exit status, so finished games don't linger as zombies
+        running = [worker for worker in self.active if worker.process.poll() is None]
+        self.sessions_finished += len(self.active) - len(running)
+        self.active = running
+        alive = [worker for worker in self.idle if worker.process.poll() is None]
+        self.worker_failures += len(self.idle) - len(alive)
+        self.idle = deque(alive)
+
+    def _expire(self):
+        # Requests are queued in order, so the stale ones are all at the front
+        deadline = time.perf_counter() - self.queue_timeout
+        while self.pending and self.pending[0][1] < deadline:
+            session, _ = self.pending.popleft()
+            self._resolve(session, "expired")
+            self.expired += 1
+
+    def _resolve(self, session, status):
+        self.resolved[session] = status
+        if len(self.resolved) > SESSION_HISTORY:
+            self.resolved.popitem(last=False)
+
+    def _dispatch(self):
+        while self.pending and self.idle and len(self.active) < self.max_sessions:
+            worker = self.idle.popleft()
+            try:
+                worker.process.stdin.write(RUN_LINE)
+                worker.process.stdin.close()
+            except OSError:
+                self.worker_failures += 1
+                worker.process.kill()
+                worker.process.wait()
+                continue
+            session, requested = self.pending.popleft()
+            self._resolve(session, "started")
+            worker.started = time.perf_counter()
+            self.start_latency.add(worker.started - requested)
+            self.active.append(worker)
+            self.sessions_started += 1
+
+    def _replenish(self):
+        # Spares only fill slots a game could use, so processes never exceed max_sessions
+        wanted = min(self.warm_workers + len(self.pending), self.max_sessions - len(self.active))
+        while not self.closed.is_set() and len(self.idle) + self.warming < wanted:
+            process = subprocess.Popen(self.command, stdin=subprocess.PIPE, stdout=subprocess.PIPE, cwd=SCRIPT_DIR,
+                                       env=dict(os.environ, PYGAME_HIDE_SUPPORT_PROMPT="1"))
+            self.warming += 1
+            threading.Thread(target=self._wait_ready, args=(_Worker(process, time.perf_counter()),), daemon=True).start()
+
+    def _wait_ready(self, worker):
+        line = worker.process.stdout.readline()
+        worker.process.stdout.close()
+        with self.lock:
+            self.warming -= 1
+            if line != READY_LINE or self.closed.is_set():
+                if line != READY_LINE:
+                    self.worker_failures += 1
+                worker.process.kill()
+                worker.process.wait()
+                return
+            self.spawn_latency.add(time.perf_counter() - worker.spawned)
+            self.idle.append(worker)
+            self._dispatch()
+
+def _worker_main():
+    """Import the game, report ready, then run it once told to"""
+    import runpy
+    import pygame  # noqa: F401
+    import main  # noqa: F401
+
+    stdout = os.fdopen(os.dup(1), "wb")
+    # The game's own prints go to stderr so they never fill the ready pipe
+    os.dup2(2, 1)
+    stdout.write(READY_LINE)
+    stdout.close()
+    if sys.stdin.buffer.readline() != RUN_LINE:
+        return
+    sys.argv = [GAME_PATH]
+    runpy.run_path(GAME_PATH, run_name="__main__")
+
+if __name__ == "__main__":
+    if "--worker" in sys.argv[1:]:
+        sys.path.insert(0, SCRIPT_DIR)
+        _worker_main()
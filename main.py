@@ -1,74 +1,168 @@
 import pygame
 import sys
 import os
+import time
 from config import (
     WINDOW_WIDTH,
     WINDOW_HEIGHT,
     FPS,
+    TIMESTEP,
+    TICK_SCALE,
+    MAX_FRAME_TIME,
     RETRO_BACKGROUND,
     RETRO_ACCENT,
-    WORD_SPAWN_DELAY
+    DIRTY_RECT_RENDERING,
+    PROFILE_OVERLAY_REFRESH,
+    SCORE_DB_PATH,
+    PLAYER_NAME
 )
+from simulation import GameSimulation, KEY_ENTER, KEY_BACKSPACE
 from word_manager import WordManager
 from game_state import GameState
 from difficulty import DifficultyManager
 from powerups import PowerUpManager
 from effects import EffectsManager
+from surfaces import create_surface, allocation_stats
+from fonts import get_font, load_fonts
+from profiler import FrameProfiler
+from replay import InputRecorder, Replayer, read_log, MAX_SEED
+from assets import AssetLoader, StartupTimer
+from audio import AudioMixer, MIXER_SETTINGS, load_variants
+from word_store import open_store
+from score_store import ScoreStore
+from text_cache import text_cache
+
+# Number keys that pick a difficulty on the selection screen
+DIFFICULTY_KEYCODES = {pygame.K_1: "1", pygame.K_2: "2", pygame.K_3: "3"}
+
+DIFFICULTY_POPUPS = {
+    "easy": ("EASY MODE!", (0, 255, 0)),
+    "medium": ("MEDIUM MODE!", (255, 255, 0)),
+    "hard": ("HARD MODE!", (255, 0, 0))
+}
+
+POWERUP_POPUPS = {
+    "freeze": ("FREEZE!", (0, 255, 255)),
+    "clear": ("CLEAR!", (255, 255, 0)),
+    "life": ("+LIFE!", (0, 255, 0)),
+    "shield": ("SHIELD!", (255, 0, 255))
+}
+
+SOUND_FILES = {
+    "type": "sounds/type.wav",
+    "correct": "sounds/correct.wav",
+    "wrong": "sounds/wrong.wav",
+    "powerup": "sounds/powerup.wav",
+    "levelup": "sounds/levelup.wav"
+}
 
 class TypingSpeedGame:
-    def __init__(self):
-        pygame.init()
-        self.screen = pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT))
-        pygame.display.set_caption("RETRO TYPER")
-        self.clock = pygame.time.Clock()
+    def __init__(self, profile=False, profile_output=None, seed=None, record_path=None, replay_log=None, word_list=None, stats_output=None,
+                 score_store=None, player=PLAYER_NAME, startup_report=False):
+        # Cold-start timing, printed once assets are loaded if startup_report is set
+        self.startup = StartupTimer()
+        self.startup_report = startup_report
+        self.startup_pending = True
+        with self.startup.phase("display"):
+            pygame.mixer.pre_init(**MIXER_SETTINGS)
+            pygame.init()
+            self.screen = pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT))
+            pygame.display.set_caption("RETRO TYPER")
+            self.clock = pygame.time.Clock()
+        with self.startup.phase("fonts"):
+            load_fonts()
+        
+        # Sounds and the background load on worker threads while the menu is up
+        self.assets = AssetLoader(self.startup)
+        with self.startup.phase("mixer"):
+            self.audio = AudioMixer()
+            self._queue_sounds()
+        self.background = create_surface((WINDOW_WIDTH, WINDOW_HEIGHT))
+        self.background.fill(RETRO_BACKGROUND)
+        self.assets.submit("background", self._create_retro_background)
         
         # Initialize managers
+        managers_start = time.perf_counter()
         self.difficulty_manager = DifficultyManager()
         self.powerup_manager = PowerUpManager()
-        self.word_manager = WordManager(self.difficulty_manager)
+        self.word_manager = WordManager(self.difficulty_manager, word_list=word_list)
         self.game_state = GameState(self.difficulty_manager)
-        self.effects_manager = EffectsManager()
+        self.simulation = GameSimulation(
+            self.difficulty_manager,
+            self.word_manager,
+            self.powerup_manager,
+            self.game_state,
+            seed=replay_log.seed if replay_log else seed
+        )
+        self.effects_manager = EffectsManager(self.simulation.current_seed)
         
-        self.last_spawn_time = 0
-        self.selecting_difficulty = True
+        # Keystroke recording and replay
+        self.replayer = Replayer(replay_log) if replay_log else None
+        # Typing statistics are written here at every game over
+        self.stats_output = stats_output
+        # Finished sessions are queued to the score database
+        self.score_store = score_store
+        self.player = player
+        if record_path:
+            self.simulation.recorder = InputRecorder(record_path, self.simulation.current_seed, word_list)
         
-        # Initialize sound system with better error handling
-        self.sounds = self._initialize_sounds()
+        # Frame profiler, toggled with F3
+        self.profiler = FrameProfiler(enabled=profile, output_path=profile_output)
+        self.simulation.profiler = self.profiler
+        self.profiler_overlay = None
+        self.startup.add("managers", time.perf_counter() - managers_start)
         
-        # Create retro background
-        self.background = self._create_retro_background()
-
-    def _initialize_sounds(self):
-        """Initialize sound effects with proper error handling"""
-        sounds = {}
-        try:
-            pygame.mixer.init(frequency=22050, size=-16, channels=2, buffer=512)
-            sound_files = {
-                "type": "sounds/type.wav",
-                "correct": "sounds/correct.wav", 
-                "wrong": "sounds/wrong.wav",
-                "powerup": "sounds/powerup.wav",
-                "levelup": "sounds/levelup.wav"
-            }
-            
-            for name, file_path in sound_files.items():
-                try:
-                    if os.path.exists(file_path):
-                        sounds[name] = pygame.mixer.Sound(file_path)
-                        sounds[name].set_volume(0.3)
-                    else:
-                        sounds[name] = None
-                except pygame.error:
-                    sounds[name] = None
-                    
-        except pygame.error:
-            sounds = {key: None for key in ["type", "correct", "wrong", "powerup", "levelup"]}
-            
-        return sounds
+        # Render targets reused every frame
+        self.game_layer = create_surface((WINDOW_WIDTH, WINDOW_HEIGHT), pygame.SRCALPHA)
+        self.freeze_overlay = create_surface((WINDOW_WIDTH, WINDOW_HEIGHT), pygame.SRCALPHA)
+        self.freeze_overlay.fill((0, 255, 255, 40))
+        self.allocation_stats = allocation_stats
+        
+        # Menu screens pre-composited over the background, one blit per frame
+        with self.startup.phase("menu layers"):
+            self.static_layers = {}
+            self._static_layer("difficulty", self.draw_difficulty_menu)
+            self._static_layer("start", self.game_state.draw_menu)
+        
+        # Dirty-rect rendering state
+        self.dirty_rects_enabled = DIRTY_RECT_RENDERING
+        self.previous_rects = []
+        self.last_frame_clean = False
+
+    def _queue_sounds(self):
+        """Queue every sound effect's variants for loading; effects are silent until they arrive"""
+        if not self.audio.enabled:
+            return
+        for name, file_path in SOUND_FILES.items():
+            self.assets.submit(f"sound:{name}", load_variants, name, file_path if os.path.exists(file_path) else None)
+
+    def apply_loaded_assets(self, wait=False):
+        """Swap in assets that finished loading, optionally waiting for all of them"""
+        if wait:
+            self.assets.wait()
+        for name, asset in self.assets.poll():
+            if asset is None:
+                continue
+            if name == "background":
+                self.background = asset
+                # Menus were composited over the placeholder, and dirty rects erase with it
+                self.static_layers.clear()
+                self.last_frame_clean = False
+            elif name.startswith("sound:"):
+                self.audio.set_variants(name[len("sound:"):], asset)
+
+    def _finish_startup(self):
+        """Note the first frame, and report startup times once everything is loaded"""
+        self.startup.mark("first frame")
+        if self.assets.is_loading():
+            return
+        self.startup_pending = False
+        if self.startup_report:
+            print(self.startup.report())
 
     def _create_retro_background(self):
         """Create a retro pixelated background with scanlines"""
-        background = pygame.Surface((WINDOW_WIDTH, WINDOW_HEIGHT))
+        background = create_surface((WINDOW_WIDTH, WINDOW_HEIGHT))
         background.fill(RETRO_BACKGROUND)
         
         # Add retro grid pattern
@@ -89,9 +183,9 @@ class TypingSpeedGame:
 
     def _play_sound(self, sound_name):
         """Safely play a sound effect"""
-        if self.sounds.get(sound_name):
+        with self.profiler.section("audio"):
             try:
-                self.sounds[sound_name].play()
+                self.audio.play(sound_name)
             except pygame.error:
                 pass
 
@@ -101,174 +195,239 @@ class TypingSpeedGame:
                 return False
 
             if event.type == pygame.KEYDOWN:
-                if self.selecting_difficulty:
-                    if event.key == pygame.K_1:
-                        self.difficulty_manager.set_difficulty("easy")
-                        self.selecting_difficulty = False
-                        self.game_state.game_started = True
-                        self.effects_manager.add_text_popup("EASY MODE!", WINDOW_WIDTH//2, WINDOW_HEIGHT//2, (0, 255, 0))
-                    elif event.key == pygame.K_2:
-                        self.difficulty_manager.set_difficulty("medium")
-                        self.selecting_difficulty = False
-                        self.game_state.game_started = True
-                        self.effects_manager.add_text_popup("MEDIUM MODE!", WINDOW_WIDTH//2, WINDOW_HEIGHT//2, (255, 255, 0))
-                    elif event.key == pygame.K_3:
-                        self.difficulty_manager.set_difficulty("hard")
-                        self.selecting_difficulty = False
-                        self.game_state.game_started = True
-                        self.effects_manager.add_text_popup("HARD MODE!", WINDOW_WIDTH//2, WINDOW_HEIGHT//2, (255, 0, 0))
-                    return True
-                
-                if not self.game_state.game_started:
-                    self.game_state.game_started = True
-                    return True
-                
-                if self.game_state.game_over:
-                    self.reset_game()
-                    return True
-
-                if event.key == pygame.K_RETURN and self.game_state.current_input.strip():
-                    word_match, word_pos = self.word_manager.check_word(self.game_state.current_input.strip())
-                    if word_match:
-                        self._play_sound("correct")
-                        
-                        # Add success effect
-                        if word_pos:
-                            self.effects_manager.add_pixel_burst(word_pos[0], word_pos[1], (0, 255, 0))
-                            self.effects_manager.add_text_popup("+1", word_pos[0], word_pos[1], (0, 255, 0))
-                        
-                        # Update score and check for level up
-                        speed_factor = self.game_state.update_score()
-                        if speed_factor > 1.0:
-                            self._play_sound("levelup")
-                            self.effects_manager.add_text_popup(f"LEVEL {self.game_state.level}!", WINDOW_WIDTH//2, WINDOW_HEIGHT//3, RETRO_ACCENT)
-                            
-                        self.game_state.total_chars_typed += len(self.game_state.current_input)
-                        self.word_manager.increase_speed(speed_factor)
-                        
-                        # Check for powerup collection
-                        if word_pos:
-                            collected = self.powerup_manager.check_collection(word_pos[0], word_pos[1])
-                            if collected:
-                                self._play_sound("powerup")
-                                self.effects_manager.add_pixel_burst(word_pos[0], word_pos[1], (255, 255, 0))
-                                
-                                if collected == "freeze":
-                                    self.powerup_manager.activate_effect("freeze", 300)
-                                    self.effects_manager.add_text_popup("FREEZE!", word_pos[0], word_pos[1], (0, 255, 255))
-                                elif collected == "clear":
-                                    self.word_manager.clear_words()
-                                    self.effects_manager.add_text_popup("CLEAR!", word_pos[0], word_pos[1], (255, 255, 0))
-                                elif collected == "life":
-                                    self.game_state.lives += 1
-                                    self.effects_manager.add_text_popup("+LIFE!", word_pos[0], word_pos[1], (0, 255, 0))
-                                elif collected == "shield":
-                                    self.powerup_manager.activate_effect("shield", 600)
-                                    self.effects_manager.add_text_popup("SHIELD!", word_pos[0], word_pos[1], (255, 0, 255))
-                    else:
-                        self._play_sound("wrong")
-                        # Add error effect
-                        self.effects_manager.add_screen_shake(5)
-                        self.effects_manager.add_text_popup("MISS!", WINDOW_WIDTH//2, WINDOW_HEIGHT//2, (255, 0, 0))
-                        
-                    self.game_state.current_input = ""
-                    
+                if event.key == pygame.K_F3:
+                    self.profiler.toggle()
+                    self.profiler_overlay = None
+                    continue
+                if self.replayer is not None:
+                    # Replays take their keys from the log
+                    continue
+                if event.key == pygame.K_RETURN:
+                    key = KEY_ENTER
                 elif event.key == pygame.K_BACKSPACE:
-                    self.game_state.current_input = self.game_state.current_input[:-1]
-                    
-                elif event.unicode.isprintable() and len(self.game_state.current_input) < 15:
-                    self.game_state.current_input += event.unicode
-                    self.game_state.total_chars_typed += 1
-                    self._play_sound("type")
+                    key = KEY_BACKSPACE
+                elif self.simulation.selecting_difficulty and event.key in DIFFICULTY_KEYCODES:
+                    key = DIFFICULTY_KEYCODES[event.key]
+                else:
+                    key = event.unicode
+                self._handle_events(self.simulation.press_key(key))
                     
         return True
 
-    def update(self):
-        if self.selecting_difficulty or not self.game_state.game_started or self.game_state.game_over:
-            self.effects_manager.update()
-            return
-
-        # Update all managers
-        self.powerup_manager.update()
-        self.powerup_manager.try_spawn()
-        self.effects_manager.update()
-        
-        # Only spawn and update words if freeze effect is not active
-        if not self.powerup_manager.is_effect_active("freeze"):
-            current_time = pygame.time.get_ticks()
-            spawn_delay = self.difficulty_manager.get_spawn_delay()
-            if current_time - self.last_spawn_time > spawn_delay:
-                self.word_manager.spawn_word()
-                self.last_spawn_time = current_time
-
-            self.word_manager.update_words()
-            
-        # Check for missed words
-        missed_words = self.word_manager.get_missed_words()
-        if missed_words > 0 and not self.powerup_manager.is_effect_active("shield"):
-            for _ in range(missed_words):
-                self.game_state.lose_life()
+    def _handle_events(self, events):
+        """Play sounds and effects for events coming out of the simulation"""
+        for event in events:
+            if event.kind == "type":
+                self._play_sound("type")
+            elif event.kind == "difficulty":
+                text, color = DIFFICULTY_POPUPS[event.value]
+                self.effects_manager.add_text_popup(text, WINDOW_WIDTH//2, WINDOW_HEIGHT//2, color)
+            elif event.kind == "correct":
+                self._play_sound("correct")
+                self.effects_manager.add_pixel_burst(event.x, event.y, (0, 255, 0))
+                self.effects_manager.add_text_popup("+1", event.x, event.y, (0, 255, 0))
+            elif event.kind == "levelup":
+                self._play_sound("levelup")
+                self.effects_manager.add_text_popup(f"LEVEL {event.value}!", WINDOW_WIDTH//2, WINDOW_HEIGHT//3, RETRO_ACCENT)
+            elif event.kind == "powerup":
+                self._play_sound("powerup")
+                self.effects_manager.add_pixel_burst(event.x, event.y, (255, 255, 0))
+                text, color = POWERUP_POPUPS[event.value]
+                self.effects_manager.add_text_popup(text, event.x, event.y, color)
+            elif event.kind == "miss":
+                self._play_sound("wrong")
+                self.effects_manager.add_screen_shake(5)
+                self.effects_manager.add_text_popup("MISS!", WINDOW_WIDTH//2, WINDOW_HEIGHT//2, (255, 0, 0))
+            elif event.kind == "life_lost":
                 self.effects_manager.add_screen_shake(8)
                 self.effects_manager.add_text_popup("-LIFE!", WINDOW_WIDTH//2, WINDOW_HEIGHT//4, (255, 0, 0))
+            elif event.kind == "game_over":
+                if self.stats_output:
+                    self.game_state.stats.export(self.stats_output)
+                if self.score_store is not None:
+                    self.score_store.save_scoreboard(self.game_state, self.player, self.simulation.current_seed)
+            elif event.kind == "reset":
+                self.effects_manager.clear_effects()
 
-    def draw(self):
+    def update(self):
+        """Advance the simulation and effects by one fixed timestep"""
+        with self.profiler.section("update.effects"):
+            self.effects_manager.update(TICK_SCALE)
+        if self.replayer is not None:
+            self._handle_events(self.replayer.apply(self.simulation))
+        self._handle_events(self.simulation.step())
+
+    def draw(self, alpha=1.0):
+        """Render the current state, interpolating motion by alpha between steps"""
         # Apply screen shake offset
         shake_offset = self.effects_manager.get_screen_shake_offset()
         
-        # Draw background
-        self.screen.blit(self.background, shake_offset)
+        # Dirty rects only work while nothing shifts or tints the whole screen
+        clean_frame = (
+            self.simulation.is_playing()
+            and shake_offset == (0, 0)
+            and not self.powerup_manager.is_effect_active("freeze")
+        )
+        with self.profiler.section("draw"):
+            if self.dirty_rects_enabled and clean_frame and self.last_frame_clean:
+                update_rects = self._draw_dirty(alpha)
+            else:
+                self._draw_full(shake_offset, alpha)
+                update_rects = None
+            
+            overlay_rect = self._draw_profiler_overlay()
+            if overlay_rect is not None:
+                self.previous_rects.append(overlay_rect)
+                if update_rects is not None:
+                    update_rects.append(overlay_rect)
+        
+        with self.profiler.section("flip"):
+            if update_rects is None:
+                pygame.display.flip()
+            else:
+                pygame.display.update(update_rects)
+        self.last_frame_clean = clean_frame
+        self.allocation_stats.end_frame()
+        allocations = self.allocation_stats.get_stats()
+        self.profiler.count("frame_surfaces", allocations["frame_surfaces"])
+        self.profiler.count("frame_bytes", allocations["frame_bytes"])
+
+    def _draw_full(self, shake_offset, alpha):
+        """Redraw the whole screen"""
+        rects = []
+        profiler = self.profiler
 
-        if self.selecting_difficulty:
-            self.draw_difficulty_menu()
+        if self.simulation.selecting_difficulty:
+            self.screen.blit(self._static_layer("difficulty", self.draw_difficulty_menu), shake_offset)
         elif not self.game_state.game_started:
-            self.game_state.draw_menu(self.screen)
+            self.screen.blit(self._static_layer("start", self.game_state.draw_menu), shake_offset)
         elif self.game_state.game_over:
-            self.game_state.draw_menu(self.screen, is_game_over=True)
+            # Final stats don't change while the game over screen is up
+            board = self.game_state
+            stats = (board.score, board.calculate_wpm(), board.stats.accuracy, board.stats.best_burst_wpm, board.level)
+            layer = self._static_layer("game_over", lambda surface: board.draw_menu(surface, is_game_over=True), stats)
+            self.screen.blit(layer, shake_offset)
         else:
-            # Draw game elements with shake offset
-            temp_surface = pygame.Surface((WINDOW_WIDTH, WINDOW_HEIGHT), pygame.SRCALPHA)
+            # Draw background
+            with profiler.section("draw.background"):
+                self.screen.blit(self.background, shake_offset)
+
+            # Draw straight to the screen unless shaking needs an offset composite
+            if shake_offset == (0, 0):
+                layer = self.screen
+            else:
+                layer = self.game_layer
+                layer.fill((0, 0, 0, 0))
             
-            self.word_manager.draw_words(temp_surface)
-            self.powerup_manager.draw(temp_surface)
-            self.game_state.draw_ui(temp_surface)
+            rects = self._draw_game_elements(layer, alpha)
             
             # Draw freeze effect overlay if active
             if self.powerup_manager.is_effect_active("freeze"):
-                freeze_surface = pygame.Surface((WINDOW_WIDTH, WINDOW_HEIGHT), pygame.SRCALPHA)
-                freeze_surface.fill((0, 255, 255, 40))
-                temp_surface.blit(freeze_surface, (0, 0))
+                layer.blit(self.freeze_overlay, (0, 0))
             
-            # Draw shield effect indicator if active
-            if self.powerup_manager.is_effect_active("shield"):
-                shield_height = 6
-                for i in range(3):
-                    y_pos = WINDOW_HEIGHT - shield_height - (i * 2)
-                    shield_rect = pygame.Rect(0, y_pos, WINDOW_WIDTH, 2)
-                    pygame.draw.rect(temp_surface, (255, 0, 255), shield_rect)
+            rects += self._draw_shield(layer)
             
-            self.screen.blit(temp_surface, shake_offset)
+            if layer is not self.screen:
+                self.screen.blit(layer, shake_offset)
         
         # Draw effects on top
-        self.effects_manager.draw(self.screen)
+        with profiler.section("draw.effects"):
+            rects += self.effects_manager.draw(self.screen, alpha)
         
-        pygame.display.flip()
+        self.previous_rects = rects
+
+    def _draw_dirty(self, alpha):
+        """Erase last frame's elements, redraw them and return the regions to update"""
+        profiler = self.profiler
+        with profiler.section("draw.background"):
+            for rect in self.previous_rects:
+                self.screen.blit(self.background, rect, rect)
+        
+        rects = self._draw_game_elements(self.screen, alpha)
+        rects += self._draw_shield(self.screen)
+        with profiler.section("draw.effects"):
+            rects += self.effects_manager.draw(self.screen, alpha)
+        
+        update_rects = self.previous_rects + rects
+        self.previous_rects = rects
+        return update_rects
+
+    def _draw_game_elements(self, layer, alpha):
+        """Draw words, powerups and HUD, returning the rects drawn"""
+        profiler = self.profiler
+        with profiler.section("draw.words"):
+            rects = self.word_manager.draw_words(layer, alpha)
+        with profiler.section("draw.powerups"):
+            rects += self.powerup_manager.draw(layer, alpha)
+        with profiler.section("draw.hud"):
+            rects += self.game_state.draw_ui(layer)
+        return rects
+
+    def _draw_shield(self, layer):
+        """Draw the shield effect indicator if active, returning the rects drawn"""
+        rects = []
+        if self.powerup_manager.is_effect_active("shield"):
+            shield_height = 6
+            for i in range(3):
+                y_pos = WINDOW_HEIGHT - shield_height - (i * 2)
+                shield_rect = pygame.Rect(0, y_pos, WINDOW_WIDTH, 2)
+                rects.append(pygame.draw.rect(layer, (255, 0, 255), shield_rect))
+        return rects
         
-    def draw_difficulty_menu(self):
+    def _draw_profiler_overlay(self):
+        """Draw rolling section timings when profiling, returning the rect drawn"""
+        if not self.profiler.enabled:
+            return None
+        if self.profiler_overlay is None or self.profiler.frame % PROFILE_OVERLAY_REFRESH == 0:
+            self.profiler_overlay = self._build_profiler_overlay()
+        return self.screen.blit(self.profiler_overlay, (10, 140))
+
+    def _build_profiler_overlay(self):
+        """Render the p50/p95/p99 table for every profiled section and counter"""
+        font = get_font(16)
+        rows = [("SECTION", "P50", "P95", "P99")]
+        for name, (p50, p95, p99) in self.profiler.summary().items():
+            rows.append((name.upper(), f"{p50:.2f}", f"{p95:.2f}", f"{p99:.2f}"))
+        for name, values in self.profiler.count_summary().items():
+            # Byte counts are shown in KB so they fit the columns
+            rows.append((name.upper(), *(f"{value:.0f}" if value < 10000 else f"{value / 1024:.0f}K"
+                                         for value in values)))
+
+        overlay = create_surface((240, 12 * len(rows) + 8), pygame.SRCALPHA)
+        overlay.fill((0, 0, 0, 180))
+        columns = (4, 120, 160, 200)
+        for row_index, row in enumerate(rows):
+            color = RETRO_ACCENT if row_index == 0 else (255, 255, 255)
+            for x, text in zip(columns, row):
+                overlay.blit(text_cache.render(font, text, color), (x, 4 + row_index * 12))
+        return overlay
+
+    def _static_layer(self, name, draw_layer, key=None):
+        """Get a screen pre-composited over the background, rebuilding it when key changes"""
+        cached = self.static_layers.get(name)
+        if cached is None or cached[0] != key:
+            layer = create_surface((WINDOW_WIDTH, WINDOW_HEIGHT))
+            layer.blit(self.background, (0, 0))
+            draw_layer(layer)
+            cached = self.static_layers[name] = (key, layer)
+        return cached[1]
+
+    def draw_difficulty_menu(self, screen):
         """Draw retro difficulty selection menu"""
-        # Create pixel font
-        pixel_font_large = pygame.font.Font(None, 48)
-        pixel_font_medium = pygame.font.Font(None, 32)
-        pixel_font_small = pygame.font.Font(None, 24)
+        # Pixel fonts
+        pixel_font_large = get_font(48)
+        pixel_font_medium = get_font(32)
+        pixel_font_small = get_font(24)
         
         # Title
         title_text = "SELECT DIFFICULTY"
         title_surface = pixel_font_large.render(title_text, False, (255, 255, 255))
         title_rect = title_surface.get_rect(center=(WINDOW_WIDTH//2, 80))
-        self.screen.blit(title_surface, title_rect)
+        screen.blit(title_surface, title_rect)
         
         # Retro border around title
         border_rect = pygame.Rect(title_rect.x - 10, title_rect.y - 5, title_rect.width + 20, title_rect.height + 10)
-        pygame.draw.rect(self.screen, RETRO_ACCENT, border_rect, 2)
+        pygame.draw.rect(screen, RETRO_ACCENT, border_rect, 2)
         
         # Difficulty options
         difficulties = [
@@ -281,37 +440,98 @@ class TypingSpeedGame:
             # Main option text
             option_surface = pixel_font_medium.render(text, False, color)
             option_rect = option_surface.get_rect(center=(WINDOW_WIDTH//2, y_pos))
-            self.screen.blit(option_surface, option_rect)
+            screen.blit(option_surface, option_rect)
             
             # Description text
             desc_surface = pixel_font_small.render(desc, False, (200, 200, 200))
             desc_rect = desc_surface.get_rect(center=(WINDOW_WIDTH//2, y_pos + 25))
-            self.screen.blit(desc_surface, desc_rect)
+            screen.blit(desc_surface, desc_rect)
             
             # Retro selection box
             box_rect = pygame.Rect(option_rect.x - 15, option_rect.y - 5, option_rect.width + 30, 35)
-            pygame.draw.rect(self.screen, color, box_rect, 1)
-
-    def reset_game(self):
-        self.selecting_difficulty = True
-        self.game_state.reset()
-        self.word_manager.clear_words()
-        self.word_manager.reset_speed()
-        self.powerup_manager.clear_powerups()
-        self.effects_manager.clear_effects()
-        self.last_spawn_time = pygame.time.get_ticks()
+            pygame.draw.rect(screen, color, box_rect, 1)
 
     def run(self):
         running = True
+        accumulator = 0.0
+        previous_time = time.perf_counter()
+        profiler = self.profiler
         while running:
-            running = self.handle_input()
-            self.update()
-            self.draw()
+            # Clamp long frames so a stall doesn't trigger a burst of catch-up steps
+            current_time = time.perf_counter()
+            accumulator += min(current_time - previous_time, MAX_FRAME_TIME)
+            previous_time = current_time
+            
+            profiler.begin_frame()
+            if self.assets.is_loading():
+                self.apply_loaded_assets()
+            with profiler.section("input"):
+                running = self.handle_input()
+            with profiler.section("update"):
+                while accumulator >= TIMESTEP:
+                    self.update()
+                    accumulator -= TIMESTEP
+            self.draw(accumulator / TIMESTEP)
+            profiler.end_frame()
+            if self.startup_pending:
+                self._finish_startup()
             self.clock.tick(FPS)
+            
+            if self.replayer is not None and self.replayer.finished(self.simulation):
+                running = False
 
+        if self.simulation.recorder is not None:
+            self.simulation.recorder.close(self.simulation.ticks)
+        if self.score_store is not None:
+            self.score_store.close()
+        if profiler.enabled:
+            print("Audio: " + ", ".join(f"{key} {value:.2f}" if isinstance(value, float) else f"{key} {value}"
+                                        for key, value in self.audio.get_stats().items()))
+        profiler.close()
+        self.assets.shutdown()
         pygame.quit()
         sys.exit()
 
 if __name__ == "__main__":
-    game = TypingSpeedGame()
+    import argparse
+
+    def seed_value(text):
+        seed = int(text)
+        if not 0 <= seed <= MAX_SEED:
+            raise argparse.ArgumentTypeError(f"seed must be between 0 and {MAX_SEED}")
+        return seed
+
+    parser = argparse.ArgumentParser(description="RETRO TYPER")
+    parser.add_argument("--profile", action="store_true", help="start with the frame profiler on (F3 toggles)")
+    parser.add_argument("--profile-out", help="stream per-frame timings to a .csv or .jsonl file")
+    parser.add_argument("--seed", type=seed_value, help="seed for words, powerups and effects")
+    parser.add_argument("--record", help="record the seed and every keystroke to a log file")
+    parser.add_argument("--replay", help="play back a recorded log in real time")
+    parser.add_argument("--words", help="word store (.rtw) or text word list to play with")
+    parser.add_argument("--stats-out", help="write typing statistics and latency histograms as JSON at game over")
+    parser.add_argument("--player", default=PLAYER_NAME, help="name saved with each finished game")
+    parser.add_argument("--scores", default=SCORE_DB_PATH, help="SQLite database for session history")
+    parser.add_argument("--no-scores", action="store_true", help="don't save finished games")
+    parser.add_argument("--startup-report", action="store_true", help="print a startup time breakdown once loaded")
+    args = parser.parse_args()
+
+    try:
+        word_list = open_store(args.words) if args.words else None
+        replay_log = read_log(args.replay, word_list) if args.replay else None
+    except ValueError as error:
+        parser.error(str(error))
+
+    game = TypingSpeedGame(
+        profile=args.profile or bool(args.profile_out),
+        profile_output=args.profile_out,
+        seed=args.seed,
+        record_path=args.record,
+        replay_log=replay_log,
+        word_list=word_list,
+        stats_output=args.stats_out,
+        # Replays would only save copies of the recorded session
+        score_store=None if args.no_scores or args.replay else ScoreStore(args.scores),
+        player=args.player,
+        startup_report=args.startup_report
+    )
     game.run()
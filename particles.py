@@ -0,0 +1,169 @@
+"""
+Structure-of-arrays particle pool with vectorized updates and drawing.
+
+Needs NumPy; EffectsManager falls back to PixelParticle objects without it.
+"""
+import pygame
+from config import PARTICLE_POOL_SIZE
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+HAS_NUMPY = np is not None
+
+# Particle sizes in pixels, matching PixelParticle
+PARTICLE_SIZES = (2, 3, 4)
+PARTICLE_LIFE = 40
+GRAVITY = 0.1
+
+class ParticlePool:
+    def __init__(self, capacity=PARTICLE_POOL_SIZE, seed=None):
+        self.capacity = capacity
+        self.count = 0
+        self.rng = np.random.default_rng(seed)
+
+        # Live particles occupy [0, count); everything is allocated once up front
+        self.x = np.zeros(capacity, np.float32)
+        self.y = np.zeros(capacity, np.float32)
+        self.prev_x = np.zeros(capacity, np.float32)
+        self.prev_y = np.zeros(capacity, np.float32)
+        self.vx = np.zeros(capacity, np.float32)
+        self.vy = np.zeros(capacity, np.float32)
+        self.life = np.zeros(capacity, np.float32)
+        self.size = np.zeros(capacity, np.int8)
+        self.color = np.zeros((capacity, 3), np.uint8)
+
+        # Scratch buffers reused every frame; ufuncs, compress and take write
+        # into slices of these so updating and drawing allocate no arrays
+        self._scratch = np.zeros(capacity, np.float32)
+        self._dead = np.zeros(capacity, bool)
+        self._mask = np.zeros(capacity, bool)
+        self._visible = np.zeros(capacity, bool)
+        self._indices = np.arange(capacity, dtype=np.intp)
+        self._holes = np.zeros(capacity, np.intp)
+        self._movers = np.zeros(capacity, np.intp)
+        self._px = np.zeros(capacity, np.int32)
+        self._py = np.zeros(capacity, np.int32)
+        self._group_x = np.zeros(capacity, np.int32)
+        self._group_y = np.zeros(capacity, np.int32)
+        self._group_color = np.zeros((capacity, 3), np.uint8)
+        self._sx = np.zeros(capacity, np.int32)
+        self._sy = np.zeros(capacity, np.int32)
+        self._draw_x = np.zeros(capacity, np.int32)
+        self._draw_y = np.zeros(capacity, np.int32)
+        self._draw_color = np.zeros((capacity, 3), np.uint8)
+
+        self._fields = (self.x, self.y, self.prev_x, self.prev_y, self.vx, self.vy,
+                        self.life, self.size, self.color)
+        self._moved = tuple(np.zeros_like(field) for field in self._fields)
+
+    def emit(self, x, y, color, count):
+        """Add up to count particles at (x, y); extras are dropped when the pool is full"""
+        count = min(count, self.capacity - self.count)
+        if count <= 0:
+            return
+        start, end = self.count, self.count + count
+        self.x[start:end] = x
+        self.y[start:end] = y
+        self.prev_x[start:end] = x
+        self.prev_y[start:end] = y
+        self.vx[start:end] = self.rng.uniform(-2, 2, count)
+        self.vy[start:end] = self.rng.uniform(-3, -1, count)
+        self.life[start:end] = PARTICLE_LIFE
+        self.size[start:end] = self.rng.choice(PARTICLE_SIZES, count)
+        self.color[start:end] = color[:3]
+        self.count = end
+
+    def update(self, dt=1.0):
+        """Integrate every live particle and recycle the dead ones"""
+        n = self.count
+        if n == 0:
+            return
+        x, y, vx, vy, scratch = self.x[:n], self.y[:n], self.vx[:n], self.vy[:n], self._scratch[:n]
+        self.prev_x[:n] = x
+        self.prev_y[:n] = y
+        np.multiply(vx, dt, out=scratch)
+        x += scratch
+        np.multiply(vy, dt, out=scratch)
+        y += scratch
+        vy += GRAVITY * dt
+        self.life[:n] -= dt
+
+        dead = np.less_equal(self.life[:n], 0, out=self._dead[:n])
+        if dead.any():
+            self._swap_remove(dead)
+
+    def _swap_remove(self, dead):
+        """Fill holes left by dead particles with live ones from the tail"""
+        n = self.count
+        alive_count = n - int(np.count_nonzero(dead))
+        # Dead slots before alive_count match live particles after it one to one
+        hole_count = int(np.count_nonzero(dead[:alive_count]))
+        holes = np.compress(dead[:alive_count], self._indices[:alive_count], out=self._holes[:hole_count])
+        tail_alive = np.logical_not(dead[alive_count:n], out=self._mask[alive_count:n])
+        movers = np.compress(tail_alive, self._indices[alive_count:n], out=self._movers[:hole_count])
+        for field, moved in zip(self._fields, self._moved):
+            moved = moved[:hole_count]
+            np.take(field, movers, axis=0, out=moved)
+            field[holes] = moved
+        self.count = alive_count
+
+    def draw(self, screen, alpha=1.0):
+        """Write every live particle straight into the screen pixels and return their bounds"""
+        n = self.count
+        if n == 0:
+            return None
+        px, py, scratch = self._px[:n], self._py[:n], self._scratch[:n]
+
+        # Interpolated integer positions
+        np.subtract(self.x[:n], self.prev_x[:n], out=scratch)
+        scratch *= alpha
+        scratch += self.prev_x[:n]
+        px[:] = scratch
+        np.subtract(self.y[:n], self.prev_y[:n], out=scratch)
+        scratch *= alpha
+        scratch += self.prev_y[:n]
+        py[:] = scratch
+
+        width, height = screen.get_size()
+        pixels = pygame.surfarray.pixels3d(screen)
+        try:
+            for size in PARTICLE_SIZES:
+                in_group = np.equal(self.size[:n], size, out=self._mask[:n])
+                m = int(np.count_nonzero(in_group))
+                if m == 0:
+                    continue
+                base_x = np.compress(in_group, px, out=self._group_x[:m])
+                base_y = np.compress(in_group, py, out=self._group_y[:m])
+                colors = np.compress(in_group, self.color[:n], axis=0, out=self._group_color[:m])
+                sx, sy, visible, check = self._sx[:m], self._sy[:m], self._visible[:m], self._dead[:m]
+                for dx in range(size):
+                    np.add(base_x, dx, out=sx)
+                    for dy in range(size):
+                        np.add(base_y, dy, out=sy)
+                        np.greater_equal(sx, 0, out=visible)
+                        visible &= np.less(sx, width, out=check)
+                        visible &= np.greater_equal(sy, 0, out=check)
+                        visible &= np.less(sy, height, out=check)
+                        k = int(np.count_nonzero(visible))
+                        if k == m:
+                            pixels[sx, sy] = colors
+                        elif k:
+                            pixels[np.compress(visible, sx, out=self._draw_x[:k]),
+                                   np.compress(visible, sy, out=self._draw_y[:k])] = \
+                                np.compress(visible, colors, axis=0, out=self._draw_color[:k])
+        finally:
+            # Release the surface lock before anything else blits to the screen
+            del pixels
+
+        left, top = int(px.min()), int(py.min())
+        bounds = pygame.Rect(left, top, int(px.max()) - left + max(PARTICLE_SIZES), int(py.max()) - top + max(PARTICLE_SIZES))
+        return bounds.clip(screen.get_rect())
+
+    def clear(self):
+        self.count = 0
+
+    def __len__(self):
+        return self.count
@@ -1,8 +1,9 @@
-import random
 import pygame
+from simulation import PowerUp, PowerUpField
+from text_cache import text_cache
+from fonts import get_font
 from config import (
-    WINDOW_WIDTH, 
-    WINDOW_HEIGHT,
+    WINDOW_WIDTH,
     RETRO_CYAN,
     RETRO_YELLOW,
     RETRO_GREEN,
@@ -11,14 +12,9 @@ from config import (
     RETRO_WHITE
 )
 
-class RetroPowerUp:
-    def __init__(self, type_name):
-        self.type = type_name
-        self.x = random.randint(50, WINDOW_WIDTH - 50)
-        self.y = -30
-        self.speed = 0.8
-        self.is_active = True
-        self.size = 16
+class RetroPowerUp(PowerUp):
+    def __init__(self, type_name, x):
+        super().__init__(type_name, x)
         
         # Retro colors and simple geometric symbols
         self.colors = {
@@ -36,76 +32,63 @@ class RetroPowerUp:
             "shield": "square"
         }
         
-    def update(self):
-        self.y += self.speed
-        return self.y < WINDOW_HEIGHT + 30
-        
-    def draw(self, screen, font):
+    def draw(self, screen, font, alpha=1.0):
+        """Draw the powerup shape and return the rect it covers"""
         if not self.is_active:
-            return
+            return None
             
         color = self.colors[self.type]
         shape = self.shapes[self.type]
+        x = self.x
+        y = self.prev_y + (self.y - self.prev_y) * alpha
         
         # Draw different retro shapes
         if shape == "diamond":
             # Diamond shape for freeze
             points = [
-                (self.x, self.y - self.size),
-                (self.x + self.size, self.y),
-                (self.x, self.y + self.size),
-                (self.x - self.size, self.y)
+                (x, y - self.size),
+                (x + self.size, y),
+                (x, y + self.size),
+                (x - self.size, y)
             ]
             pygame.draw.polygon(screen, color, points)
             pygame.draw.polygon(screen, RETRO_WHITE, points, 2)
             
         elif shape == "star":
             # Star shape for clear (simplified as plus)
-            pygame.draw.rect(screen, color, (self.x - self.size, self.y - 3, self.size * 2, 6))
-            pygame.draw.rect(screen, color, (self.x - 3, self.y - self.size, 6, self.size * 2))
-            pygame.draw.rect(screen, RETRO_WHITE, (self.x - self.size, self.y - 3, self.size * 2, 6), 1)
-            pygame.draw.rect(screen, RETRO_WHITE, (self.x - 3, self.y - self.size, 6, self.size * 2), 1)
+            pygame.draw.rect(screen, color, (x - self.size, y - 3, self.size * 2, 6))
+            pygame.draw.rect(screen, color, (x - 3, y - self.size, 6, self.size * 2))
+            pygame.draw.rect(screen, RETRO_WHITE, (x - self.size, y - 3, self.size * 2, 6), 1)
+            pygame.draw.rect(screen, RETRO_WHITE, (x - 3, y - self.size, 6, self.size * 2), 1)
             
         elif shape == "heart":
             # Heart shape for life (simplified as circle)
-            pygame.draw.circle(screen, color, (int(self.x), int(self.y)), self.size)
-            pygame.draw.circle(screen, RETRO_WHITE, (int(self.x), int(self.y)), self.size, 2)
+            pygame.draw.circle(screen, color, (int(x), int(y)), self.size)
+            pygame.draw.circle(screen, RETRO_WHITE, (int(x), int(y)), self.size, 2)
             
         elif shape == "square":
             # Square shape for shield
-            rect = pygame.Rect(self.x - self.size, self.y - self.size, self.size * 2, self.size * 2)
+            rect = pygame.Rect(x - self.size, y - self.size, self.size * 2, self.size * 2)
             pygame.draw.rect(screen, color, rect)
             pygame.draw.rect(screen, RETRO_WHITE, rect, 2)
+            
+        return pygame.Rect(x - self.size - 1, y - self.size - 1, self.size * 2 + 3, self.size * 2 + 3)
         
-    def is_collected(self, word_x, word_y):
-        """Check if a typed word is close enough to collect this power-up"""
-        distance = ((self.x - word_x) ** 2 + (self.y - word_y) ** 2) ** 0.5
-        return distance < self.size * 2
+class PowerUpManager(PowerUpField):
+    powerup_class = RetroPowerUp
 
-class PowerUpManager:
-    def __init__(self):
-        self.powerups = []
-        self.font = pygame.font.Font(None, 20)
-        self.ui_font = pygame.font.Font(None, 16)
-        self.spawn_chance = 0.01  # 1% chance per update
-        self.active_effects = {
-            "freeze": 0,
-            "shield": 0
-        }
+    def __init__(self, rng=None):
+        super().__init__(rng)
+        self.font = get_font(20)
+        self.ui_font = get_font(16)
         
-    def update(self):
-        # Update existing powerups
-        self.powerups = [p for p in self.powerups if p.update() and p.is_active]
-        
-        # Update active effect timers
-        for effect in list(self.active_effects.keys()):
-            if self.active_effects[effect] > 0:
-                self.active_effects[effect] -= 1
-                
-    def draw(self, screen):
+    def draw(self, screen, alpha=1.0):
+        """Draw powerups and the active effects panel, returning the rects drawn"""
+        rects = []
         # Draw powerups
         for powerup in self.powerups:
-            powerup.draw(screen, self.font)
+            if powerup.is_active:
+                rects.append(powerup.draw(screen, self.font, alpha))
             
         # Draw retro active effects panel
         if any(time > 0 for time in self.active_effects.values()):
@@ -118,17 +101,18 @@ class PowerUpManager:
             panel_rect = pygame.Rect(panel_x, panel_y, panel_width, panel_height)
             pygame.draw.rect(screen, RETRO_SURFACE, panel_rect)
             pygame.draw.rect(screen, RETRO_WHITE, panel_rect, 1)
+            rects.append(panel_rect)
             
             # Draw active effects
             y_offset = 10
             for effect, time in self.active_effects.items():
                 if time > 0:
-                    seconds = time // 60 + 1
+                    seconds = int(time // 60) + 1
                     effect_text = f"{effect.upper()}: {seconds}S"
                     
                     color = RETRO_CYAN if effect == "freeze" else RETRO_MAGENTA
                     
-                    text_surface = self.ui_font.render(effect_text, False, color)
+                    text_surface = text_cache.render(self.ui_font, effect_text, color)
                     screen.blit(text_surface, (panel_x + 5, panel_y + y_offset))
                     
                     # Simple progress bar
@@ -145,31 +129,5 @@ class PowerUpManager:
                     pygame.draw.rect(screen, color, (bar_x, bar_y, int(bar_width * progress), bar_height))
                     
                     y_offset += 25
-                    
-    def try_spawn(self):
-        """Try to spawn a new powerup based on chance"""
-        if random.random() < self.spawn_chance and len(self.powerups) < 2:
-            powerup_type = random.choice(["freeze", "clear", "life", "shield"])
-            self.powerups.append(RetroPowerUp(powerup_type))
-            
-    def check_collection(self, word_x, word_y):
-        """Check if any powerup is collected by a correctly typed word"""
-        for powerup in self.powerups:
-            if powerup.is_active and powerup.is_collected(word_x, word_y):
-                powerup.is_active = False
-                return powerup.type
-        return None
-        
-    def activate_effect(self, effect_type, duration=300):
-        """Activate a powerup effect"""
-        if effect_type in self.active_effects:
-            self.active_effects[effect_type] = duration
-            
-    def is_effect_active(self, effect_type):
-        """Check if an effect is currently active"""
-        return self.active_effects.get(effect_type, 0) > 0
         
-    def clear_powerups(self):
-        """Clear all powerups from screen"""
-        self.powerups.clear()
-        self.active_effects = {key: 0 for key in self.active_effects}
+        return rects
@@ -0,0 +1,180 @@
+"""
+Per-frame section timing with rolling percentiles.
+
+Sections are timed with `with profiler.section("name"):`. A disabled
+profiler hands out a shared no-op context, so instrumented code costs one
+method call per section when profiling is off. Per-frame counts such as
+surface allocations are recorded with `profiler.count("name", value)`.
+"""
+import csv
+import json
+import time
+from config import PROFILE_WINDOW
+
+class RollingSamples:
+    def __init__(self, size=PROFILE_WINDOW):
+        self.samples = [0.0] * size
+        self.index = 0
+        self.count = 0
+
+    def add(self, value):
+        """Store a sample, overwriting the oldest once the buffer is full"""
+        self.samples[self.index] = value
+        self.index = (self.index + 1) % len(self.samples)
+        self.count = min(self.count + 1, len(self.samples))
+
+    def percentiles(self, *points):
+        """Get the given percentiles (0-100) of the stored samples"""
+        if self.count == 0:
+            return [0.0 for _ in points]
+        ordered = sorted(self.samples[:self.count])
+        last = self.count - 1
+        return [ordered[min(last, int(round(point / 100 * last)))] for point in points]
+
+class _NullSection:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+_NULL_SECTION = _NullSection()
+
+class _Section:
+    __slots__ = ("profiler", "name", "start")
+
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+        self.start = 0.0
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.profiler.record(self.name, time.perf_counter() - self.start)
+        return False
+
+class FrameProfiler:
+    def __init__(self, enabled=False, window=PROFILE_WINDOW, output_path=None):
+        self.enabled = enabled
+        self.window = window
+        self.frame = 0
+        self.frame_start = 0.0
+        # Set between begin_frame and end_frame of a profiled frame
+        self.in_frame = False
+        # Toggles wait for the next frame boundary so no frame is half-timed
+        self.pending_enabled = None
+        self.frame_times = {}
+        self.frame_counts = {}
+        self.history = {}
+        self.count_history = {}
+        self._sections = {}
+        self.output = None
+        self.writer = None
+        if output_path:
+            self.open_output(output_path)
+
+    def section(self, name):
+        """Get a context manager that times a named section of the frame"""
+        if not self.enabled:
+            return _NULL_SECTION
+        section = self._sections.get(name)
+        if section is None:
+            section = self._sections[name] = _Section(self, name)
+        return section
+
+    def record(self, name, seconds):
+        """Add time to a section; repeated sections in one frame are summed"""
+        self.frame_times[name] = self.frame_times.get(name, 0.0) + seconds
+
+    def count(self, name, value):
+        """Add to a per-frame counter; ignored while profiling is off"""
+        if self.enabled:
+            self.frame_counts[name] = self.frame_counts.get(name, 0) + value
+
+    def toggle(self):
+        """Switch profiling on or off from the start of the next frame"""
+        current = self.enabled if self.pending_enabled is None else self.pending_enabled
+        self.pending_enabled = not current
+
+    def begin_frame(self):
+        if self.pending_enabled is not None:
+            self.enabled = self.pending_enabled
+            self.pending_enabled = None
+        self.in_frame = self.enabled
+        if self.enabled:
+            self.frame_start = time.perf_counter()
+        else:
+            self.frame_times.clear()
+            self.frame_counts.clear()
+
+    def end_frame(self):
+        """Fold this frame's section times into the rolling history and the output file"""
+        if not (self.enabled and self.in_frame):
+            # Profiling was switched on or off mid-frame; drop the partial times
+            self.frame_times.clear()
+            self.frame_counts.clear()
+            self.in_frame = False
+            return
+        self.in_frame = False
+        self.record("frame", time.perf_counter() - self.frame_start)
+        for name, seconds in self.frame_times.items():
+            samples = self.history.get(name)
+            if samples is None:
+                samples = self.history[name] = RollingSamples(self.window)
+            samples.add(seconds)
+        for name, value in self.frame_counts.items():
+            samples = self.count_history.get(name)
+            if samples is None:
+                samples = self.count_history[name] = RollingSamples(self.window)
+            samples.add(value)
+        if self.output is not None:
+            self._write_frame()
+        self.frame_times.clear()
+        self.frame_counts.clear()
+        self.frame += 1
+
+    def summary(self):
+        """Get p50/p95/p99 in milliseconds for every section seen so far"""
+        return {
+            name: tuple(value * 1000 for value in samples.percentiles(50, 95, 99))
+            for name, samples in sorted(self.history.items())
+        }
+
+    def count_summary(self):
+        """Get p50/p95/p99 of every per-frame counter seen so far"""
+        return {
+            name: tuple(samples.percentiles(50, 95, 99))
+            for name, samples in sorted(self.count_history.items())
+        }
+
+    def open_output(self, path):
+        """Stream per-frame section times to a .csv or .jsonl file"""
+        self.close()
+        self.output = open(path, "w", newline="")
+        if path.endswith(".csv"):
+            self.writer = csv.writer(self.output)
+            self.writer.writerow(["frame", "section", "ms", "count"])
+        else:
+            self.writer = None
+
+    def _write_frame(self):
+        if self.writer is not None:
+            for name, seconds in self.frame_times.items():
+                self.writer.writerow([self.frame, name, f"{seconds * 1000:.4f}", ""])
+            for name, value in self.frame_counts.items():
+                self.writer.writerow([self.frame, name, "", value])
+        else:
+            row = {name: round(seconds * 1000, 4) for name, seconds in self.frame_times.items()}
+            self.output.write(json.dumps({"frame": self.frame, "ms": row, "counts": self.frame_counts}) + "\n")
+
+    def close(self):
+        if self.output is not None:
+            self.output.close()
+            self.output = None
+            self.writer = None
+
+# Shared disabled profiler for code that is not being profiled
+NULL_PROFILER = FrameProfiler(enabled=False)
@@ -0,0 +1,449 @@
+"""
+Server-authoritative multiplayer races over WebSockets.
+
+Each room runs one headless GameSimulation per player, all with the room's
+seed, so every player races against the same word stream. Clients only
+send keystrokes; the server checks them, applies them on its own fixed
+tick and broadcasts the standings every few ticks. Rooms start once full
+and end when every player is out or the time limit is reached.
+
+    python race_server.py --port 8765 --players 4
+    python race_server.py --bots 100 --players 4 --race-seconds 30
+
+The second form starts a server and fills 100 rooms with bot clients that
+connect over real sockets, then prints per-room tick latency. Add
+--connect localhost:8765 to aim the bots at a server in another process.
+
+Messages are JSON text frames:
+
+    -> {"type": "join", "name": "ANA", "room": "optional-private-room (up to 32 characters)"}
+    <- {"type": "joined", "room": ..., "player": ..., "seed": ..., "difficulty": ..., "players": ...}
+    <- {"type": "start", "tick": 0}
+    -> {"type": "keys", "keys": "hello\\r"}
+    <- {"type": "state", "tick": ..., "standings": [...]}
+    <- {"type": "end", "tick": ..., "standings": [...], "metrics": {...}}
+    <- {"type": "error", "message": ...}
+"""
+import argparse
+import asyncio
+import itertools
+import json
+import random
+import string
+import time
+from simulation import GameSimulation, KEY_ENTER, KEY_BACKSPACE
+from typist import SimulatedTypist
+from profiler import RollingSamples
+from websocket_io import WebSocketError, accept, connect, encode_frame
+from config import TIMESTEP
+
+RACE_PORT = 8765
+ROOM_SIZE = 4
+RACE_DIFFICULTY = "medium"
+RACE_SECONDS = 120
+# Standings go out every BROADCAST_TICKS simulation ticks (10 Hz at 60 ticks/s)
+BROADCAST_TICKS = 6
+# Ticks a late room may run back to back before skipping ahead
+MAX_CATCH_UP = 5
+# Keystroke limits: a burst per message and a sustained rate (25/s is 300 WPM)
+MAX_KEYS_PER_MESSAGE = 32
+MAX_KEYS_PER_SECOND = 25
+# Clients more than this many bytes behind on broadcasts are disconnected
+MAX_SEND_BUFFER = 256 * 1024
+# Seconds players get to answer the close frame sent when a race ends
+CLOSE_TIMEOUT = 5
+# Pending connections the listening socket queues while a crowd joins
+LISTEN_BACKLOG = 1024
+# Private room names are limited in length and in how many may exist at once
+MAX_ROOM_NAME = 32
+MAX_PRIVATE_ROOMS = 1024
+# Ticks kept per room for latency percentiles
+TICK_WINDOW = 600
+
+ALLOWED_KEYS = frozenset(string.printable) - frozenset(string.whitespace) | {" ", KEY_ENTER, KEY_BACKSPACE}
+
+class RacePlayer:
+    def __init__(self, player_id, name, socket, simulation):
+        self.id = player_id
+        self.name = name
+        self.socket = socket
+        self.simulation = simulation
+        self.pending = []
+        self.key_credit = MAX_KEYS_PER_MESSAGE
+        self.rejected_keys = 0
+        self.connected = True
+
+    def standing(self):
+        board = self.simulation.scoreboard
+        return {
+            "player": self.id,
+            "name": self.name,
+            "score": board.score,
+            "lives": board.lives,
+            "level": board.level,
+            "wpm": board.calculate_wpm(),
+            "out": board.game_over or not self.connected
+        }
+
+class RaceRoom:
+    def __init__(self, room_id, seed, size=ROOM_SIZE, difficulty=RACE_DIFFICULTY, race_ticks=int(RACE_SECONDS / TIMESTEP)):
+        self.id = room_id
+        self.seed = seed
+        self.size = size
+        self.difficulty = difficulty
+        self.race_ticks = race_ticks
+        self.players = []
+        self.player_ids = itertools.count()
+        self.ticks = 0
+        self.started = False
+        self.finished = False
+        self.task = None
+        # Seconds spent inside each tick, and how late each tick began
+        self.tick_times = RollingSamples(TICK_WINDOW)
+        self.lateness = RollingSamples(TICK_WINDOW)
+        self.skipped_ticks = 0
+        self.bytes_sent = 0
+
+    def is_open(self):
+        return not self.started and len(self.players) < self.size
+
+    def join(self, name, socket):
+        player = RacePlayer(next(self.player_ids), name, socket, GameSimulation(seed=self.seed))
+        self.players.append(player)
+        return player
+
+    def leave(self, player):
+        player.connected = False
+        # Free the seat if the race hasn't begun, so the room can still fill
+        if not self.started and player in self.players:
+            self.players.remove(player)
+
+    def queue_keys(self, player, keys):
+        """Check a client's keystrokes and queue them for the next tick; returns an error or None"""
+        if not isinstance(keys, str) or len(keys) > MAX_KEYS_PER_MESSAGE:
+            return f"send at most {MAX_KEYS_PER_MESSAGE} keys per message"
+        if not set(keys) <= ALLOWED_KEYS:
+            return "keys contain unsupported characters"
+        if not self.started or not player.simulation.is_playing():
+            return None
+        allowed = int(player.key_credit)
+        player.pending.extend(keys[:allowed])
+        player.key_credit -= min(allowed, len(keys))
+        if len(keys) > allowed:
+            player.rejected_keys += len(keys) - allowed
+            return "typing faster than the server allows; keys dropped"
+        return None
+
+    def start(self):
+        self.started = True
+        for player in self.players:
+            player.simulation.start(self.difficulty)
+        self._broadcast({"type": "start", "tick": 0})
+        self.task = asyncio.get_running_loop().create_task(self.run())
+        return self.task
+
+    def tick(self):
+        """Apply every player's queued keys, then advance each simulation one step"""
+        refill = MAX_KEYS_PER_SECOND * TIMESTEP
+        for player in self.players:
+            simulation = player.simulation
+            player.key_credit = min(MAX_KEYS_PER_MESSAGE, player.key_credit + refill)
+            if player.pending:
+                for key in player.pending:
+                    # A finished simulation would treat any key as "play again"
+                    if not simulation.is_playing():
+                        break
+                    simulation.press_key(key)
+                player.pending.clear()
+            if player.connected:
+                simulation.step()
+        self.ticks += 1
+        if self.ticks >= self.race_ticks or not any(player.connected and player.simulation.is_playing()
+                                                    for player in self.players):
+            self.finished = True
+
+    async def run(self):
+        loop = asyncio.get_running_loop()
+        next_tick = loop.time()
+        while not self.finished:
+            now = loop.time()
+            self.lateness.add(max(0.0, now - next_tick))
+            for _ in range(MAX_CATCH_UP):
+                started = time.perf_counter()
+                self.tick()
+                self.tick_times.add(time.perf_counter() - started)
+                next_tick += TIMESTEP
+                if self.ticks % BROADCAST_TICKS == 0 or self.finished:
+                    self._broadcast({"type": "state", "tick": self.ticks, "standings": self.standings()})
+                if self.finished or next_tick > now:
+                    break
+            if next_tick <= now:
+                # Too far behind to catch up; drop the backlog rather than spiral
+                skipped = int((now - next_tick) / TIMESTEP) + 1
+                self.skipped_ticks += skipped
+                next_tick += skipped * TIMESTEP
+            await asyncio.sleep(max(0.0, next_tick - loop.time()))
+
+        self._broadcast({"type": "end", "tick": self.ticks, "standings": self.standings(), "metrics": self.metrics()})
+        for player in self.players:
+            player.socket.start_close()
+        # Each player's connection handler closes the socket once the client answers
+        loop.call_later(CLOSE_TIMEOUT, self._drop_players)
+
+    def _drop_players(self):
+        for player in self.players:
+            if not player.socket.closed:
+                player.socket.abort()
+
+    def standings(self):
+        return sorted((player.standing() for player in self.players), key=lambda standing: -standing["score"])
+
+    def metrics(self):
+        tick_p50, tick_p95, tick_p99 = self.tick_times.percentiles(50, 95, 99)
+        late_p50, late_p95 = self.lateness.percentiles(50, 95)
+        return {
+            "room": self.id,
+            "players": len(self.players),
+            "ticks": self.ticks,
+            "tick_ms_p50": round(tick_p50 * 1000, 3),
+            "tick_ms_p95": round(tick_p95 * 1000, 3),
+            "tick_ms_p99": round(tick_p99 * 1000, 3),
+            "late_ms_p50": round(late_p50 * 1000, 3),
+            "late_ms_p95": round(late_p95 * 1000, 3),
+            "skipped_ticks": self.skipped_ticks,
+            "bytes_sent": self.bytes_sent,
+            "rejected_keys": sum(player.rejected_keys for player in self.players)
+        }
+
+    def _broadcast(self, message):
+        # Server frames aren't masked, so one encoding serves every player
+        frame = encode_frame(json.dumps(message, separators=(",", ":")))
+        for player in self.players:
+            if not player.connected:
+                continue
+            if player.socket.buffered() > MAX_SEND_BUFFER:
+                player.connected = False
+                player.socket.abort()
+                continue
+            player.socket.send_frame(frame)
+            self.bytes_sent += len(frame)
+
+class RaceServer:
+    def __init__(self, room_size=ROOM_SIZE, difficulty=RACE_DIFFICULTY, race_seconds=RACE_SECONDS, seed=None):
+        self.room_size = room_size
+        self.difficulty = difficulty
+        self.race_ticks = int(race_seconds / TIMESTEP)
+        self.seeds = random.Random(seed)
+        self.room_ids = itertools.count(1)
+        self.rooms = {}
+        # Private rooms by the name players asked for; their ids are prefixed
+        # so a name can never collide with a public "room-N" id
+        self.private_rooms = {}
+        self.open_room = None
+        self.finished_rooms = []
+
+    def room_for(self, name=None):
+        """Get the named private room, or the public room still filling up"""
+        if name:
+            room = self.private_rooms.get(name)
+            if room is None:
+                room = self.private_rooms[name] = self._new_room(f"private:{name}")
+                self.rooms[room.id] = room
+            return room if room.is_open() else None
+        if self.open_room is None or not self.open_room.is_open():
+            self.open_room = self._new_room(f"room-{next(self.room_ids)}")
+            self.rooms[self.open_room.id] = self.open_room
+        return self.open_room
+
+    def check_room_name(self, name):
+        """Check the room a join message asks for; returns an error or None"""
+        if name is None:
+            return None
+        if not isinstance(name, str):
+            return "room must be a string"
+        if len(name) > MAX_ROOM_NAME:
+            return f"room names are at most {MAX_ROOM_NAME} characters"
+        if name and name not in self.private_rooms and len(self.private_rooms) >= MAX_PRIVATE_ROOMS:
+            return "too many private rooms; try again later"
+        return None
+
+    def _remove_room(self, room):
+        self.rooms.pop(room.id, None)
+        name = room.id.removeprefix("private:")
+        if self.private_rooms.get(name) is room:
+            del self.private_rooms[name]
+
+    def _new_room(self, room_id):
+        return RaceRoom(room_id, self.seeds.randrange(2 ** 32), self.room_size, self.difficulty, self.race_ticks)
+
+    async def handle(self, reader, writer):
+        try:
+            socket = await accept(reader, writer)
+        except WebSocketError:
+            return
+        try:
+            message = json.loads(await socket.recv() or "null")
+            if not isinstance(message, dict) or message.get("type") != "join":
+                socket.send(json.dumps({"type": "error", "message": "expected a join message"}))
+                return
+            error = self.check_room_name(message.get("room"))
+            if error is not None:
+                socket.send(json.dumps({"type": "error", "message": error}))
+                return
+            room = self.room_for(message.get("room"))
+            if room is None:
+                socket.send(json.dumps({"type": "error", "message": "room is already racing"}))
+                return
+            player = room.join(str(message.get("name", "PLAYER"))[:16], socket)
+            socket.send(json.dumps({"type": "joined", "room": room.id, "player": player.id, "seed": room.seed,
+                                    "difficulty": room.difficulty, "players": room.size}))
+            if len(room.players) == room.size:
+                room.start().add_done_callback(lambda task: self._finish_room(room))
+            try:
+                await self._read_keys(room, player)
+            finally:
+                room.leave(player)
+                # A private room everyone left before it filled would otherwise linger forever
+                if not room.started and not room.players and room is not self.open_room:
+                    self._remove_room(room)
+        except (WebSocketError, ValueError, ConnectionError):
+            pass
+        finally:
+            await socket.close()
+
+    async def _read_keys(self, room, player):
+        while True:
+            text = await player.socket.recv()
+            if text is None:
+                return
+            message = json.loads(text)
+            if isinstance(message, dict) and message.get("type") == "keys":
+                error = room.queue_keys(player, message.get("keys"))
+            else:
+                error = "unknown message"
+            if error is not None:
+                player.socket.send(json.dumps({"type": "error", "message": error}))
+
+    def _finish_room(self, room):
+        self._remove_room(room)
+        self.finished_rooms.append(room.metrics())
+
+    def get_stats(self):
+        racing = [room for room in self.rooms.values() if room.started]
+        return {
+            "rooms": len(racing),
+            "players": sum(len(room.players) for room in racing),
+            "finished_rooms": len(self.finished_rooms),
+            "tick_ms_p95_worst": max((room.tick_times.percentiles(95)[0] * 1000 for room in racing), default=0.0)
+        }
+
+    async def serve(self, host="", port=RACE_PORT):
+        return await asyncio.start_server(self.handle, host, port, limit=64 * 1024, backlog=LISTEN_BACKLOG)
+
+async def run_bot(host, port, name, wpm=60, error_rate=0.03, room=None):
+    """Race as a scripted client and return the final standings message.
+
+    The bot mirrors the room locally with the same seed to see the falling
+    words, and sends the keys its SimulatedTypist presses as the server's
+    tick advances. Keys land a few ticks later on the server, so the mirror
+    can drift slightly; that only makes the bot a little less accurate.
+    """
+    socket = await connect(host, port)
+    socket.send(json.dumps({"type": "join", "name": name, "room": room}))
+    joined = json.loads(await socket.recv())
+    if joined["type"] != "joined":
+        await socket.close()
+        raise WebSocketError(joined.get("message", "join refused"))
+
+    mirror = GameSimulation(seed=joined["seed"])
+    typist = SimulatedTypist(wpm, error_rate, rng=random.Random(f"{joined['seed']}:{name}"))
+    try:
+        while True:
+            text = await socket.recv()
+            if text is None:
+                return None
+            message = json.loads(text)
+            if message["type"] == "start":
+                mirror.start(joined["difficulty"])
+            elif message["type"] == "state":
+                keys = []
+                while mirror.ticks < message["tick"] and mirror.is_playing():
+                    for key in typist.keys_for_tick(mirror):
+                        mirror.press_key(key)
+                        keys.append(key)
+                    mirror.step()
+                if keys:
+                    socket.send(json.dumps({"type": "keys", "keys": "".join(keys)}))
+            elif message["type"] == "end":
+                return message
+    finally:
+        await socket.close()
+
+async def run_bot_races(rooms, players, race_seconds, seed=None, address=None):
+    """Fill rooms with bots and return each finished room's metrics.
+
+    Without an address the server runs in this process; bots mirror every
+    room they play in, so a separate server process gives truer latencies.
+    """
+    server = None
+    if address is None:
+        server = await RaceServer(players, race_seconds=race_seconds, seed=seed).serve("127.0.0.1", 0)
+        address = server.sockets[0].getsockname()[:2]
+    host, port = address
+    rng = random.Random(seed)
+    bots = [run_bot(host, port, f"BOT{index}", wpm=rng.randint(30, 90), error_rate=rng.uniform(0.0, 0.08))
+            for index in range(rooms * players)]
+    started = time.perf_counter()
+    results = await asyncio.gather(*bots, return_exceptions=True)
+    elapsed = time.perf_counter() - started
+    if server is not None:
+        server.close()
+        await server.wait_closed()
+    failures = [result for result in results if not isinstance(result, dict)]
+    metrics = {result["metrics"]["room"]: result["metrics"] for result in results if isinstance(result, dict)}
+    return list(metrics.values()), failures, elapsed
+
+def _print_summary(metrics, failures, elapsed):
+    if not metrics:
+        print("No rooms finished")
+        return
+    ticks = sum(room["ticks"] for room in metrics)
+    print(f"{len(metrics)} rooms, {ticks} room ticks in {elapsed:.1f}s, {len(failures)} bot failures")
+    for key in ("tick_ms_p50", "tick_ms_p95", "tick_ms_p99", "late_ms_p95"):
+        values = sorted(room[key] for room in metrics)
+        print(f"  {key:<12} median {values[len(values) // 2]:>8.3f}   worst {values[-1]:>8.3f}")
+    print(f"  skipped ticks {sum(room['skipped_ticks'] for room in metrics)}, "
+          f"{sum(room['bytes_sent'] for room in metrics) / ticks:.0f} bytes sent per room tick")
+
+async def _serve_forever(args):
+    race_server = RaceServer(args.players, args.difficulty, args.race_seconds, args.seed)
+    server = await race_server.serve(args.host, args.port)
+    print(f"Race server listening on ws://{args.host or 'localhost'}:{args.port}")
+    async with server:
+        while True:
+            await asyncio.sleep(10)
+            print(json.dumps(race_server.get_stats()))
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Multiplayer RETRO TYPER race server")
+    parser.add_argument("--host", default="")
+    parser.add_argument("--port", type=int, default=RACE_PORT)
+    parser.add_argument("--players", type=int, default=ROOM_SIZE, help="players per room")
+    parser.add_argument("--difficulty", default=RACE_DIFFICULTY, choices=["easy", "medium", "hard"])
+    parser.add_argument("--race-seconds", type=float, default=RACE_SECONDS)
+    parser.add_argument("--seed", type=int, help="seed for room word streams")
+    parser.add_argument("--bots", type=int, metavar="ROOMS", help="race bot clients in this many rooms and exit")
+    parser.add_argument("--connect", metavar="HOST:PORT", help="send --bots to a running server instead of a local one")
+    args = parser.parse_args()
+
+    try:
+        if args.bots:
+            address = None
+            if args.connect:
+                host, _, port = args.connect.rpartition(":")
+                address = (host or "localhost", int(port))
+            _print_summary(*asyncio.run(run_bot_races(args.bots, args.players, args.race_seconds, args.seed, address)))
+        else:
+            asyncio.run(_serve_forever(args))
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,185 @@
+"""
+Compact keystroke logs for recording and replaying sessions.
+
+A log is a header (magic, version, seed, word list hash, setting flags)
+followed by one record per key:
+the tick delta since the previous record as a varint, then the key's UTF-8
+length plus one as a varint and the key bytes. A zero length marks the tick
+the session ended on. Since the simulation only changes through seeded
+RNGs and keys applied at known ticks, replaying a log reproduces the session
+exactly, provided it runs with the same word list and the same
+ADAPTIVE_WORDS and AUTO_SUBMIT settings; logs recorded otherwise are refused:
+
+    python replay.py session.rtr
+"""
+import hashlib
+import struct
+import time
+from collections import namedtuple
+from simulation import GameSimulation
+from words import WORD_LIST
+from config import ADAPTIVE_WORDS, AUTO_SUBMIT
+
+MAGIC = b"RTYP"
+VERSION = 2
+HEADER = struct.Struct("<4sBQQB")
+# Seeds must fit the header's unsigned 64-bit field
+MAX_SEED = 2 ** 64 - 1
+# Header flag bits for settings that change how a session plays out
+FLAG_ADAPTIVE_WORDS = 0x01
+FLAG_AUTO_SUBMIT = 0x02
+
+InputLog = namedtuple("InputLog", ["seed", "events", "end_tick"])
+
+_default_word_hash = None
+
+def word_list_hash(word_list=None):
+    """Get a 64-bit hash of a word list, the built-in one by default"""
+    global _default_word_hash
+    if word_list is None:
+        if _default_word_hash is None:
+            _default_word_hash = word_list_hash(WORD_LIST)
+        return _default_word_hash
+    digest = hashlib.sha256()
+    for word in word_list:
+        digest.update(word.encode("utf-8") + b"\n")
+    return int.from_bytes(digest.digest()[:8], "little")
+
+def setting_flags():
+    return (FLAG_ADAPTIVE_WORDS if ADAPTIVE_WORDS else 0) | (FLAG_AUTO_SUBMIT if AUTO_SUBMIT else 0)
+
+def _write_varint(buffer, value):
+    while value >= 0x80:
+        buffer.append((value & 0x7F) | 0x80)
+        value >>= 7
+    buffer.append(value)
+
+def _read_varint(data, offset):
+    value = 0
+    shift = 0
+    while True:
+        byte = data[offset]
+        offset += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, offset
+        shift += 7
+
+class InputRecorder:
+    def __init__(self, path, seed, word_list=None, flush_every=256):
+        self.file = open(path, "wb")
+        self.file.write(HEADER.pack(MAGIC, VERSION, seed, word_list_hash(word_list), setting_flags()))
+        self.buffer = bytearray()
+        self.last_tick = 0
+        self.pending = 0
+        self.flush_every = flush_every
+
+    def record(self, tick, key):
+        """Append one keypress applied before simulation tick"""
+        data = key.encode("utf-8")
+        _write_varint(self.buffer, tick - self.last_tick)
+        _write_varint(self.buffer, len(data) + 1)
+        self.buffer += data
+        self.last_tick = tick
+        self.pending += 1
+        if self.pending >= self.flush_every:
+            self.flush()
+
+    def flush(self):
+        self.file.write(self.buffer)
+        self.buffer.clear()
+        self.pending = 0
+
+    def close(self, end_tick):
+        """Write the end marker and close the log"""
+        if self.file.closed:
+            return
+        _write_varint(self.buffer, max(0, end_tick - self.last_tick))
+        _write_varint(self.buffer, 0)
+        self.flush()
+        self.file.close()
+
+def parse_log(data, word_list=None):
+    """Decode a keystroke log from bytes, refusing one recorded with other words or settings"""
+    if data[:len(MAGIC)] != MAGIC:
+        raise ValueError("not a RETRO TYPER input log")
+    if data[len(MAGIC):len(MAGIC) + 1] != bytes([VERSION]):
+        raise ValueError("input log from an incompatible version")
+    magic, version, seed, word_hash, flags = HEADER.unpack_from(data, 0)
+    if word_hash != word_list_hash(word_list):
+        raise ValueError("input log was recorded with a different word list")
+    if flags != setting_flags():
+        raise ValueError("input log was recorded with different ADAPTIVE_WORDS/AUTO_SUBMIT settings")
+    events = []
+    offset = HEADER.size
+    tick = 0
+    end_tick = None
+    # A log cut short by a crash simply ends at its last complete record
+    try:
+        while offset < len(data):
+            delta, offset = _read_varint(data, offset)
+            length, offset = _read_varint(data, offset)
+            tick += delta
+            if length == 0:
+                end_tick = tick
+                break
+            key = data[offset:offset + length - 1].decode("utf-8")
+            offset += length - 1
+            events.append((tick, key))
+    except IndexError:
+        pass
+    if end_tick is None:
+        end_tick = tick
+    return InputLog(seed, events, end_tick)
+
+def read_log(path, word_list=None):
+    """Read a keystroke log from disk"""
+    with open(path, "rb") as log_file:
+        return parse_log(log_file.read(), word_list)
+
+class Replayer:
+    def __init__(self, log):
+        self.log = log
+        self.index = 0
+
+    def apply(self, simulation):
+        """Press every logged key due before the simulation's next step, returning their events"""
+        events = []
+        logged = self.log.events
+        while self.index < len(logged) and logged[self.index][0] <= simulation.ticks:
+            events += simulation.press_key(logged[self.index][1])
+            self.index += 1
+        return events
+
+    def finished(self, simulation):
+        return simulation.ticks >= self.log.end_tick
+
+def replay_headless(log, simulation=None):
+    """Replay a whole log as fast as possible and return the simulation"""
+    if simulation is None:
+        simulation = GameSimulation()
+    simulation.seed(log.seed)
+    replayer = Replayer(log)
+    while not replayer.finished(simulation):
+        replayer.apply(simulation)
+        simulation.step()
+    replayer.apply(simulation)
+    return simulation
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Replay a RETRO TYPER input log headlessly")
+    parser.add_argument("log")
+    parser.add_argument("--repeat", type=int, default=1, help="replay several times to benchmark")
+    args = parser.parse_args()
+
+    log = read_log(args.log)
+    start = time.perf_counter()
+    for _ in range(args.repeat):
+        simulation = replay_headless(log)
+    elapsed = time.perf_counter() - start
+    board = simulation.scoreboard
+    print(f"seed {log.seed}: {len(log.events)} keys over {log.end_tick} ticks")
+    print(f"score {board.score}, level {board.level}, lives {board.lives}, wpm {board.calculate_wpm()}")
+    print(f"{args.repeat * log.end_tick / max(elapsed, 1e-9):,.0f} ticks/s")
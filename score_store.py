@@ -0,0 +1,182 @@
+"""
+Persistent session results and per-word timings in SQLite.
+
+Saving only queues the result; a background thread writes queued sessions
+in batches, one transaction each, so the game loop never waits on disk.
+The database runs in WAL mode so leaderboard queries can read while the
+writer commits, and both query shapes are covered by an index:
+
+    python score_store.py top --difficulty hard
+    python score_store.py trend --player alice
+"""
+import logging
+import queue
+import sqlite3
+import threading
+import time
+from config import SCORE_DB_PATH
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    id INTEGER PRIMARY KEY,
+    player TEXT NOT NULL,
+    difficulty TEXT NOT NULL,
+    score INTEGER NOT NULL,
+    wpm INTEGER NOT NULL,
+    accuracy INTEGER NOT NULL,
+    level INTEGER NOT NULL,
+    duration REAL NOT NULL,
+    seed INTEGER,
+    finished_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS sessions_leaderboard ON sessions (difficulty, score DESC, wpm DESC);
+CREATE INDEX IF NOT EXISTS sessions_player ON sessions (player, finished_at);
+CREATE TABLE IF NOT EXISTS word_timings (
+    session_id INTEGER NOT NULL REFERENCES sessions (id),
+    word TEXT NOT NULL,
+    ms REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS word_timings_session ON word_timings (session_id);
+"""
+
+SESSION_COLUMNS = ("player", "difficulty", "score", "wpm", "accuracy", "level", "duration", "seed", "finished_at")
+
+def _connect(path):
+    connection = sqlite3.connect(path, check_same_thread=False)
+    connection.execute("PRAGMA journal_mode=WAL")
+    connection.execute("PRAGMA synchronous=NORMAL")
+    return connection
+
+class ScoreStore:
+    def __init__(self, path=SCORE_DB_PATH, batch_size=64, flush_interval=1.0):
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.reader = _connect(path)
+        self.reader.executescript(SCHEMA)
+        self.read_lock = threading.Lock()
+        self.pending = queue.Queue()
+        self.written = 0
+        self.failed = 0
+        self.writer = threading.Thread(target=self._write_loop, name="score-writer", daemon=True)
+        self.writer.start()
+
+    def save_session(self, player, difficulty, score, wpm, accuracy, level, duration,
+                     seed=None, word_timings=(), finished_at=None):
+        """Queue a finished session and its (word, ms) timings for writing"""
+        session = (player, difficulty, score, wpm, accuracy, level, duration, seed,
+                   time.time() if finished_at is None else finished_at)
+        self.pending.put((session, list(word_timings)))
+
+    def save_scoreboard(self, board, player, seed=None):
+        """Queue the results of the game a Scoreboard just finished"""
+        self.save_session(
+            player, board.difficulty_manager.current_difficulty, board.score, board.calculate_wpm(),
+            board.calculate_accuracy(), board.level, board.elapsed_time, seed, board.word_timings
+        )
+
+    def _write_loop(self):
+        connection = _connect(self.path)
+        running = True
+        while running:
+            batch = []
+            try:
+                batch.append(self.pending.get(timeout=self.flush_interval))
+                while len(batch) < self.batch_size:
+                    batch.append(self.pending.get_nowait())
+            except queue.Empty:
+                pass
+            if batch and batch[-1] is None:
+                running = False
+                batch.pop()
+            try:
+                if batch:
+                    self._write_batch(connection, batch)
+            except sqlite3.Error:
+                # Drop this batch but keep the writer alive for later sessions
+                self.failed += len(batch)
+                logger.exception("Failed to save %d session(s) to %s", len(batch), self.path)
+            finally:
+                for _ in range(len(batch) + (not running)):
+                    self.pending.task_done()
+        connection.close()
+
+    def _write_batch(self, connection, batch):
+        with connection:
+            for session, word_timings in batch:
+                cursor = connection.execute(
+                    f"INSERT INTO sessions ({', '.join(SESSION_COLUMNS)}) VALUES ({', '.join('?' * len(SESSION_COLUMNS))})",
+                    session
+                )
+                if word_timings:
+                    connection.executemany(
+                        "INSERT INTO word_timings (session_id, word, ms) VALUES (?, ?, ?)",
+                        [(cursor.lastrowid, word, ms) for word, ms in word_timings]
+                    )
+        self.written += len(batch)
+
+    def flush(self):
+        """Block until every queued session is written"""
+        self.pending.join()
+
+    def _query(self, sql, parameters):
+        with self.read_lock:
+            cursor = self.reader.execute(sql, parameters)
+            columns = [column[0] for column in cursor.description]
+            return [dict(zip(columns, row)) for row in cursor.fetchall()]
+
+    def top_scores(self, difficulty, limit=10):
+        """Get the best sessions for a difficulty, highest score (then WPM) first"""
+        return self._query(
+            "SELECT player, score, wpm, accuracy, level, finished_at FROM sessions "
+            "WHERE difficulty = ? ORDER BY score DESC, wpm DESC LIMIT ?",
+            (difficulty, limit)
+        )
+
+    def player_trend(self, player, limit=50):
+        """Get a player's most recent sessions, oldest first"""
+        rows = self._query(
+            "SELECT difficulty, score, wpm, accuracy, level, finished_at FROM sessions "
+            "WHERE player = ? ORDER BY finished_at DESC LIMIT ?",
+            (player, limit)
+        )
+        rows.reverse()
+        return rows
+
+    def word_timings(self, session_id):
+        return self._query("SELECT word, ms FROM word_timings WHERE session_id = ?", (session_id,))
+
+    def close(self):
+        """Write everything still queued and stop the writer"""
+        if self.writer.is_alive():
+            self.pending.put(None)
+            self.writer.join()
+        self.reader.close()
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Query the RETRO TYPER score database")
+    parser.add_argument("--db", default=SCORE_DB_PATH)
+    commands = parser.add_subparsers(dest="command", required=True)
+    top = commands.add_parser("top", help="leaderboard for one difficulty")
+    top.add_argument("--difficulty", default="medium")
+    top.add_argument("--limit", type=int, default=10)
+    trend = commands.add_parser("trend", help="a player's recent sessions")
+    trend.add_argument("--player", required=True)
+    trend.add_argument("--limit", type=int, default=20)
+    args = parser.parse_args()
+
+    store = ScoreStore(args.db)
+    start = time.perf_counter()
+    if args.command == "top":
+        rows = store.top_scores(args.difficulty, args.limit)
+    else:
+        rows = store.player_trend(args.player, args.limit)
+    elapsed = time.perf_counter() - start
+    for row in rows:
+        print("  ".join(f"{key}={value}" for key, value in row.items() if key != "finished_at"))
+    print(f"{len(rows)} rows in {elapsed * 1000:.2f} ms")
+    store.close()
@@ -0,0 +1,221 @@
+"""
+Server-side score verification by replaying keystroke logs.
+
+A submission is a keystroke log in replay.py's format (seed plus every key
+and the tick it was pressed on) together with the score, WPM and level the
+client claims. Since the simulation is deterministic, replaying the log
+headlessly gives the true result. Replays run on a process pool in
+batches, and outcomes are cached by a hash of the log, so resubmitting a
+log costs only a lookup whatever it claims:
+
+    verifier = ScoreVerifier()
+    results = verifier.verify_many([(log_bytes, Claim(score=42, wpm=55, level=5))])
+
+    python score_verifier.py session.rtr --score 42 --wpm 55 --level 5
+    python score_verifier.py --bench 2000 --seconds 30    # synthetic throughput test
+"""
+import hashlib
+import os
+import random
+import struct
+import tempfile
+import time
+from collections import OrderedDict, namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from replay import InputRecorder, parse_log, replay_headless
+from config import TIMESTEP
+
+# Outcomes kept by log hash
+VERIFY_CACHE_SIZE = 4096
+# Longest log replayed (30 minutes of play); longer ones are rejected unplayed
+MAX_REPLAY_TICKS = int(30 * 60 / TIMESTEP)
+# Most keys accepted in any one second of play; well past the fastest typists
+MAX_KEYS_PER_SECOND = 30
+# Measured WPM may differ by this much from the claim
+WPM_TOLERANCE = 1
+# Logs handed to a worker at a time, to spread the cost of pickling
+CHUNK_SIZE = 8
+
+Claim = namedtuple("Claim", ["score", "wpm", "level"])
+ReplayOutcome = namedtuple("ReplayOutcome", ["score", "wpm", "level", "ticks", "error"])
+Verification = namedtuple("Verification", ["log_hash", "valid", "claim", "outcome", "cached", "reasons"])
+
+def log_hash(data):
+    return hashlib.sha256(data).hexdigest()
+
+def replay_log(data):
+    """Replay one log and return its ReplayOutcome; runs on pool workers"""
+    try:
+        log = parse_log(data)
+    except (ValueError, struct.error) as error:
+        return ReplayOutcome(0, 0, 0, 0, f"unreadable log: {error}")
+    if log.end_tick > MAX_REPLAY_TICKS:
+        return ReplayOutcome(0, 0, 0, log.end_tick, f"log runs {log.end_tick} ticks, over {MAX_REPLAY_TICKS}")
+    error = check_keys(log)
+    if error is not None:
+        return ReplayOutcome(0, 0, 0, log.end_tick, error)
+    board = replay_headless(log).scoreboard
+    return ReplayOutcome(board.score, board.calculate_wpm(), board.level, log.end_tick, None)
+
+def check_keys(log):
+    """Reject logs no real keyboard could have produced; returns an error or None"""
+    window = int(1 / TIMESTEP)
+    first = 0
+    for index, (tick, key) in enumerate(log.events):
+        # The game records one character per keypress, or "" for other keys
+        if len(key) > 1:
+            return f"multi-character key at tick {tick}"
+        while log.events[first][0] <= tick - window:
+            first += 1
+        if index - first >= MAX_KEYS_PER_SECOND:
+            return f"over {MAX_KEYS_PER_SECOND} keys in one second at tick {tick}"
+    return None
+
+def check_claim(claim, outcome):
+    """List the ways a claim disagrees with the replayed outcome"""
+    if outcome.error is not None:
+        return [outcome.error]
+    reasons = []
+    if claim.score != outcome.score:
+        reasons.append(f"score {claim.score} claimed, {outcome.score} replayed")
+    if claim.level != outcome.level:
+        reasons.append(f"level {claim.level} claimed, {outcome.level} replayed")
+    if abs(claim.wpm - outcome.wpm) > WPM_TOLERANCE:
+        reasons.append(f"wpm {claim.wpm} claimed, {outcome.wpm} replayed")
+    return reasons
+
+class ScoreVerifier:
+    def __init__(self, workers=None, cache_size=VERIFY_CACHE_SIZE, chunk_size=CHUNK_SIZE):
+        self.workers = workers or os.cpu_count() or 1
+        self.pool = ProcessPoolExecutor(max_workers=self.workers)
+        self.chunk_size = chunk_size
+        self.cache_size = cache_size
+        self.outcomes = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.replay_seconds = 0.0
+
+    def verify(self, data, claim):
+        return self.verify_many([(data, claim)])[0]
+
+    def verify_many(self, submissions):
+        """Verify (log bytes, Claim) pairs, replaying each distinct uncached log once"""
+        hashes = [log_hash(data) for data, _ in submissions]
+        to_replay = {}
+        for digest, (data, _) in zip(hashes, submissions):
+            if digest not in self.outcomes and digest not in to_replay:
+                to_replay[digest] = data
+
+        replayed = {}
+        if to_replay:
+            started = time.perf_counter()
+            outcomes = self.pool.map(replay_log, to_replay.values(), chunksize=self.chunk_size)
+            replayed = dict(zip(to_replay, outcomes))
+            self.replay_seconds += time.perf_counter() - started
+
+        results = []
+        for digest, (_, claim) in zip(hashes, submissions):
+            outcome = replayed.get(digest)
+            cached = outcome is None
+            if cached:
+                outcome = self.outcomes[digest]
+                self.outcomes.move_to_end(digest)
+                self.hits += 1
+            else:
+                self.misses += 1
+            reasons = check_claim(claim, outcome)
+            results.append(Verification(digest, not reasons, claim, outcome, cached, reasons))
+
+        for digest, outcome in replayed.items():
+            self.outcomes[digest] = outcome
+            if len(self.outcomes) > self.cache_size:
+                self.outcomes.popitem(last=False)
+        return results
+
+    def get_stats(self):
+        total = self.hits + self.misses
+        return {
+            "workers": self.workers,
+            "replayed": self.misses,
+            "cache_hits": self.hits,
+            "hit_rate": self.hits / total if total else 0.0,
+            "cache_size": len(self.outcomes),
+            "replays_per_second": self.misses / self.replay_seconds if self.replay_seconds else 0.0
+        }
+
+    def close(self):
+        self.pool.shutdown()
+
+def record_bot_game(seed, seconds, wpm=60, error_rate=0.03, difficulty_key="2"):
+    """Play a seeded game with a simulated typist and return its log bytes and true Claim"""
+    from simulation import GameSimulation
+    from typist import SimulatedTypist
+
+    simulation = GameSimulation(seed=seed)
+    typist = SimulatedTypist(wpm, error_rate, rng=random.Random(f"{seed}:typist"))
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "game.rtr")
+        simulation.recorder = InputRecorder(path, seed)
+        simulation.press_key(difficulty_key)
+        max_ticks = int(seconds / TIMESTEP)
+        while simulation.ticks < max_ticks and not simulation.scoreboard.game_over:
+            for key in typist.keys_for_tick(simulation):
+                simulation.press_key(key)
+            simulation.step()
+        simulation.recorder.close(simulation.ticks)
+        with open(path, "rb") as log_file:
+            data = log_file.read()
+    board = simulation.scoreboard
+    return data, Claim(board.score, board.calculate_wpm(), board.level)
+
+def _bench(count, seconds, workers, seed):
+    # Distinct logs, then a second pass of the same logs to show the cache
+    submissions = []
+    for index in range(count):
+        data, claim = record_bot_game(seed + index, seconds, wpm=30 + index % 60)
+        # Every tenth submission claims one more point than it earned
+        if index % 10 == 9:
+            claim = claim._replace(score=claim.score + 1)
+        submissions.append((data, claim))
+
+    verifier = ScoreVerifier(workers)
+    started = time.perf_counter()
+    results = verifier.verify_many(submissions)
+    elapsed = time.perf_counter() - started
+    rejected = sum(not result.valid for result in results)
+    print(f"{count} logs of up to {seconds:g}s on {verifier.workers} workers: {elapsed:.2f}s, "
+          f"{count / elapsed:,.0f} replays/s ({count / elapsed / verifier.workers:,.0f} per worker), "
+          f"{rejected} rejected")
+    started = time.perf_counter()
+    verifier.verify_many(submissions)
+    print(f"resubmitted from cache in {(time.perf_counter() - started) * 1000:.1f} ms")
+    verifier.close()
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Verify claimed RETRO TYPER scores by replaying keystroke logs")
+    parser.add_argument("log", nargs="?", help="keystroke log recorded with main.py --record")
+    parser.add_argument("--score", type=int)
+    parser.add_argument("--wpm", type=int)
+    parser.add_argument("--level", type=int)
+    parser.add_argument("--workers", type=int, help="replay processes (default: one per CPU)")
+    parser.add_argument("--bench", type=int, metavar="LOGS", help="verify this many synthetic logs and report throughput")
+    parser.add_argument("--seconds", type=float, default=30, help="length of each synthetic game")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    if args.bench:
+        _bench(args.bench, args.seconds, args.workers, args.seed)
+    elif args.log:
+        with open(args.log, "rb") as log_file:
+            data = log_file.read()
+        outcome = replay_log(data)
+        claim = Claim(*(outcome[index] if value is None else value
+                        for index, value in enumerate((args.score, args.wpm, args.level))))
+        reasons = check_claim(claim, outcome)
+        print(f"replayed: score {outcome.score}, wpm {outcome.wpm}, level {outcome.level} over {outcome.ticks} ticks")
+        print("VALID" if not reasons else "INVALID: " + "; ".join(reasons))
+        raise SystemExit(0 if not reasons else 1)
+    else:
+        parser.error("give a log to verify or --bench")
@@ -0,0 +1,583 @@
+"""
+Headless game simulation shared by the desktop game and offline tools.
+
+Nothing in this module imports pygame: the pygame managers subclass these
+classes and only add fonts and drawing on top.
+"""
+import random
+import time
+from collections import namedtuple
+from words import WORD_LIST
+from difficulty import DifficultyManager
+from word_index import PrefixIndex
+from word_sampler import WordSampler
+from typing_stats import TypingStats
+from spatial_grid import SpatialGrid
+from profiler import NULL_PROFILER
+from config import (
+    WINDOW_WIDTH,
+    WINDOW_HEIGHT,
+    TIMESTEP,
+    TICK_SCALE,
+    SPEED_INCREASE_FACTOR,
+    WORDS_FOR_LEVEL_UP,
+    MAX_INPUT_LENGTH,
+    AUTO_SUBMIT,
+    ADAPTIVE_WORDS,
+    SPAWN_MIN_X,
+    SPAWN_MAX_X,
+    SPAWN_COLUMN_WIDTH,
+    SPAWN_MIN_DISTANCE,
+    SPAWN_BAND_HEIGHT,
+    RETRO_GREEN,
+    RETRO_YELLOW,
+    RETRO_RED
+)
+
+# Keys that pick a difficulty on the selection screen
+DIFFICULTY_KEYS = {"1": "easy", "2": "medium", "3": "hard"}
+
+# Special keys in the input stream
+KEY_ENTER = "\r"
+KEY_BACKSPACE = "\b"
+
+# Something that happened during a step, for the front end to react to
+GameEvent = namedtuple("GameEvent", ["kind", "value", "x", "y"], defaults=(None, 0, 0))
+
+class Word:
+    def __init__(self, text, speed, x):
+        self.text = text
+        self.key = text.lower()
+        self.x = x
+        self.y = -20
+        self.prev_y = self.y
+        self.speed = speed
+        self.is_active = True
+        self.column = None
+        self.spawn_time = 0.0
+
+        # Retro color coding based on difficulty
+        if len(text) <= 4:
+            self.color = RETRO_GREEN
+            self.difficulty = "easy"
+        elif len(text) <= 7:
+            self.color = RETRO_YELLOW
+            self.difficulty = "medium"
+        else:
+            self.color = RETRO_RED
+            self.difficulty = "hard"
+
+    def update(self, dt=1.0):
+        self.prev_y = self.y
+        self.y += self.speed * dt
+        return self.y < WINDOW_HEIGHT + 20
+
+class WordField:
+    word_class = Word
+
+    def __init__(self, difficulty_manager, rng=None, word_list=None):
+        self.words = []
+        self.index = PrefixIndex()
+        self.prefix = ""
+        self.target = None
+        self.rng = rng or random.Random()
+        self.difficulty_manager = difficulty_manager
+        self.current_speed = self.difficulty_manager.get_word_speed()
+        # Any sequence of words, such as a memory-mapped WordStore
+        self.word_list = WORD_LIST if word_list is None else word_list
+        self.filtered_words = self.difficulty_manager.filter_words_by_difficulty(self.word_list)
+        self.sampler = WordSampler(self.filtered_words) if ADAPTIVE_WORDS else None
+
+        # Columns far enough apart that words spawned in them never crowd each other
+        jitter = SPAWN_COLUMN_WIDTH - SPAWN_MIN_DISTANCE
+        self.column_count = (SPAWN_MAX_X - SPAWN_MIN_X - jitter) // SPAWN_COLUMN_WIDTH + 1
+        self._reset_columns()
+
+    def _reset_columns(self):
+        self.free_columns = list(range(self.column_count))
+        self.column_slots = {column: slot for slot, column in enumerate(self.free_columns)}
+
+    def _take_column(self, column):
+        """Mark a column as taken, swap-removing it from the free list"""
+        slot = self.column_slots.pop(column)
+        last = self.free_columns.pop()
+        if last != column:
+            self.free_columns[slot] = last
+            self.column_slots[last] = slot
+
+    def _release_column(self, word):
+        self.column_slots[word.column] = len(self.free_columns)
+        self.free_columns.append(word.column)
+        word.column = None
+
+    def spawn_word(self):
+        """Spawn a new word in a free column and return it"""
+        if self.sampler is not None:
+            word_text = self.sampler.sample(self.rng)
+        else:
+            word_text = self.rng.choice(self.filtered_words)
+
+        # Ensure words don't spawn too close to each other
+        if self.free_columns:
+            column = self.rng.choice(self.free_columns)
+            x = SPAWN_MIN_X + column * SPAWN_COLUMN_WIDTH + self.rng.randint(0, SPAWN_COLUMN_WIDTH - SPAWN_MIN_DISTANCE)
+            new_word = self.word_class(word_text, self.current_speed, x)
+            new_word.column = column
+            self._take_column(column)
+        else:
+            new_word = self.word_class(word_text, self.current_speed, self.rng.randint(SPAWN_MIN_X, SPAWN_MAX_X))
+
+        self.words.append(new_word)
+        self.index.add(new_word.key, new_word)
+        if self.prefix and self.target is None:
+            self.set_prefix(self.prefix)
+        return new_word
+
+    def deactivate(self, word):
+        """Take a word out of play and out of the prefix index"""
+        word.is_active = False
+        self.index.remove(word.key, word)
+        if word.column is not None:
+            self._release_column(word)
+        if word is self.target:
+            self.set_prefix(self.prefix)
+
+    def update_words(self, dt=1.0):
+        """Update word positions and remove inactive words"""
+        remaining = []
+        for word in self.words:
+            if word.update(dt) and word.is_active:
+                remaining.append(word)
+                if word.column is not None and word.y >= SPAWN_BAND_HEIGHT:
+                    self._release_column(word)
+            elif word.is_active:
+                self.deactivate(word)
+        self.words = remaining
+
+    def hold_words(self):
+        """Keep words still for a tick so interpolated drawing doesn't replay their last step"""
+        for word in self.words:
+            word.prev_y = word.y
+
+    def set_prefix(self, prefix):
+        """Narrow the candidates to words starting with prefix and target the lowest one"""
+        self.prefix = prefix.lower()
+        candidates = self.index.candidates(self.prefix) if self.prefix else ()
+        self.set_target(max(candidates, key=lambda word: word.y, default=None))
+
+    def set_target(self, word):
+        """Set the word the player is currently typing"""
+        self.target = word
+
+    def find_exact(self, typed_word):
+        """Get the active word matching typed_word exactly, or None"""
+        return self.index.find_exact(typed_word.lower())
+
+    def check_word(self, typed_word):
+        """Check if typed word matches any falling word"""
+        word = self.find_exact(typed_word)
+        if word is not None:
+            if self.sampler is not None:
+                self.sampler.record_hit(word.key)
+            self.deactivate(word)
+            return True, (word.x + len(word.text) * 6, word.y)
+        if self.sampler is not None and typed_word:
+            # Blame the first wrong letter of the word the player was closest to
+            position, closest = self.index.longest_prefix(typed_word.lower())
+            if closest is not None:
+                self.sampler.record_miss(closest.key, position)
+        return False, None
+
+    def increase_speed(self, factor):
+        """Increase word falling speed"""
+        self.current_speed *= factor
+        # Cap maximum speed for playability
+        self.current_speed = min(self.current_speed, 3.0)
+
+    def reset_speed(self):
+        """Reset speed to initial value"""
+        self.current_speed = self.difficulty_manager.get_word_speed()
+        self.filtered_words = self.difficulty_manager.filter_words_by_difficulty(self.word_list)
+        if self.sampler is not None and self.sampler.words != self.filtered_words:
+            self.sampler.set_words(self.filtered_words)
+
+    def get_missed_words(self):
+        """Get count of words that reached the bottom"""
+        missed = [word for word in self.words if word.y >= WINDOW_HEIGHT - 30 and word.is_active]
+        for word in missed:
+            self.deactivate(word)
+        return len(missed)
+
+    def clear_words(self):
+        """Clear all words from screen"""
+        self.words.clear()
+        self.index.clear()
+        self._reset_columns()
+        self.set_target(None)
+
+# Largest distance at which a typed word collects a powerup
+COLLECTION_RADIUS = 32
+
+class PowerUp:
+    def __init__(self, type_name, x):
+        self.type = type_name
+        self.x = x
+        self.y = -30
+        self.prev_y = self.y
+        self.speed = 0.8
+        self.is_active = True
+        self.size = 16
+
+    def update(self, dt=1.0):
+        self.prev_y = self.y
+        self.y += self.speed * dt
+        return self.y < WINDOW_HEIGHT + 30
+
+    def is_collected(self, word_x, word_y):
+        """Check if a typed word is close enough to collect this power-up"""
+        return (self.x - word_x) ** 2 + (self.y - word_y) ** 2 < (self.size * 2) ** 2
+
+class PowerUpField:
+    powerup_class = PowerUp
+
+    def __init__(self, rng=None):
+        self.powerups = []
+        self.grid = SpatialGrid()
+        self.rng = rng or random.Random()
+        self.spawn_chance = 0.01  # 1% chance per update
+        self.max_powerups = 2
+        self.active_effects = {
+            "freeze": 0,
+            "shield": 0
+        }
+
+    def update(self, dt=1.0):
+        # Update existing powerups
+        remaining = []
+        for powerup in self.powerups:
+            if powerup.update(dt) and powerup.is_active:
+                remaining.append(powerup)
+                self.grid.move("powerups", powerup, powerup.x, powerup.y)
+            else:
+                self.grid.remove(powerup)
+        self.powerups = remaining
+
+        # Update active effect timers
+        for effect in list(self.active_effects.keys()):
+            if self.active_effects[effect] > 0:
+                self.active_effects[effect] = max(0, self.active_effects[effect] - dt)
+
+    def try_spawn(self, dt=1.0):
+        """Try to spawn a new powerup based on chance"""
+        if self.rng.random() < self.spawn_chance * dt and len(self.powerups) < self.max_powerups:
+            powerup_type = self.rng.choice(["freeze", "clear", "life", "shield"])
+            powerup = self.powerup_class(powerup_type, self.rng.randint(50, WINDOW_WIDTH - 50))
+            self.powerups.append(powerup)
+            self.grid.insert("powerups", powerup, powerup.x, powerup.y)
+
+    def check_collection(self, word_x, word_y):
+        """Check if any powerup is collected by a correctly typed word"""
+        for powerup in self.grid.query("powerups", word_x, word_y, COLLECTION_RADIUS):
+            if powerup.is_active and powerup.is_collected(word_x, word_y):
+                powerup.is_active = False
+                self.grid.remove(powerup)
+                return powerup.type
+        return None
+
+    def activate_effect(self, effect_type, duration=300):
+        """Activate a powerup effect"""
+        if effect_type in self.active_effects:
+            self.active_effects[effect_type] = duration
+
+    def is_effect_active(self, effect_type):
+        """Check if an effect is currently active"""
+        return self.active_effects.get(effect_type, 0) > 0
+
+    def clear_powerups(self):
+        """Clear all powerups from screen"""
+        self.powerups.clear()
+        self.grid.clear("powerups")
+        self.active_effects = {key: 0 for key in self.active_effects}
+
+class Scoreboard:
+    def __init__(self, difficulty_manager):
+        self.difficulty_manager = difficulty_manager
+        self.stats = TypingStats()
+        self.reset()
+
+    def reset(self):
+        """Reset all game state variables to their initial values"""
+        self.score = 0
+        self.lives = self.difficulty_manager.get_lives()
+        self.level = 1
+        self.words_until_level_up = WORDS_FOR_LEVEL_UP
+        self.current_input = ""
+        self.game_over = False
+        self.game_started = False
+        self.elapsed_time = 0.0
+        self.total_chars_typed = 0
+        self.correct_words = 0
+        # (word, ms from spawn to typed) for every word typed this game
+        self.word_timings = []
+        self.stats.reset()
+
+    def update_score(self):
+        """Increment score and check for level up"""
+        self.score += 1
+        self.correct_words += 1
+        self.words_until_level_up -= 1
+
+        if self.words_until_level_up <= 0:
+            return self.level_up()
+        return 1.0
+
+    def level_up(self):
+        """Increase level and reset words counter"""
+        self.level += 1
+        self.words_until_level_up = WORDS_FOR_LEVEL_UP
+        return SPEED_INCREASE_FACTOR
+
+    def lose_life(self):
+        """Decrease lives and check for game over"""
+        self.lives -= 1
+        if self.lives <= 0:
+            self.game_over = True
+
+    def calculate_wpm(self):
+        """Calculate words per minute over simulated play time"""
+        elapsed_time = max(1, self.elapsed_time) / 60
+        return int(self.total_chars_typed / 5 / elapsed_time)
+
+    def calculate_accuracy(self):
+        """Get the percentage of keystrokes that kept the input on a falling word"""
+        return self.stats.accuracy
+
+class GameSimulation:
+    def __init__(self, difficulty_manager=None, word_field=None, powerup_field=None, scoreboard=None, seed=None):
+        self.difficulty_manager = difficulty_manager or DifficultyManager()
+        self.word_field = word_field or WordField(self.difficulty_manager)
+        self.powerup_field = powerup_field or PowerUpField()
+        self.scoreboard = scoreboard or Scoreboard(self.difficulty_manager)
+        self.selecting_difficulty = True
+        self.auto_submit = AUTO_SUBMIT
+        self.profiler = NULL_PROFILER
+        self.recorder = None
+        self.ticks = 0
+        self.time_ms = 0.0
+        self.last_spawn_time = 0.0
+        self.seed(seed)
+
+    def seed(self, seed=None):
+        """Reseed the word and powerup streams so a run can be reproduced"""
+        if seed is None:
+            seed = random.randrange(2 ** 32)
+        self.current_seed = seed
+        # Separate streams keep the word sequence independent of powerup spawns
+        self.word_field.rng = random.Random(f"{seed}:words")
+        self.powerup_field.rng = random.Random(f"{seed}:powerups")
+
+    def is_playing(self):
+        """Check if a game is in progress"""
+        board = self.scoreboard
+        return not self.selecting_difficulty and board.game_started and not board.game_over
+
+    def start(self, difficulty, overrides=None):
+        """Start a new game at the given difficulty"""
+        self.difficulty_manager.set_difficulty(difficulty, overrides)
+        self.selecting_difficulty = False
+        self.word_field.clear_words()
+        self.word_field.reset_speed()
+        self.powerup_field.clear_powerups()
+        self.scoreboard.reset()
+        self.scoreboard.game_started = True
+        self.last_spawn_time = self.time_ms
+
+    def reset(self):
+        """Return to the difficulty selection screen"""
+        self.selecting_difficulty = True
+        self.scoreboard.reset()
+        self.word_field.clear_words()
+        self.word_field.reset_speed()
+        self.powerup_field.clear_powerups()
+        self.last_spawn_time = self.time_ms
+
+    def press_key(self, key):
+        """Apply one keypress and return the resulting events.
+
+        key is the typed character, KEY_ENTER or KEY_BACKSPACE; any other
+        string (including "") counts as a non-printing key.
+        """
+        if self.recorder is not None:
+            self.recorder.record(self.ticks, key)
+        board = self.scoreboard
+        if self.selecting_difficulty:
+            difficulty = DIFFICULTY_KEYS.get(key)
+            if difficulty is None:
+                return []
+            self.start(difficulty)
+            return [GameEvent("difficulty", difficulty)]
+
+        if not board.game_started:
+            board.game_started = True
+            return []
+
+        if board.game_over:
+            self.reset()
+            return [GameEvent("reset")]
+
+        if not key:
+            # Modifiers and other non-printing keys arrive as "" and type nothing
+            return []
+        if key == KEY_ENTER:
+            if board.current_input.strip():
+                return self.submit()
+        elif key == KEY_BACKSPACE:
+            board.current_input = board.current_input[:-1]
+            self.word_field.set_prefix(board.current_input.strip())
+        elif key.isprintable() and len(board.current_input) < MAX_INPUT_LENGTH:
+            board.current_input += key
+            board.total_chars_typed += 1
+            typed = board.current_input.strip()
+            self.word_field.set_prefix(typed)
+            # A keystroke is correct if the input still starts some falling word
+            board.stats.record_key(board.elapsed_time, key, self.word_field.target is not None)
+            if self.auto_submit and typed and self.word_field.find_exact(typed) is not None:
+                return [GameEvent("type")] + self.submit()
+            return [GameEvent("type")]
+        return []
+
+    def submit(self):
+        """Submit the current input against the falling words"""
+        board = self.scoreboard
+        events = []
+        typed = board.current_input.strip()
+        word = self.word_field.find_exact(typed)
+        word_match, word_pos = self.word_field.check_word(typed)
+        if word_match:
+            board.word_timings.append((word.text, round(self.time_ms - word.spawn_time, 1)))
+            x, y = word_pos
+            events.append(GameEvent("correct", None, x, y))
+
+            # Update score and check for level up
+            speed_factor = board.update_score()
+            if speed_factor > 1.0:
+                events.append(GameEvent("levelup", board.level))
+
+            board.total_chars_typed += len(board.current_input)
+            self.word_field.increase_speed(speed_factor)
+
+            # Check for powerup collection
+            collected = self.powerup_field.check_collection(x, y)
+            if collected:
+                if collected == "freeze":
+                    self.powerup_field.activate_effect("freeze", 300)
+                elif collected == "clear":
+                    self.word_field.clear_words()
+                elif collected == "life":
+                    board.lives += 1
+                elif collected == "shield":
+                    self.powerup_field.activate_effect("shield", 600)
+                events.append(GameEvent("powerup", collected, x, y))
+        else:
+            events.append(GameEvent("miss"))
+
+        board.current_input = ""
+        self.word_field.set_prefix("")
+        return events
+
+    def step(self):
+        """Advance the simulation by one fixed timestep and return its events"""
+        self.ticks += 1
+        self.time_ms += TIMESTEP * 1000
+        if not self.is_playing():
+            return []
+
+        events = []
+        profiler = self.profiler
+        self.scoreboard.elapsed_time += TIMESTEP
+        self.scoreboard.stats.advance(self.scoreboard.elapsed_time)
+        with profiler.section("update.powerups"):
+            self.powerup_field.update(TICK_SCALE)
+            self.powerup_field.try_spawn(TICK_SCALE)
+
+        # Only spawn and update words if freeze effect is not active
+        if not self.powerup_field.is_effect_active("freeze"):
+            with profiler.section("update.words"):
+                spawn_delay = self.difficulty_manager.get_spawn_delay()
+                if self.time_ms - self.last_spawn_time > spawn_delay:
+                    self.word_field.spawn_word().spawn_time = self.time_ms
+                    self.last_spawn_time = self.time_ms
+
+                self.word_field.update_words(TICK_SCALE)
+        else:
+            self.word_field.hold_words()
+
+        # Check for missed words
+        with profiler.section("update.missed"):
+            missed_words = self.word_field.get_missed_words()
+        if missed_words > 0 and not self.powerup_field.is_effect_active("shield"):
+            for _ in range(missed_words):
+                self.scoreboard.lose_life()
+                events.append(GameEvent("life_lost"))
+            if self.scoreboard.game_over:
+                events.append(GameEvent("game_over"))
+        return events
+
+    def run_script(self, script, max_ticks):
+        """Drive the simulation from (tick, key) pairs until game over or max_ticks"""
+        pending = iter(sorted(script, key=lambda item: item[0]))
+        next_input = next(pending, None)
+        while self.ticks < max_ticks:
+            while next_input is not None and next_input[0] <= self.ticks:
+                self.press_key(next_input[1])
+                next_input = next(pending, None)
+            self.step()
+            if self.scoreboard.game_over:
+                break
+        return self.scoreboard
+
+def run_headless(difficulty="medium", seed=None, script=(), max_ticks=60 * 60 * 5):
+    """Play one game without a display and return the simulation"""
+    simulation = GameSimulation(seed=seed)
+    simulation.start(difficulty)
+    simulation.run_script(script, max_ticks)
+    return simulation
+
+def check_modifier_keys():
+    """Check that Shift before each letter counts one keystroke per character"""
+    simulation = GameSimulation(seed=0)
+    simulation.start("medium")
+    for char in "variable":
+        simulation.press_key("")
+        simulation.press_key(char)
+    stats = simulation.scoreboard.stats
+    assert simulation.scoreboard.current_input == "variable", simulation.scoreboard.current_input
+    assert simulation.scoreboard.total_chars_typed == 8, simulation.scoreboard.total_chars_typed
+    assert stats.keystrokes == 8, stats.keystrokes
+    assert "" not in stats.key_latency
+    assert sum(stats.latency) == 7, stats.latency
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Run headless RETRO TYPER games")
+    parser.add_argument("--difficulty", default="medium", choices=sorted(DIFFICULTY_KEYS.values()))
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--games", type=int, default=10)
+    parser.add_argument("--ticks", type=int, default=60 * 60 * 5)
+    parser.add_argument("--check", action="store_true", help="check keystroke counting and exit")
+    args = parser.parse_args()
+
+    if args.check:
+        check_modifier_keys()
+        print("Shift+letter sequences record one keystroke per character")
+        raise SystemExit(0)
+
+    start = time.perf_counter()
+    total_ticks = 0
+    for game in range(args.games):
+        simulation = run_headless(args.difficulty, args.seed + game, max_ticks=args.ticks)
+        total_ticks += simulation.ticks
+    elapsed = time.perf_counter() - start
+    print(f"{args.games} games, {total_ticks} ticks in {elapsed:.2f}s "
+          f"({total_ticks / max(elapsed, 1e-9):,.0f} ticks/s)")
@@ -0,0 +1,377 @@
+"""
+Compact binary game-state snapshots with per-tick deltas.
+
+A snapshot covers what a remote client or spectator needs to draw a game:
+the scoreboard counters and effect timers, the current input, and every
+active word and powerup under a stable network id. Positions are fixed
+point (1/8 px) so encoder and decoder agree exactly.
+
+Each frame is a kind byte (FULL or DELTA), a byte flagging the sections
+that follow, and the tick (absolute in full frames, relative in deltas).
+Counters are sent as zigzag varint differences, words and powerups as
+lists of removed ids, spawned entities and y movements. A full frame is
+simply a delta from the empty state, so a spectator joining late gets one
+keyframe and then the same deltas as everyone else:
+
+    encoder = SnapshotEncoder()
+    data = encoder.encode(simulation)    # once per tick
+    state = decoder.apply(data)
+
+    python snapshot.py --games 20 --ticks 3600    # round-trip check and sizes
+"""
+import struct
+import time
+from collections import namedtuple
+from config import TIMESTEP
+
+FULL = 1
+DELTA = 2
+FRAME_HEADER = struct.Struct("<BB")
+
+# Section flags
+COUNTERS = 0x01
+INPUT = 0x02
+WORDS_REMOVED = 0x04
+WORDS_SPAWNED = 0x08
+WORDS_MOVED = 0x10
+POWERUPS_REMOVED = 0x20
+POWERUPS_SPAWNED = 0x40
+POWERUPS_MOVED = 0x80
+
+# Fixed-point scales for positions and speeds
+Y_SCALE = 8
+SPEED_SCALE = 1000
+
+COUNTER_NAMES = (
+    "score", "lives", "level", "words_until_level_up", "correct_words", "total_chars_typed",
+    "elapsed_ticks", "freeze", "shield", "game_over", "game_started", "selecting_difficulty"
+)
+POWERUP_TYPES = ("freeze", "clear", "life", "shield")
+
+Snapshot = namedtuple("Snapshot", ["tick", "counters", "current_input", "words", "powerups"])
+# words: {id: (text, x, y, speed)}, powerups: {id: (type, x, y)}, all fixed point
+
+EMPTY = Snapshot(0, (0,) * len(COUNTER_NAMES), "", {}, {})
+
+def _write_varint(buffer, value):
+    while value >= 0x80:
+        buffer.append((value & 0x7F) | 0x80)
+        value >>= 7
+    buffer.append(value)
+
+def _read_varint(data, offset):
+    value = 0
+    shift = 0
+    while True:
+        byte = data[offset]
+        offset += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, offset
+        shift += 7
+
+def _write_signed(buffer, value):
+    # Zigzag keeps small negative numbers small
+    _write_varint(buffer, -2 * value - 1 if value < 0 else 2 * value)
+
+def _read_signed(data, offset):
+    value, offset = _read_varint(data, offset)
+    return (value >> 1) ^ -(value & 1), offset
+
+def _write_ids(buffer, ids):
+    """Write sorted ids as a count and gaps, so dense ids take a byte each"""
+    _write_varint(buffer, len(ids))
+    previous = 0
+    for entity_id in ids:
+        _write_varint(buffer, entity_id - previous)
+        previous = entity_id
+
+def _read_ids(data, offset):
+    count, offset = _read_varint(data, offset)
+    ids = []
+    previous = 0
+    for _ in range(count):
+        gap, offset = _read_varint(data, offset)
+        previous += gap
+        ids.append(previous)
+    return ids, offset
+
+def _diff(old, new):
+    """Split entity changes into removed ids, spawned ids and (id, dy) moves"""
+    removed = sorted(entity_id for entity_id in old if entity_id not in new)
+    spawned = []
+    moved = []
+    for entity_id in sorted(new):
+        entity = new[entity_id]
+        previous = old.get(entity_id)
+        if previous is None or previous[:2] != entity[:2] or previous[3:] != entity[3:]:
+            spawned.append(entity_id)
+        elif previous[2] != entity[2]:
+            moved.append((entity_id, entity[2] - previous[2]))
+    return removed, spawned, moved
+
+def encode_frame(old, new, kind=DELTA):
+    """Encode the changes from snapshot old to new"""
+    if kind == FULL:
+        old = EMPTY
+    body = bytearray()
+    sections = 0
+    _write_varint(body, new.tick if kind == FULL else new.tick - old.tick)
+
+    if new.counters != old.counters:
+        sections |= COUNTERS
+        mask = 0
+        changes = bytearray()
+        for bit, (previous, value) in enumerate(zip(old.counters, new.counters)):
+            if previous != value:
+                mask |= 1 << bit
+                _write_signed(changes, value - previous)
+        _write_varint(body, mask)
+        body += changes
+
+    if new.current_input != old.current_input:
+        sections |= INPUT
+        text = new.current_input.encode()
+        _write_varint(body, len(text))
+        body += text
+
+    removed, spawned, moved = _diff(old.words, new.words)
+    if removed:
+        sections |= WORDS_REMOVED
+        _write_ids(body, removed)
+    if spawned:
+        sections |= WORDS_SPAWNED
+        _write_ids(body, spawned)
+        for entity_id in spawned:
+            text, x, y, speed = new.words[entity_id]
+            text = text.encode()
+            _write_varint(body, len(text))
+            body += text
+            _write_signed(body, x)
+            _write_signed(body, y)
+            _write_varint(body, speed)
+    if moved:
+        sections |= WORDS_MOVED
+        _write_ids(body, [entity_id for entity_id, _ in moved])
+        for _, dy in moved:
+            _write_signed(body, dy)
+
+    removed, spawned, moved = _diff(old.powerups, new.powerups)
+    if removed:
+        sections |= POWERUPS_REMOVED
+        _write_ids(body, removed)
+    if spawned:
+        sections |= POWERUPS_SPAWNED
+        _write_ids(body, spawned)
+        for entity_id in spawned:
+            type_name, x, y = new.powerups[entity_id]
+            body.append(POWERUP_TYPES.index(type_name))
+            _write_signed(body, x)
+            _write_signed(body, y)
+    if moved:
+        sections |= POWERUPS_MOVED
+        _write_ids(body, [entity_id for entity_id, _ in moved])
+        for _, dy in moved:
+            _write_signed(body, dy)
+
+    return FRAME_HEADER.pack(kind, sections) + bytes(body)
+
+def decode_frame(base, data):
+    """Apply one encoded frame to snapshot base and return the new snapshot"""
+    kind, sections = FRAME_HEADER.unpack_from(data)
+    if kind not in (FULL, DELTA):
+        raise ValueError(f"unknown snapshot frame kind {kind}")
+    if kind == FULL:
+        base = EMPTY
+    offset = FRAME_HEADER.size
+    tick, offset = _read_varint(data, offset)
+    if kind == DELTA:
+        tick += base.tick
+
+    counters = base.counters
+    if sections & COUNTERS:
+        mask, offset = _read_varint(data, offset)
+        counters = list(counters)
+        for bit in range(len(COUNTER_NAMES)):
+            if mask & (1 << bit):
+                change, offset = _read_signed(data, offset)
+                counters[bit] += change
+        counters = tuple(counters)
+
+    current_input = base.current_input
+    if sections & INPUT:
+        length, offset = _read_varint(data, offset)
+        current_input = data[offset:offset + length].decode()
+        offset += length
+
+    words = dict(base.words)
+    if sections & WORDS_REMOVED:
+        ids, offset = _read_ids(data, offset)
+        for entity_id in ids:
+            del words[entity_id]
+    if sections & WORDS_SPAWNED:
+        ids, offset = _read_ids(data, offset)
+        for entity_id in ids:
+            length, offset = _read_varint(data, offset)
+            text = data[offset:offset + length].decode()
+            offset += length
+            x, offset = _read_signed(data, offset)
+            y, offset = _read_signed(data, offset)
+            speed, offset = _read_varint(data, offset)
+            words[entity_id] = (text, x, y, speed)
+    if sections & WORDS_MOVED:
+        ids, offset = _read_ids(data, offset)
+        for entity_id in ids:
+            dy, offset = _read_signed(data, offset)
+            text, x, y, speed = words[entity_id]
+            words[entity_id] = (text, x, y + dy, speed)
+
+    powerups = dict(base.powerups)
+    if sections & POWERUPS_REMOVED:
+        ids, offset = _read_ids(data, offset)
+        for entity_id in ids:
+            del powerups[entity_id]
+    if sections & POWERUPS_SPAWNED:
+        ids, offset = _read_ids(data, offset)
+        for entity_id in ids:
+            type_name = POWERUP_TYPES[data[offset]]
+            x, offset = _read_signed(data, offset + 1)
+            y, offset = _read_signed(data, offset)
+            powerups[entity_id] = (type_name, x, y)
+    if sections & POWERUPS_MOVED:
+        ids, offset = _read_ids(data, offset)
+        for entity_id in ids:
+            dy, offset = _read_signed(data, offset)
+            type_name, x, y = powerups[entity_id]
+            powerups[entity_id] = (type_name, x, y + dy)
+
+    if offset != len(data):
+        raise ValueError(f"{len(data) - offset} trailing bytes in snapshot frame")
+    return Snapshot(tick, counters, current_input, words, powerups)
+
+class SnapshotEncoder:
+    def __init__(self):
+        # Network ids by entity object; ids are never reused within a game
+        self.ids = {}
+        self.next_id = 1
+        self.baseline = EMPTY
+
+    def _entity_id(self, entity, ids):
+        entity_id = self.ids.get(entity)
+        if entity_id is None:
+            entity_id = self.next_id
+            self.next_id += 1
+        ids[entity] = entity_id
+        return entity_id
+
+    def capture(self, simulation):
+        """Take a fixed-point Snapshot of the simulation's current state"""
+        board = simulation.scoreboard
+        effects = simulation.powerup_field.active_effects
+        counters = (
+            board.score, board.lives, board.level, board.words_until_level_up, board.correct_words,
+            board.total_chars_typed, round(board.elapsed_time / TIMESTEP), round(effects["freeze"]),
+            round(effects["shield"]), int(board.game_over), int(board.game_started),
+            int(simulation.selecting_difficulty)
+        )
+        ids = {}
+        words = {}
+        for word in simulation.word_field.words:
+            if word.is_active:
+                words[self._entity_id(word, ids)] = (word.text, round(word.x), round(word.y * Y_SCALE),
+                                                     round(word.speed * SPEED_SCALE))
+        powerups = {}
+        for powerup in simulation.powerup_field.powerups:
+            if powerup.is_active:
+                powerups[self._entity_id(powerup, ids)] = (powerup.type, round(powerup.x), round(powerup.y * Y_SCALE))
+        # Forget entities that left play so their objects can be freed
+        self.ids = ids
+        return Snapshot(simulation.ticks, counters, board.current_input, words, powerups)
+
+    def encode(self, simulation):
+        """Encode what changed since the last call, and make it the new baseline"""
+        snapshot = self.capture(simulation)
+        data = encode_frame(self.baseline, snapshot)
+        self.baseline = snapshot
+        return data
+
+    def keyframe(self):
+        """Encode the current baseline in full, for a client joining mid-game"""
+        return encode_frame(EMPTY, self.baseline, FULL)
+
+class SnapshotDecoder:
+    def __init__(self):
+        self.state = EMPTY
+
+    def apply(self, data):
+        self.state = decode_frame(self.state, data)
+        return self.state
+
+    def counters(self):
+        """Get the current counters by name"""
+        return dict(zip(COUNTER_NAMES, self.state.counters))
+
+def check_round_trip(seed, ticks, difficulty="medium", keyframe_every=600, wpm=60, error_rate=0.03):
+    """Play one seeded game, decoding every frame and comparing it to the encoder's state.
+
+    A fresh decoder also joins from a keyframe every keyframe_every ticks and
+    has to agree from then on. Returns per-tick (delta bytes, full bytes,
+    encode seconds, decode seconds) samples.
+    """
+    import random
+    from simulation import GameSimulation
+    from typist import SimulatedTypist
+
+    simulation = GameSimulation(seed=seed)
+    simulation.start(difficulty)
+    typist = SimulatedTypist(wpm, error_rate, rng=random.Random(f"{seed}:typist"))
+    encoder = SnapshotEncoder()
+    decoder = SnapshotDecoder()
+    late_decoder = None
+    samples = []
+    while simulation.ticks < ticks and not simulation.scoreboard.game_over:
+        for key in typist.keys_for_tick(simulation):
+            simulation.press_key(key)
+        simulation.step()
+
+        started = time.perf_counter()
+        data = encoder.encode(simulation)
+        encoded = time.perf_counter()
+        state = decoder.apply(data)
+        decoded = time.perf_counter()
+        if state != encoder.baseline:
+            raise AssertionError(f"seed {seed}: decoded state differs at tick {simulation.ticks}")
+
+        keyframe = encoder.keyframe()
+        if simulation.ticks % keyframe_every == 0:
+            late_decoder = SnapshotDecoder()
+            late_decoder.apply(keyframe)
+        elif late_decoder is not None:
+            late_decoder.apply(data)
+        if late_decoder is not None and late_decoder.state != encoder.baseline:
+            raise AssertionError(f"seed {seed}: late joiner differs at tick {simulation.ticks}")
+        samples.append((len(data), len(keyframe), encoded - started, decoded - encoded))
+    return samples
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Check snapshot round trips and measure their size and speed")
+    parser.add_argument("--games", type=int, default=10)
+    parser.add_argument("--ticks", type=int, default=60 * 60)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--difficulty", default="medium", choices=["easy", "medium", "hard"])
+    args = parser.parse_args()
+
+    samples = []
+    for game in range(args.games):
+        samples += check_round_trip(args.seed + game, args.ticks, args.difficulty)
+    count = len(samples)
+    delta_bytes = sum(sample[0] for sample in samples)
+    full_bytes = sum(sample[1] for sample in samples)
+    largest = max(sample[0] for sample in samples)
+    print(f"{args.games} games, {count} ticks: every frame decoded to the encoder's state")
+    print(f"delta {delta_bytes / count:.1f} B/tick (max {largest} B), full {full_bytes / count:.1f} B/tick, "
+          f"{delta_bytes / full_bytes:.1%} of full-state bandwidth")
+    print(f"encode {sum(sample[2] for sample in samples) / count * 1e6:.1f} us/tick, "
+          f"decode {sum(sample[3] for sample in samples) / count * 1e6:.1f} us/tick")
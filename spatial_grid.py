@@ -0,0 +1,59 @@
+"""
+Uniform grid for spatial lookups of falling objects
+"""
+from config import GRID_CELL_SIZE
+
+class SpatialGrid:
+    def __init__(self, cell_size=GRID_CELL_SIZE):
+        self.cell_size = cell_size
+        # (layer, column, row) -> objects in that cell, in insertion order
+        self.cells = {}
+        self.cell_of = {}
+
+    def _key(self, layer, x, y):
+        return (layer, int(x // self.cell_size), int(y // self.cell_size))
+
+    def insert(self, layer, obj, x, y):
+        """Add an object at a position on the given layer"""
+        key = self._key(layer, x, y)
+        self.cells.setdefault(key, {})[obj] = None
+        self.cell_of[obj] = key
+
+    def move(self, layer, obj, x, y):
+        """Update an object's position, touching the cells only if it changed cell"""
+        key = self._key(layer, x, y)
+        if self.cell_of.get(obj) != key:
+            self.remove(obj)
+            self.cells.setdefault(key, {})[obj] = None
+            self.cell_of[obj] = key
+
+    def remove(self, obj):
+        """Remove an object from the grid if present"""
+        key = self.cell_of.pop(obj, None)
+        if key is not None:
+            cell = self.cells[key]
+            del cell[obj]
+            if not cell:
+                del self.cells[key]
+
+    def query(self, layer, x, y, radius):
+        """Yield objects on a layer in the cells overlapping a square around (x, y)"""
+        size = self.cell_size
+        rows = range(int((y - radius) // size), int((y + radius) // size) + 1)
+        for column in range(int((x - radius) // size), int((x + radius) // size) + 1):
+            for row in rows:
+                cell = self.cells.get((layer, column, row))
+                if cell:
+                    yield from list(cell)
+
+    def clear(self, layer=None):
+        """Remove every object, or only those on one layer"""
+        if layer is None:
+            self.cells.clear()
+            self.cell_of.clear()
+            return
+        for obj in [obj for obj, key in self.cell_of.items() if key[0] == layer]:
+            self.remove(obj)
+
+    def __len__(self):
+        return len(self.cell_of)
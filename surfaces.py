@@ -0,0 +1,52 @@
+"""
+Surface allocation with per-frame accounting
+"""
+import threading
+import pygame
+
+class AllocationStats:
+    def __init__(self):
+        # Asset workers allocate surfaces too, so counters are updated under a lock
+        self.lock = threading.Lock()
+        self.frame_surfaces = 0
+        self.frame_bytes = 0
+        self.last_frame_surfaces = 0
+        self.last_frame_bytes = 0
+        self.total_surfaces = 0
+        self.total_bytes = 0
+
+    def record(self, surface):
+        """Count a newly allocated surface against the current frame"""
+        size = surface.get_width() * surface.get_height() * surface.get_bytesize()
+        with self.lock:
+            self.frame_surfaces += 1
+            self.frame_bytes += size
+            self.total_surfaces += 1
+            self.total_bytes += size
+
+    def end_frame(self):
+        """Close the current frame's counters"""
+        with self.lock:
+            self.last_frame_surfaces = self.frame_surfaces
+            self.last_frame_bytes = self.frame_bytes
+            self.frame_surfaces = 0
+            self.frame_bytes = 0
+
+    def get_stats(self):
+        """Get allocation counts for the last finished frame and since startup"""
+        with self.lock:
+            return {
+                "frame_surfaces": self.last_frame_surfaces,
+                "frame_bytes": self.last_frame_bytes,
+                "total_surfaces": self.total_surfaces,
+                "total_bytes": self.total_bytes
+            }
+
+# Shared instance used by all drawing code
+allocation_stats = AllocationStats()
+
+def create_surface(size, flags=0):
+    """Allocate a surface and record it in the allocation stats"""
+    surface = pygame.Surface(size, flags)
+    allocation_stats.record(surface)
+    return surface
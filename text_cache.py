@@ -0,0 +1,49 @@
+"""
+Shared cache of rendered text surfaces
+"""
+from collections import OrderedDict
+from surfaces import allocation_stats
+from config import TEXT_CACHE_SIZE
+
+class TextCache:
+    def __init__(self, max_size=TEXT_CACHE_SIZE):
+        self.max_size = max_size
+        self.surfaces = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def render(self, font, text, color):
+        """Return a rendered surface for text, reusing a cached one when possible"""
+        key = (font, text, color)
+        surface = self.surfaces.get(key)
+        if surface is not None:
+            self.surfaces.move_to_end(key)
+            self.hits += 1
+            return surface
+
+        self.misses += 1
+        surface = font.render(text, False, color)
+        allocation_stats.record(surface)
+        self.surfaces[key] = surface
+        if len(self.surfaces) > self.max_size:
+            self.surfaces.popitem(last=False)
+        return surface
+
+    def get_stats(self):
+        """Get hit/miss counters and the current cache size"""
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "size": len(self.surfaces),
+            "hit_rate": self.hits / total if total else 0.0
+        }
+
+    def clear(self):
+        """Drop all cached surfaces and reset the counters"""
+        self.surfaces.clear()
+        self.hits = 0
+        self.misses = 0
+
+# Shared instance used by all managers
+text_cache = TextCache()
@@ -0,0 +1,131 @@
+"""
+Rolling typing statistics updated once per keystroke.
+
+Correct keystrokes are kept in fixed-size rings of timestamps, so sliding
+window and burst WPM cost O(1) amortized per key and per tick and allocate
+nothing while playing. Inter-key latencies go into fixed-bucket histograms,
+overall and per key. The HUD reads the cached values instead of recomputing
+them every frame.
+"""
+import json
+
+# Seconds covered by the HUD's rolling WPM and by a burst
+WPM_WINDOW = 10.0
+BURST_WINDOW = 2.0
+# Upper bounds (ms) of the latency histogram buckets; the last one is open
+LATENCY_BUCKETS = (50, 100, 150, 200, 250, 300, 400, 500, 750, 1000, 1500, 2000)
+# Keystrokes a ring can hold; comfortably more than anyone types in a window
+RING_SIZE = 512
+
+def _bucket(latency_ms):
+    for index, bound in enumerate(LATENCY_BUCKETS):
+        if latency_ms < bound:
+            return index
+    return len(LATENCY_BUCKETS)
+
+class _TimeRing:
+    """Timestamps of recent events, dropped once older than a window"""
+
+    def __init__(self, window, size=RING_SIZE):
+        self.window = window
+        self.times = [0.0] * size
+        self.head = 0
+        self.count = 0
+
+    def add(self, time):
+        if self.count == len(self.times):
+            # Full: the oldest entry is overwritten, as it would soon expire anyway
+            self.head = (self.head + 1) % len(self.times)
+            self.count -= 1
+        self.times[(self.head + self.count) % len(self.times)] = time
+        self.count += 1
+
+    def expire(self, now):
+        """Drop entries older than the window"""
+        while self.count and now - self.times[self.head] > self.window:
+            self.head = (self.head + 1) % len(self.times)
+            self.count -= 1
+
+    def clear(self):
+        self.head = 0
+        self.count = 0
+
+class TypingStats:
+    def __init__(self, window=WPM_WINDOW, burst_window=BURST_WINDOW):
+        self.recent = _TimeRing(window)
+        self.burst = _TimeRing(burst_window)
+        self.reset()
+
+    def reset(self):
+        self.recent.clear()
+        self.burst.clear()
+        self.keystrokes = 0
+        self.correct_keystrokes = 0
+        self.last_key_time = None
+        self.latency = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.key_latency = {}
+        self.started_at = None
+        # Cached values read by the HUD
+        self.wpm = 0
+        self.burst_wpm = 0
+        self.best_burst_wpm = 0
+        self.accuracy = 0
+
+    def record_key(self, now, key, correct):
+        """Record one printable keystroke typed at now (seconds of play)"""
+        if not key:
+            # Modifier keys carry no character and aren't keystrokes
+            return
+        if self.started_at is None:
+            self.started_at = now
+        self.keystrokes += 1
+        if correct:
+            self.correct_keystrokes += 1
+            self.recent.add(now)
+            self.burst.add(now)
+
+        if self.last_key_time is not None:
+            bucket = _bucket((now - self.last_key_time) * 1000)
+            self.latency[bucket] += 1
+            histogram = self.key_latency.get(key)
+            if histogram is None:
+                histogram = self.key_latency[key] = [0] * (len(LATENCY_BUCKETS) + 1)
+            histogram[bucket] += 1
+        self.last_key_time = now
+
+        self.accuracy = self.correct_keystrokes * 100 // self.keystrokes
+        self.advance(now)
+
+    def advance(self, now):
+        """Expire old keystrokes and refresh the cached WPM figures"""
+        self.recent.expire(now)
+        self.burst.expire(now)
+        if self.started_at is not None:
+            self.wpm = self._window_wpm(self.recent, now)
+            self.burst_wpm = self._window_wpm(self.burst, now)
+            self.best_burst_wpm = max(self.best_burst_wpm, self.burst_wpm)
+
+    def _window_wpm(self, ring, now):
+        # Early in a game the window is only as long as the typing so far
+        span = max(min(ring.window, now - self.started_at), 1.0)
+        return int(ring.count / 5 / span * 60)
+
+    def summary(self):
+        return {
+            "keystrokes": self.keystrokes,
+            "correct_keystrokes": self.correct_keystrokes,
+            "accuracy": self.accuracy,
+            "wpm": self.wpm,
+            "best_burst_wpm": self.best_burst_wpm
+        }
+
+    def export(self, path):
+        """Write the summary and full latency histograms as JSON"""
+        data = {
+            "summary": self.summary(),
+            "latency_buckets_ms": list(LATENCY_BUCKETS),
+            "latency": self.latency,
+            "key_latency": dict(sorted(self.key_latency.items()))
+        }
+        with open(path, "w") as stats_file:
+            json.dump(data, stats_file, indent=2)
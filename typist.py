@@ -0,0 +1,80 @@
+"""
+Simulated typist for driving headless games
+"""
+import random
+import string
+from collections import deque
+from simulation import KEY_ENTER, KEY_BACKSPACE
+from config import TIMESTEP
+
+class SimulatedTypist:
+    def __init__(self, wpm=60, error_rate=0.03, reaction_ms=400, rng=None):
+        self.wpm = wpm
+        self.error_rate = error_rate
+        self.reaction_ms = reaction_ms
+        self.rng = rng or random.Random()
+        # Standard WPM counts five characters per word
+        self.chars_per_tick = wpm * 5 / 60 * TIMESTEP
+        self.reset()
+
+    def reset(self):
+        """Forget the current target and any queued keys"""
+        self.target = None
+        self.pending = deque()
+        self.ready_at = 0.0
+        self.credit = 0.0
+
+    def _pick_target(self, simulation):
+        """Aim for the active word closest to the bottom of the screen"""
+        active = [word for word in simulation.word_field.words if word.is_active]
+        if not active:
+            return None
+        return max(active, key=lambda word: word.y)
+
+    def _plan_keys(self, text, current_input):
+        """Queue the keys needed to type text, with random typos"""
+        keys = [KEY_BACKSPACE] * len(current_input)
+        for char in text:
+            if self.rng.random() < self.error_rate:
+                char = self.rng.choice(string.ascii_lowercase.replace(char, ""))
+            keys.append(char)
+        keys.append(KEY_ENTER)
+        return deque(keys)
+
+    def keys_for_tick(self, simulation):
+        """Return the keys this typist presses during the next tick"""
+        if not simulation.is_playing():
+            return []
+
+        if self.target is None or not self.target.is_active:
+            self.target = self._pick_target(simulation)
+            if self.target is None:
+                self.pending.clear()
+                return []
+            self.pending = self._plan_keys(self.target.text, simulation.scoreboard.current_input)
+            self.ready_at = simulation.time_ms + self.reaction_ms
+            self.credit = 0.0
+
+        if simulation.time_ms < self.ready_at:
+            return []
+
+        keys = []
+        self.credit += self.chars_per_tick
+        while self.credit >= 1 and self.pending:
+            self.credit -= 1
+            key = self.pending.popleft()
+            keys.append(key)
+            if key == KEY_ENTER:
+                self.target = None
+                break
+        return keys
+
+    def play(self, simulation, max_ticks):
+        """Play until game over or max_ticks and return the scoreboard"""
+        while simulation.ticks < max_ticks:
+            for key in self.keys_for_tick(simulation):
+                simulation.press_key(key)
+            simulation.step()
+            if simulation.scoreboard.game_over:
+                break
+        return simulation.scoreboard
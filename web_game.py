@@ -1,13 +1,39 @@
 import http.server
-import socketserver
 import webbrowser
 import os
 import sys
 import threading
-import subprocess
+import gzip
+import json
+import hashlib
+import mimetypes
+from concurrent.futures import ThreadPoolExecutor
+from email.utils import formatdate, parsedate_to_datetime
+from urllib.parse import urlsplit, parse_qs
+from game_pool import GamePool, PoolFull, MAX_SESSIONS, WARM_WORKERS, MAX_QUEUED, QUEUE_TIMEOUT
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
 
 # Set the port for the web server
 PORT = 8000
+# Threads serving connections; keep-alive clients hold one while connected
+SERVER_WORKERS = 32
+# Seconds an idle or slow connection may hold a worker
+CLIENT_TIMEOUT = 10
+# Seconds a refused /start-game client is told to wait before retrying
+START_RETRY_AFTER = 5
+# Seconds a queued client is told to wait between /session-status polls
+STATUS_POLL_INTERVAL = 2
+
+# Files served from memory, relative to SCRIPT_DIR
+STATIC_FILES = ("index.html", "game.js", "game-min.js", "styles.css")
+STATIC_DIRS = ("js", "css")
+# HTML is revalidated on every load so new builds show up; scripts and styles are cached
+HTML_CACHE_CONTROL = "no-cache"
+STATIC_CACHE_CONTROL = "public, max-age=3600"
 
 # Get the directory of the script
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
@@ -73,12 +99,41 @@ HTML_TEMPLATE = """<!DOCTYPE html>
     </div>
 
     <script>
-        document.getElementById('play-button').addEventListener('click', function() {
+        const playButton = document.getElementById('play-button');
+        // Matches STATUS_POLL_INTERVAL in web_game.py
+        const STATUS_POLL_MS = 2000;
+
+        function showStatus(status, session) {
+            if (status === 'started') {
+                playButton.textContent = 'GAME STARTED';
+            } else if (status === 'queued') {
+                playButton.textContent = 'GAME QUEUED';
+                playButton.disabled = true;
+                setTimeout(() => pollSession(session), STATUS_POLL_MS);
+            } else {
+                playButton.textContent = 'QUEUE TIMED OUT - TRY AGAIN';
+                playButton.disabled = false;
+            }
+        }
+
+        function pollSession(session) {
+            fetch('/session-status?id=' + encodeURIComponent(session))
+                .then(response => response.ok ? response.json() : {status: 'expired'})
+                .then(body => showStatus(body.status, session))
+                .catch(error => {
+                    console.error('Error checking game:', error);
+                    setTimeout(() => pollSession(session), STATUS_POLL_MS);
+                });
+        }
+
+        playButton.addEventListener('click', function() {
             fetch('/start-game')
                 .then(response => {
                     if (response.ok) {
-                        this.textContent = 'GAME STARTED';
                         this.disabled = true;
+                        return response.json().then(body => showStatus(body.status, body.session));
+                    } else if (response.status === 503) {
+                        this.textContent = 'SERVER BUSY - TRY AGAIN';
                     }
                 })
                 .catch(error => {
@@ -90,53 +145,220 @@ HTML_TEMPLATE = """<!DOCTYPE html>
 </html>
 """
 
+class StaticFile:
+    """A file held in memory with its validators and compressed encodings"""
+
+    def __init__(self, data, content_type, mtime, cache_control):
+        self.content_type = content_type
+        self.cache_control = cache_control
+        self.mtime = int(mtime)
+        self.last_modified = formatdate(self.mtime, usegmt=True)
+        self.etag = '"' + hashlib.sha1(data).hexdigest()[:20] + '"'
+        self.encodings = {"identity": data}
+        # Only keep compressed copies that are actually smaller
+        compressed = gzip.compress(data, compresslevel=9, mtime=0)
+        if len(compressed) < len(data):
+            self.encodings["gzip"] = compressed
+        if brotli is not None:
+            compressed = brotli.compress(data)
+            if len(compressed) < len(data):
+                self.encodings["br"] = compressed
+
+    def negotiate(self, accept_encoding):
+        """Pick the smallest encoding the client accepts"""
+        accepted = {part.split(";")[0].strip() for part in accept_encoding.lower().split(",")}
+        for encoding in ("br", "gzip"):
+            if encoding in self.encodings and encoding in accepted:
+                return encoding
+        return "identity"
+
+def load_static_files(root=SCRIPT_DIR):
+    """Read every served file into memory, keyed by URL path"""
+    paths = [name for name in STATIC_FILES if os.path.isfile(os.path.join(root, name))]
+    for directory in STATIC_DIRS:
+        full_directory = os.path.join(root, directory)
+        if os.path.isdir(full_directory):
+            paths += [f"{directory}/{name}" for name in sorted(os.listdir(full_directory))
+                      if os.path.isfile(os.path.join(full_directory, name))]
+
+    files = {}
+    for path in paths:
+        full_path = os.path.join(root, path)
+        with open(full_path, "rb") as static_file:
+            data = static_file.read()
+        content_type = mimetypes.guess_type(path)[0] or "application/octet-stream"
+        if content_type.startswith("text/") or content_type.endswith("javascript"):
+            content_type += "; charset=utf-8"
+        cache_control = HTML_CACHE_CONTROL if path.endswith(".html") else STATIC_CACHE_CONTROL
+        files["/" + path] = StaticFile(data, content_type, os.path.getmtime(full_path), cache_control)
+    files["/"] = StaticFile(HTML_TEMPLATE.encode(), "text/html; charset=utf-8",
+                            os.path.getmtime(os.path.abspath(__file__)), HTML_CACHE_CONTROL)
+    return files
+
 # Create a simple HTTP request handler
 class GameHandler(http.server.SimpleHTTPRequestHandler):
+    # Keep-alive lets browsers and load balancers reuse connections
+    protocol_version = "HTTP/1.1"
+    timeout = CLIENT_TIMEOUT
+    static_files = {}
+    game_pool = None
+
     def __init__(self, *args, **kwargs):
         super().__init__(*args, directory=SCRIPT_DIR, **kwargs)
     
     def do_GET(self):
-        if self.path == '/':
-            self.send_response(200)
-            self.send_header('Content-type', 'text/html')
-            self.end_headers()
-            self.wfile.write(HTML_TEMPLATE.encode())
-        elif self.path == '/start-game':
-            self.send_response(200)
-            self.send_header('Content-type', 'text/plain')
+        url = urlsplit(self.path)
+        if url.path == '/start-game':
+            # Games run on pre-warmed pool workers; the cap stops clients forking without limit
+            try:
+                session = self.game_pool.request_session()
+            except PoolFull:
+                self.send_text(503, b'Too many games running', {'Retry-After': str(START_RETRY_AFTER)})
+            else:
+                self.send_session(session, self.game_pool.session_status(session))
+        elif url.path == '/session-status':
+            session = parse_qs(url.query).get('id', [''])[0]
+            status = self.game_pool.session_status(session)
+            if status is None:
+                self.send_error(404)
+            else:
+                self.send_session(session, status)
+        elif url.path == '/pool-status':
+            body = json.dumps(self.game_pool.get_stats()).encode()
+            self.send_text(200, body, {'Cache-Control': 'no-store'}, content_type='application/json')
+        elif not self.send_static():
+            # Only whitelisted files are served; never fall back to the directory
+            self.send_error(404)
+
+    def send_session(self, session, status):
+        """Send a session's status; queued sessions get 202 and a hint when to poll again"""
+        body = json.dumps({'session': session, 'status': status}).encode()
+        headers = {'Cache-Control': 'no-store'}
+        if status == 'queued':
+            headers['Location'] = f'/session-status?id={session}'
+            headers['Retry-After'] = str(STATUS_POLL_INTERVAL)
+        self.send_text(202 if status == 'queued' else 200, body, headers, content_type='application/json')
+
+    def send_text(self, code, body, headers=None, content_type='text/plain'):
+        self.send_response(code)
+        self.send_header('Content-type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_HEAD(self):
+        if not self.send_static(head=True):
+            self.send_error(404)
+
+    def send_static(self, head=False):
+        """Serve a cached file, answering 304 when the client's copy is current"""
+        static = self.static_files.get(self.path.split("?", 1)[0])
+        if static is None:
+            return False
+
+        if self._not_modified(static):
+            self.send_response(304)
+            self._send_validators(static)
             self.end_headers()
-            self.wfile.write(b'Game started')
-            
-            # Start the game in a separate process
-            game_path = os.path.join(SCRIPT_DIR, 'main.py')
-            if os.path.exists(game_path):
-                subprocess.Popen([sys.executable, game_path])
-        else:
-            super().do_GET()
+            return True
+
+        encoding = static.negotiate(self.headers.get("Accept-Encoding", ""))
+        body = static.encodings[encoding]
+        self.send_response(200)
+        self.send_header("Content-Type", static.content_type)
+        self.send_header("Content-Length", str(len(body)))
+        if encoding != "identity":
+            self.send_header("Content-Encoding", encoding)
+        self._send_validators(static)
+        self.end_headers()
+        if not head:
+            self.wfile.write(body)
+        return True
+
+    def _not_modified(self, static):
+        if_none_match = self.headers.get("If-None-Match")
+        if if_none_match is not None:
+            return static.etag in if_none_match or if_none_match.strip() == "*"
+        if_modified_since = self.headers.get("If-Modified-Since")
+        if if_modified_since:
+            try:
+                return parsedate_to_datetime(if_modified_since).timestamp() >= static.mtime
+            except (TypeError, ValueError):
+                return False
+        return False
+
+    def _send_validators(self, static):
+        self.send_header("ETag", static.etag)
+        self.send_header("Last-Modified", static.last_modified)
+        self.send_header("Cache-Control", static.cache_control)
+        self.send_header("Vary", "Accept-Encoding")
     
     def log_message(self, format, *args):
         # Suppress log messages
         pass
 
-def start_server():
-    with socketserver.TCPServer(("", PORT), GameHandler) as httpd:
-        print(f"Web server started at http://localhost:{PORT}")
+class PooledHTTPServer(http.server.HTTPServer):
+    """HTTP server handing each connection to a fixed pool of worker threads"""
+
+    def __init__(self, address, handler, workers=SERVER_WORKERS):
+        super().__init__(address, handler)
+        self.pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="http")
+
+    def process_request(self, request, client_address):
+        self.pool.submit(self._process_request_thread, request, client_address)
+
+    def _process_request_thread(self, request, client_address):
+        try:
+            self.finish_request(request, client_address)
+        except Exception:
+            self.handle_error(request, client_address)
+        finally:
+            self.shutdown_request(request)
+
+    def server_close(self):
+        super().server_close()
+        self.pool.shutdown(wait=False, cancel_futures=True)
+
+def start_server(port=PORT, workers=SERVER_WORKERS, game_pool=None):
+    GameHandler.static_files = load_static_files()
+    GameHandler.game_pool = game_pool or GamePool()
+    with PooledHTTPServer(("", port), GameHandler, workers) as httpd:
+        print(f"Web server started at http://localhost:{port}")
         print("Press Ctrl+C to stop the server")
         httpd.serve_forever()
 
 if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Serve RETRO TYPER in the browser")
+    parser.add_argument("--port", type=int, default=PORT)
+    parser.add_argument("--workers", type=int, default=SERVER_WORKERS, help="connection worker threads")
+    parser.add_argument("--sessions", type=int, default=MAX_SESSIONS, help="games allowed to run at once")
+    parser.add_argument("--warm", type=int, default=WARM_WORKERS, help="idle game processes kept pre-warmed")
+    parser.add_argument("--queue", type=int, default=MAX_QUEUED, help="game requests allowed to wait for a slot")
+    parser.add_argument("--queue-timeout", type=float, default=QUEUE_TIMEOUT,
+                        help="seconds a queued game request waits before it expires")
+    parser.add_argument("--no-browser", action="store_true", help="don't open a browser window")
+    args = parser.parse_args()
+
+    game_pool = GamePool(args.sessions, args.warm, args.queue, args.queue_timeout)
+
     # Start the server in a separate thread
-    server_thread = threading.Thread(target=start_server)
+    server_thread = threading.Thread(target=start_server, args=(args.port, args.workers, game_pool))
     server_thread.daemon = True
     server_thread.start()
     
     # Open the web browser
-    webbrowser.open(f"http://localhost:{PORT}")
+    if not args.no_browser:
+        webbrowser.open(f"http://localhost:{args.port}")
     
     # Keep the main thread running
     try:
         while True:
             input()
     except KeyboardInterrupt:
+        game_pool.close()
         print("\nServer stopped")
         sys.exit(0)
\ No newline at end of file
@@ -0,0 +1,193 @@
+"""
+Minimal WebSocket (RFC 6455) support on asyncio streams.
+
+Covers what the race server and its bots need: the opening handshake for
+both ends, text messages, ping/pong and close. Frames the server sends are
+never masked, so a broadcast can be encoded once with encode_frame() and
+written to every client with send_frame().
+"""
+import asyncio
+import base64
+import hashlib
+import os
+import struct
+
+HANDSHAKE_GUID = "258EAFA5-E914-47DA-95CA-C5AB0DC85B11"
+# Largest message accepted from the other end
+MAX_MESSAGE_SIZE = 64 * 1024
+# Largest handshake header block
+MAX_HEADER_SIZE = 8 * 1024
+
+OP_CONTINUATION = 0x0
+OP_TEXT = 0x1
+OP_BINARY = 0x2
+OP_CLOSE = 0x8
+OP_PING = 0x9
+OP_PONG = 0xA
+
+class WebSocketError(Exception):
+    """Raised on a failed handshake or a malformed frame"""
+
+def accept_key(key):
+    """Get the Sec-WebSocket-Accept value for a client's Sec-WebSocket-Key"""
+    return base64.b64encode(hashlib.sha1((key + HANDSHAKE_GUID).encode()).digest()).decode()
+
+def encode_frame(payload, opcode=OP_TEXT, mask=False):
+    """Encode one complete frame, masked as clients must"""
+    if isinstance(payload, str):
+        payload = payload.encode()
+    length = len(payload)
+    if length < 126:
+        header = struct.pack("!BB", 0x80 | opcode, (0x80 if mask else 0) | length)
+    elif length < 1 << 16:
+        header = struct.pack("!BBH", 0x80 | opcode, (0x80 if mask else 0) | 126, length)
+    else:
+        header = struct.pack("!BBQ", 0x80 | opcode, (0x80 if mask else 0) | 127, length)
+    if not mask:
+        return header + payload
+    mask_key = os.urandom(4)
+    return header + mask_key + _apply_mask(payload, mask_key)
+
+def _apply_mask(payload, mask_key):
+    # XOR the whole payload as one integer instead of byte by byte
+    length = len(payload)
+    repeated = (mask_key * (length // 4 + 1))[:length]
+    return (int.from_bytes(payload, "big") ^ int.from_bytes(repeated, "big")).to_bytes(length, "big")
+
+async def _read_headers(reader):
+    try:
+        block = await reader.readuntil(b"\r\n\r\n")
+    except (asyncio.IncompleteReadError, asyncio.LimitOverrunError) as error:
+        raise WebSocketError("incomplete handshake") from error
+    if len(block) > MAX_HEADER_SIZE:
+        raise WebSocketError("handshake headers too large")
+    lines = block.decode("latin-1").split("\r\n")
+    headers = {}
+    for line in lines[1:]:
+        name, _, value = line.partition(":")
+        if value:
+            headers[name.strip().lower()] = value.strip()
+    return lines[0], headers
+
+class WebSocket:
+    def __init__(self, reader, writer, mask=False):
+        self.reader = reader
+        self.writer = writer
+        self.mask = mask
+        self.close_sent = False
+        self.closed = False
+
+    async def recv(self):
+        """Get the next text message, or None once the connection is closed"""
+        fragments = []
+        size = 0
+        while True:
+            try:
+                opcode, fin, payload = await self._read_frame()
+            except (asyncio.IncompleteReadError, ConnectionError):
+                self.closed = True
+                return None
+            if opcode == OP_CLOSE:
+                await self.close()
+                return None
+            if opcode == OP_PING:
+                self.send_frame(encode_frame(payload, OP_PONG, self.mask))
+                continue
+            if opcode == OP_PONG:
+                continue
+            size += len(payload)
+            if size > MAX_MESSAGE_SIZE:
+                await self.close()
+                raise WebSocketError("message too large")
+            fragments.append(payload)
+            if fin:
+                try:
+                    return b"".join(fragments).decode()
+                except UnicodeDecodeError as error:
+                    raise WebSocketError("message is not valid UTF-8") from error
+
+    async def _read_frame(self):
+        first, second = await self.reader.readexactly(2)
+        length = second & 0x7F
+        if length == 126:
+            length = struct.unpack("!H", await self.reader.readexactly(2))[0]
+        elif length == 127:
+            length = struct.unpack("!Q", await self.reader.readexactly(8))[0]
+        if length > MAX_MESSAGE_SIZE:
+            raise WebSocketError("frame too large")
+        mask_key = await self.reader.readexactly(4) if second & 0x80 else None
+        payload = await self.reader.readexactly(length)
+        if mask_key is not None:
+            payload = _apply_mask(payload, mask_key)
+        return first & 0x0F, bool(first & 0x80), payload
+
+    def send(self, text):
+        self.send_frame(encode_frame(text, OP_TEXT, self.mask))
+
+    def send_frame(self, frame):
+        """Queue an already encoded frame; writes after a close frame are dropped"""
+        if not self.close_sent:
+            self.writer.write(frame)
+
+    def buffered(self):
+        """Get the bytes queued but not yet taken by the socket"""
+        return self.writer.transport.get_write_buffer_size()
+
+    def start_close(self):
+        """Send a close frame but keep the connection open for the peer's reply.
+
+        Closing the socket outright can reset the connection while the peer
+        is still sending, which discards data it hasn't read yet.
+        """
+        if not self.close_sent:
+            self.close_sent = True
+            self.writer.write(encode_frame(b"", OP_CLOSE, self.mask))
+
+    def abort(self):
+        """Close the connection without waiting for the peer"""
+        self.close_sent = True
+        self.closed = True
+        self.writer.close()
+
+    async def close(self):
+        if self.closed:
+            return
+        self.start_close()
+        self.closed = True
+        try:
+            await self.writer.drain()
+        except ConnectionError:
+            pass
+        self.writer.close()
+
+async def accept(reader, writer):
+    """Complete the server side of the handshake and return the WebSocket"""
+    request_line, headers = await _read_headers(reader)
+    key = headers.get("sec-websocket-key")
+    if not request_line.startswith("GET ") or "websocket" not in headers.get("upgrade", "").lower() or not key:
+        writer.write(b"HTTP/1.1 400 Bad Request\r\nContent-Length: 0\r\nConnection: close\r\n\r\n")
+        writer.close()
+        raise WebSocketError("not a WebSocket upgrade request")
+    writer.write(("HTTP/1.1 101 Switching Protocols\r\n"
+                  "Upgrade: websocket\r\n"
+                  "Connection: Upgrade\r\n"
+                  f"Sec-WebSocket-Accept: {accept_key(key)}\r\n\r\n").encode())
+    await writer.drain()
+    return WebSocket(reader, writer)
+
+async def connect(host, port, path="/"):
+    """Open a client connection and return the WebSocket"""
+    reader, writer = await asyncio.open_connection(host, port)
+    key = base64.b64encode(os.urandom(16)).decode()
+    writer.write((f"GET {path} HTTP/1.1\r\n"
+                  f"Host: {host}:{port}\r\n"
+                  "Upgrade: websocket\r\n"
+                  "Connection: Upgrade\r\n"
+                  f"Sec-WebSocket-Key: {key}\r\n"
+                  "Sec-WebSocket-Version: 13\r\n\r\n").encode())
+    await writer.drain()
+    status_line, headers = await _read_headers(reader)
+    if " 101 " not in status_line or headers.get("sec-websocket-accept") != accept_key(key):
+        writer.close()
+        raise WebSocketError(f"handshake refused: {status_line}")
+    return WebSocket(reader, writer, mask=True)
@@ -0,0 +1,80 @@
+"""
+Prefix index over the words currently on screen
+"""
+
+class _Node:
+    __slots__ = ("children", "words", "exact")
+
+    def __init__(self):
+        self.children = {}
+        # Dicts keep insertion (spawn) order, so lookups are deterministic
+        self.words = {}
+        self.exact = {}
+
+class PrefixIndex:
+    def __init__(self):
+        self.root = _Node()
+
+    def add(self, key, word):
+        """Index word under key (its lowercase text)"""
+        node = self.root
+        node.words[word] = None
+        for char in key:
+            child = node.children.get(char)
+            if child is None:
+                child = node.children[char] = _Node()
+            node = child
+            node.words[word] = None
+        node.exact[word] = None
+
+    def remove(self, key, word):
+        """Remove word from the index, pruning branches that become empty"""
+        node = self.root
+        if node.words.pop(word, False) is False:
+            return
+        for char in key:
+            child = node.children[char]
+            child.words.pop(word, None)
+            if not child.words:
+                del node.children[char]
+                return
+            node = child
+        node.exact.pop(word, None)
+
+    def _find(self, prefix):
+        node = self.root
+        for char in prefix:
+            node = node.children.get(char)
+            if node is None:
+                return None
+        return node
+
+    def candidates(self, prefix):
+        """Get the words starting with prefix, in spawn order"""
+        node = self._find(prefix)
+        return node.words.keys() if node else ()
+
+    def find_exact(self, key):
+        """Get the earliest spawned word whose text is key, or None"""
+        node = self._find(key)
+        if node is None or not node.exact:
+            return None
+        return next(iter(node.exact))
+
+    def longest_prefix(self, key):
+        """Get the length of the longest prefix of key shared with an indexed word, and that word"""
+        node = self.root
+        depth = 0
+        for char in key:
+            child = node.children.get(char)
+            if child is None:
+                break
+            node = child
+            depth += 1
+        return depth, next(iter(node.words), None)
+
+    def clear(self):
+        self.root = _Node()
+
+    def __len__(self):
+        return len(self.root.words)
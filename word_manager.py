@@ -1,136 +1,91 @@
-import random
 import pygame
-from words import WORD_LIST
+from simulation import Word, WordField
+from text_cache import text_cache
+from fonts import get_font
+from surfaces import create_surface
 from config import (
-    WINDOW_WIDTH, 
-    WINDOW_HEIGHT, 
-    FONT_SIZE, 
-    RETRO_WHITE,
-    RETRO_GREEN,
-    RETRO_YELLOW,
-    RETRO_RED,
+    FONT_SIZE,
     RETRO_SURFACE,
     RETRO_CYAN
 )
 
-class RetroWord:
-    def __init__(self, text, speed):
-        self.text = text
-        self.x = random.randint(30, WINDOW_WIDTH - 100)
-        self.y = -20
-        self.speed = speed
-        self.is_active = True
-        
-        # Retro color coding based on difficulty
-        if len(text) <= 4:
-            self.color = RETRO_GREEN
-            self.difficulty = "easy"
-        elif len(text) <= 7:
-            self.color = RETRO_YELLOW
-            self.difficulty = "medium"
-        else:
-            self.color = RETRO_RED
-            self.difficulty = "hard"
-
-    def update(self):
-        self.y += self.speed
-        return self.y < WINDOW_HEIGHT + 20
+class RetroWord(Word):
+    def __init__(self, text, speed, x):
+        super().__init__(text, speed, x)
+        self.sprite = None
+        self.sprite_padding = 0
+        self.highlight = 0
 
-    def draw(self, screen, font):
-        if not self.is_active:
-            return
-            
-        # Create retro word box
-        text_surface = font.render(self.text, False, self.color)
+    def build_sprite(self, font):
+        """Composite the word box, border and text into a single sprite"""
+        text_surface = text_cache.render(font, self.text, self.color)
         text_rect = text_surface.get_rect()
+        border_color = RETRO_CYAN if self.highlight else self.color
         
         # Background box with padding
         bg_padding = 4
         bg_width = text_rect.width + bg_padding * 2
         bg_height = text_rect.height + bg_padding * 2
         
-        bg_x = self.x - bg_padding
-        bg_y = self.y - bg_padding
-        
-        # Draw background
-        bg_rect = pygame.Rect(bg_x, bg_y, bg_width, bg_height)
-        pygame.draw.rect(screen, RETRO_SURFACE, bg_rect)
-        pygame.draw.rect(screen, self.color, bg_rect, 1)
-        
-        # Draw text
-        screen.blit(text_surface, (self.x, self.y))
-
-class WordManager:
-    def __init__(self, difficulty_manager):
-        self.words = []
-        self.font = pygame.font.Font(None, FONT_SIZE)
-        self.difficulty_manager = difficulty_manager
-        self.current_speed = self.difficulty_manager.get_word_speed()
-        self.filtered_words = self.difficulty_manager.filter_words_by_difficulty(WORD_LIST)
+        self.sprite = create_surface((bg_width, bg_height))
+        self.sprite.fill(RETRO_SURFACE)
+        pygame.draw.rect(self.sprite, border_color, self.sprite.get_rect(), 1)
+        self.sprite.blit(text_surface, (bg_padding, bg_padding))
+        if self.highlight:
+            # Overdraw the typed part of the word in the highlight color
+            typed_surface = text_cache.render(font, self.text[:self.highlight], RETRO_CYAN)
+            self.sprite.fill(RETRO_SURFACE, (bg_padding, bg_padding) + typed_surface.get_size())
+            self.sprite.blit(typed_surface, (bg_padding, bg_padding))
+        self.sprite_padding = bg_padding
 
-    def spawn_word(self):
-        """Spawn a new retro word"""
-        word_text = random.choice(self.filtered_words)
-        new_word = RetroWord(word_text, self.current_speed)
-        
-        # Ensure words don't spawn too close to each other
-        min_distance = 80
-        max_attempts = 8
-        attempts = 0
-        
-        while attempts < max_attempts:
-            too_close = False
-            for existing_word in self.words:
-                if existing_word.is_active and existing_word.y < 60:
-                    distance = abs(new_word.x - existing_word.x)
-                    if distance < min_distance:
-                        too_close = True
-                        break
-            
-            if not too_close:
-                break
-                
-            new_word.x = random.randint(30, WINDOW_WIDTH - 100)
-            attempts += 1
-        
-        self.words.append(new_word)
+    def set_color(self, color, font):
+        """Change the word color, rebuilding the sprite only when it differs"""
+        if color != self.color or self.sprite is None:
+            self.color = color
+            self.build_sprite(font)
 
-    def update_words(self):
-        """Update word positions and remove inactive words"""
-        self.words = [word for word in self.words if word.update() and word.is_active]
+    def set_highlight(self, typed_length, font):
+        """Highlight the first typed_length letters, rebuilding the sprite only on change"""
+        if typed_length != self.highlight:
+            self.highlight = typed_length
+            self.build_sprite(font)
 
-    def draw_words(self, screen):
-        """Draw all active words with retro styling"""
-        for word in self.words:
-            if word.is_active:
-                word.draw(screen, self.font)
+    def draw(self, screen, font, alpha=1.0):
+        """Blit the word sprite and return the rect it covers"""
+        if not self.is_active:
+            return None
+            
+        if self.sprite is None:
+            self.build_sprite(font)
+        # Interpolate between the last two simulation steps
+        y = self.prev_y + (self.y - self.prev_y) * alpha
+        return screen.blit(self.sprite, (self.x - self.sprite_padding, y - self.sprite_padding))
 
-    def check_word(self, typed_word):
-        """Check if typed word matches any falling word"""
-        for word in self.words:
-            if word.text.lower() == typed_word.lower() and word.is_active:
-                word.is_active = False
-                return True, (word.x + len(word.text) * 6, word.y)
-        return False, None
+class WordManager(WordField):
+    word_class = RetroWord
 
-    def increase_speed(self, factor):
-        """Increase word falling speed"""
-        self.current_speed *= factor
-        # Cap maximum speed for playability
-        self.current_speed = min(self.current_speed, 3.0)
+    def __init__(self, difficulty_manager, rng=None, word_list=None):
+        super().__init__(difficulty_manager, rng, word_list)
+        self.font = get_font(FONT_SIZE)
 
-    def reset_speed(self):
-        """Reset speed to initial value"""
-        self.current_speed = self.difficulty_manager.get_word_speed()
-        self.filtered_words = self.difficulty_manager.filter_words_by_difficulty(WORD_LIST)
+    def spawn_word(self):
+        """Spawn a new retro word with its sprite prebuilt"""
+        new_word = super().spawn_word()
+        new_word.build_sprite(self.font)
+        return new_word
 
-    def get_missed_words(self):
-        """Get count of words that reached the bottom"""
-        missed = [word for word in self.words if word.y >= WINDOW_HEIGHT - 30 and word.is_active]
-        for word in missed:
-            word.is_active = False
-        return len(missed)
+    def set_target(self, word):
+        """Move the typing highlight to the targeted word"""
+        if self.target is not None and self.target is not word:
+            self.target.set_highlight(0, self.font)
+        super().set_target(word)
+        if word is not None:
+            word.set_highlight(len(self.prefix), self.font)
 
-    def clear_words(self):
-        """Clear all words from screen"""
-        self.words.clear()
+    def draw_words(self, screen, alpha=1.0):
+        """Draw all active words with retro styling and return the rects drawn"""
+        rects = []
+        for word in self.words:
+            if word.is_active:
+                rects.append(word.draw(screen, self.font, alpha))
+        return rects
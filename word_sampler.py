@@ -0,0 +1,133 @@
+"""
+Adaptive word sampling biased toward the player's weak keys.
+
+Every character and bigram ("key") tracks how often it was typed and how
+often a submission went wrong on it. Spawning mixes a uniform pick with a
+two-step weighted pick: choose a key in proportion to its miss rate using a
+Fenwick tree (O(log k) to sample or update one key), then choose uniformly
+among example words containing that key. Recording a result only touches
+the keys in that word, so nothing is rebuilt while playing.
+"""
+import random
+
+# Attempts assumed before any data, so one early miss doesn't dominate
+PRIOR_ATTEMPTS = 5
+# Example words kept per key, and words scanned to find them, so indexing
+# a very large dictionary stays fast and small
+EXAMPLES_PER_KEY = 2048
+MAX_INDEXED_WORDS = 50000
+
+def word_keys(word):
+    """Get the distinct characters and bigrams of a word"""
+    return set(word) | {word[i:i + 2] for i in range(len(word) - 1)}
+
+class FenwickTree:
+    def __init__(self, size):
+        self.tree = [0.0] * (size + 1)
+        self.weights = [0.0] * size
+        self.total = 0.0
+
+    def set(self, index, weight):
+        """Set the weight at index, updating the prefix sums in O(log n)"""
+        delta = weight - self.weights[index]
+        if delta == 0:
+            return
+        self.weights[index] = weight
+        self.total += delta
+        index += 1
+        while index < len(self.tree):
+            self.tree[index] += delta
+            index += index & -index
+
+    def find(self, value):
+        """Get the index whose cumulative weight range contains value"""
+        index = 0
+        step = 1 << (len(self.weights).bit_length())
+        while step:
+            following = index + step
+            if following < len(self.tree) and self.tree[following] <= value:
+                index = following
+                value -= self.tree[following]
+            step >>= 1
+        # Float rounding can land one past the end or on an emptied slot
+        index = min(index, len(self.weights) - 1)
+        while index > 0 and self.weights[index] <= 0:
+            index -= 1
+        return index
+
+class WordSampler:
+    def __init__(self, words, explore=0.3):
+        self.explore = explore
+        # Per-key counters persist when the word list changes
+        self.attempts = {}
+        self.misses = {}
+        self.set_words(words)
+
+    def set_words(self, words):
+        """Index a new word list, keeping the collected statistics"""
+        self.words = words
+        self.key_slots = {}
+        self.examples = []
+        # A fixed seed keeps the example reservoirs, and so replays, deterministic
+        reservoir_rng = random.Random(0)
+        seen = []
+        positions = range(len(words))
+        if len(words) > MAX_INDEXED_WORDS:
+            positions = sorted(reservoir_rng.sample(positions, MAX_INDEXED_WORDS))
+        for position in positions:
+            for key in word_keys(words[position]):
+                slot = self.key_slots.get(key)
+                if slot is None:
+                    slot = self.key_slots[key] = len(self.examples)
+                    self.examples.append([])
+                    seen.append(0)
+                seen[slot] += 1
+                examples = self.examples[slot]
+                if len(examples) < EXAMPLES_PER_KEY:
+                    examples.append(position)
+                else:
+                    replace = reservoir_rng.randrange(seen[slot])
+                    if replace < EXAMPLES_PER_KEY:
+                        examples[replace] = position
+
+        self.tree = FenwickTree(len(self.examples))
+        for key, slot in self.key_slots.items():
+            self.tree.set(slot, self.miss_rate(key))
+
+    def miss_rate(self, key):
+        return self.misses.get(key, 0) / (self.attempts.get(key, 0) + PRIOR_ATTEMPTS)
+
+    def _update(self, key):
+        slot = self.key_slots.get(key)
+        if slot is not None:
+            self.tree.set(slot, self.miss_rate(key))
+
+    def record_hit(self, word):
+        """Count every key of a correctly typed word as typed"""
+        for key in word_keys(word):
+            self.attempts[key] = self.attempts.get(key, 0) + 1
+            self._update(key)
+
+    def record_miss(self, word, position):
+        """Count the character at position, and the bigram ending there, as missed"""
+        keys = []
+        if position < len(word):
+            keys.append(word[position])
+        if 0 < position < len(word):
+            keys.append(word[position - 1:position + 1])
+        for key in keys:
+            self.attempts[key] = self.attempts.get(key, 0) + 1
+            self.misses[key] = self.misses.get(key, 0) + 1
+            self._update(key)
+
+    def sample(self, rng):
+        """Pick a word, favouring ones that contain frequently missed keys"""
+        if self.tree.total <= 0 or rng.random() < self.explore:
+            return rng.choice(self.words)
+        slot = self.tree.find(rng.random() * self.tree.total)
+        return self.words[rng.choice(self.examples[slot])]
+
+    def weak_keys(self, count=5):
+        """Get the keys with the highest miss rates, worst first"""
+        missed = [key for key in self.misses if self.miss_rate(key) > 0]
+        return sorted(missed, key=self.miss_rate, reverse=True)[:count]
@@ -0,0 +1,163 @@
+"""
+Compact, memory-mapped word lists for large dictionaries.
+
+A store file holds a header, a table giving the index of the first word of
+each length, a little-endian uint32 offset per word and the UTF-8 words
+themselves. Words are sorted by length, so every word up to a difficulty's
+maximum length is one contiguous run and filtering is an index lookup.
+The file is mapped read-only, so opening is instant and several language
+packs share the OS page cache instead of each holding Python strings.
+Words are stored lowercased, since the game matches typing without regard
+to case, and a store must hold at least one word:
+
+    python word_store.py build words.txt english.rtw
+    python word_store.py info english.rtw
+"""
+import mmap
+import struct
+
+MAGIC = b"RTWS"
+VERSION = 1
+# magic, version, word count, longest word length
+HEADER = struct.Struct("<4sBII")
+OFFSET = struct.Struct("<I")
+OFFSET_PAIR = struct.Struct("<II")
+
+class WordView:
+    """A read-only sequence over a contiguous run of a store's words"""
+
+    def __init__(self, store, start, stop):
+        self.store = store
+        self.start = start
+        self.stop = stop
+
+    def __len__(self):
+        return self.stop - self.start
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            start, stop, step = index.indices(len(self))
+            if step != 1:
+                return [self[i] for i in range(start, stop, step)]
+            return WordView(self.store, self.start + start, self.start + max(start, stop))
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("word index out of range")
+        return self.store.word_at(self.start + index)
+
+    def __eq__(self, other):
+        if isinstance(other, WordView):
+            # A WordStore is its own store, so compare stores by identity to avoid recursing
+            return self.store is other.store and self.start == other.start and self.stop == other.stop
+        return NotImplemented
+
+    def __hash__(self):
+        return hash((id(self.store), self.start, self.stop))
+
+    def __iter__(self):
+        for index in range(self.start, self.stop):
+            yield self.store.word_at(index)
+
+    def up_to_length(self, max_length):
+        """Get the words in this view no longer than max_length"""
+        return WordView(self.store, self.start, max(self.start, min(self.stop, self.store.length_end(max_length))))
+
+class WordStore(WordView):
+    def __init__(self, path):
+        with open(path, "rb") as store_file:
+            self.data = mmap.mmap(store_file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, count, max_length = HEADER.unpack_from(self.data, 0)
+        if magic != MAGIC or version != VERSION:
+            self.data.close()
+            raise ValueError(f"{path} is not a RETRO TYPER word store")
+        if count == 0:
+            # Spawning picks from the store, so an empty one could never start a game
+            self.data.close()
+            raise ValueError(f"{path} has no words")
+        self.path = path
+        self.max_length = max_length
+        # Index of the first word of each length 0..max_length+1
+        self.length_starts = struct.unpack_from(f"<{max_length + 2}I", self.data, HEADER.size)
+        self.offsets_start = HEADER.size + (max_length + 2) * OFFSET.size
+        self.words_start = self.offsets_start + (count + 1) * OFFSET.size
+        super().__init__(self, 0, count)
+
+    def word_at(self, index):
+        start, end = OFFSET_PAIR.unpack_from(self.data, self.offsets_start + index * OFFSET.size)
+        return self.data[self.words_start + start:self.words_start + end].decode("utf-8")
+
+    def length_end(self, max_length):
+        """Get the index one past the last word of at most max_length characters"""
+        return self.length_starts[max(0, min(max_length + 1, self.max_length + 1))]
+
+    def close(self):
+        self.data.close()
+
+def write_store(words, path):
+    """Write words to a store file, lowercased, deduplicated and sorted by length"""
+    words = sorted({word.strip().lower() for word in words if word.strip()}, key=lambda word: (len(word), word))
+    if not words:
+        raise ValueError(f"no words to write to {path}")
+    max_length = len(words[-1])
+
+    length_starts = []
+    index = 0
+    for length in range(max_length + 2):
+        while index < len(words) and len(words[index]) < length:
+            index += 1
+        length_starts.append(index)
+
+    encoded = [word.encode("utf-8") for word in words]
+    offsets = [0]
+    for data in encoded:
+        offsets.append(offsets[-1] + len(data))
+
+    with open(path, "wb") as store_file:
+        store_file.write(HEADER.pack(MAGIC, VERSION, len(words), max_length))
+        store_file.write(struct.pack(f"<{len(length_starts)}I", *length_starts))
+        store_file.write(struct.pack(f"<{len(offsets)}I", *offsets))
+        store_file.write(b"".join(encoded))
+    return len(words)
+
+def open_store(path):
+    """Open a word store, building it first if path is a plain text word list"""
+    with open(path, "rb") as word_file:
+        is_store = word_file.read(len(MAGIC)) == MAGIC
+    if not is_store:
+        store_path = path.rsplit(".", 1)[0] + ".rtw"
+        with open(path, encoding="utf-8") as word_file:
+            write_store(word_file, store_path)
+        path = store_path
+    return WordStore(path)
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Build or inspect RETRO TYPER word stores")
+    commands = parser.add_subparsers(dest="command", required=True)
+    build = commands.add_parser("build", help="build a store from a text file with one word per line")
+    build.add_argument("source")
+    build.add_argument("store")
+    info = commands.add_parser("info", help="show a store's word counts by length")
+    info.add_argument("store")
+    args = parser.parse_args()
+
+    try:
+        if args.command == "build":
+            with open(args.source, encoding="utf-8") as word_file:
+                count = write_store(word_file, args.store)
+        else:
+            store = WordStore(args.store)
+    except ValueError as error:
+        parser.error(str(error))
+
+    if args.command == "build":
+        print(f"Wrote {count} words to {args.store}")
+    else:
+        print(f"{args.store}: {len(store)} words, longest {store.max_length}")
+        for length in range(1, store.max_length + 1):
+            count = store.length_end(length) - store.length_end(length - 1)
+            if count:
+                print(f"  {length:>3}: {count}")
+        store.close()